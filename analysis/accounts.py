@@ -0,0 +1,66 @@
+"""
+Cross-account comparison for multi-account runs (run_all --per-account).
+
+One row per account partition (dataset.partition_accounts): post count, date
+range, outliers excluded, total reach and the same per-post averages as
+post_type_analysis — reach, engagement rate and follow conversion, outliers
+removed — so accounts of different sizes line up side by side.
+
+    python analysis/accounts.py a/merged.csv b/merged.csv
+"""
+import os
+import sys
+
+from aggregates import sum_state, state_means
+from dataset import ACCOUNT_COL, CSV_IN, clean_engagement, drop_outlier, load_partition, partition_accounts
+from outputs import write_table
+from post_type_analysis import AVERAGED, format_metrics
+
+# ---------- Paths ----------
+BASE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "output")
+
+
+def account_row(label, raw):
+    """Comparison row for one account's raw typed frame."""
+    state = sum_state(drop_outlier(clean_engagement(raw)), list(AVERAGED.values()))
+    means = state_means(state, list(AVERAGED.values())).iloc[0]
+    published = raw["Publish time"].dropna()
+    row = {
+        "Account": label,
+        ACCOUNT_COL: raw[ACCOUNT_COL].iloc[0] if len(raw) else "",
+        "Posts": len(raw),
+        "Analysed posts": int(state["count"].iloc[0]),
+        "Outliers": int(raw["Outlier"].sum()) if "Outlier" in raw.columns else 0,
+        "First post": published.min(),
+        "Last post": published.max(),
+        "TotalReach": int(raw["Reach"].sum()),
+    }
+    row.update({name: means[col] for name, col in AVERAGED.items()})
+    return row
+
+
+def comparison_table(frames):
+    """Accounts ranked by mean engagement rate. frames: {label: raw typed frame}."""
+    import pandas as pd
+
+    table = pd.DataFrame([account_row(label, raw) for label, raw in frames.items()])
+    if table.empty:
+        return table
+    table = table.sort_values("AvgEngagementRate", ascending=False, kind="stable").reset_index(drop=True)
+
+    # ---------- Format Metrics ----------
+    return format_metrics(table)
+
+
+def run(partitions, out_dir=OUT_DIR):
+    """Write account_comparison for partition_accounts() partitions."""
+    table = comparison_table({p["label"]: load_partition(p["path"]) for p in partitions})
+    paths = write_table(table, out_dir, "account_comparison")
+    print(f"[ok] Wrote account comparison → {', '.join(paths)}\n")
+    print(table.drop(columns=[ACCOUNT_COL]).to_string(index=False))
+    return table
+
+
+if __name__ == "__main__":
+    run(partition_accounts(sys.argv[1:] or [CSV_IN]))
@@ -0,0 +1,63 @@
+"""
+Mergeable sum/count state for grouped means.
+
+A state is a DataFrame indexed by group with one column per summed metric plus
+"count". States built from different slices of the data (chunks, deltas) add
+together, and subtracting the state of removed rows undoes their contribution,
+so means can be updated without revisiting the full history.
+"""
+import os
+
+import pandas as pd
+
+ALL = "all"
+
+
+def sum_state(df, cols, by=None):
+    """Sums of cols plus a row count, per group of `by` (or one ALL row)."""
+    if by is None:
+        state = df[cols].sum().to_frame(ALL).T
+        state["count"] = len(df)
+    else:
+        groups = df.groupby(by)
+        state = groups[cols].sum()
+        state["count"] = groups.size()
+    return state
+
+
+def merge_states(*states):
+    """
+    Add states together (groups missing from one side count as 0). Groups keep
+    first-seen order, so merging chunk states in file order preserves
+    first-appearance ordering.
+    """
+    states = [s for s in states if s is not None]
+    if not states:
+        return None
+    out = states[0]
+    for state in states[1:]:
+        order = out.index.append(state.index[~state.index.isin(out.index)])
+        out = out.add(state, fill_value=0).reindex(order)
+    return out
+
+
+def subtract_state(state, removed):
+    """Remove the contribution of `removed` rows; drops groups left with no rows."""
+    out = state.sub(removed, fill_value=0)
+    return out[out["count"] > 0]
+
+
+def state_means(state, cols):
+    return state[cols].div(state["count"], axis=0)
+
+
+def read_state(path):
+    """Load a state saved with write_state (None if it doesn't exist yet)."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, index_col=0)
+
+
+def write_state(state, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    state.to_csv(path)
@@ -0,0 +1,103 @@
+"""
+Benchmark: per-hashtag stats via the old iterrows loop vs explode/groupby.
+
+Builds a synthetic caption corpus (default 1M posts), checks both paths agree
+and prints the timings. The legacy loop is linear in posts x tags, so by default
+it runs on a 100k-post slice and is extrapolated; pass --legacy-rows 0 to run it
+on the full corpus.
+
+    python analysis/benchmarks/hashtag_speedup.py --rows 1000000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from hashtag_analysis import extract_hashtags, per_hashtag_stats  # noqa: E402
+from synthetic import WORDS, captions  # noqa: E402
+
+
+def synthetic_posts(n, seed=0):
+    """n captions with 0-12 hashtags (Zipf-ish tag popularity) and heavy-tailed metrics."""
+    rng = np.random.default_rng(seed)
+    descriptions = captions(rng, n, words=WORDS)
+
+    reach = np.maximum(1, rng.lognormal(6, 1.2, size=n)).astype("int64")
+    likes = rng.binomial(reach, 0.06)
+    return pd.DataFrame({
+        "Description": descriptions,
+        "Reach": reach,
+        "Likes": likes,
+        "EngagementRate": likes / reach * 100,
+    })
+
+
+def legacy_per_hashtag_stats(df):
+    """The original hashtag_analysis.py loop, kept here as the reference."""
+    def extract(text):
+        if not isinstance(text, str):
+            return []
+        return re.findall(r"#\w+", text.lower())
+
+    df = df.assign(Hashtags=df["Description"].apply(extract))
+    rows = []
+    for _, r in df.iterrows():
+        for h in r["Hashtags"]:
+            rows.append((h, r["EngagementRate"], r["Reach"], r["Likes"]))
+
+    tags_df = pd.DataFrame(rows, columns=["Hashtag", "EngagementRate", "Reach", "Likes"])
+    return (
+        tags_df.groupby("Hashtag")
+               .agg({"EngagementRate": "mean", "Reach": "mean", "Likes": "mean", "Hashtag": "count"})
+               .rename(columns={"Hashtag": "PostCount"})
+    )
+
+
+def vectorized_per_hashtag_stats(df):
+    return per_hashtag_stats(df, extract_hashtags(df["Description"]))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="iterrows vs explode/groupby hashtag stats")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=100_000,
+                        help="posts to run the legacy loop on (0 = all rows)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = synthetic_posts(args.rows, args.seed)
+    legacy_n = args.rows if args.legacy_rows <= 0 else min(args.legacy_rows, args.rows)
+    print(f"[ok] Built {args.rows:,} synthetic posts")
+
+    fast, fast_s = timed(vectorized_per_hashtag_stats, df)
+
+    sample = df.iloc[:legacy_n]
+    legacy, legacy_s = timed(legacy_per_hashtag_stats, sample)
+    check = fast if legacy_n == args.rows else vectorized_per_hashtag_stats(sample)
+    pd.testing.assert_frame_equal(
+        legacy.sort_index(), check.sort_index(), check_dtype=False, check_exact=False,
+    )
+    print(f"[ok] Results match on {legacy_n:,} posts")
+
+    legacy_full_s = legacy_s * args.rows / legacy_n
+    note = "" if legacy_n == args.rows else f" (extrapolated from {legacy_n:,} posts)"
+    print(f"iterrows loop:     {legacy_full_s:8.2f}s{note}")
+    print(f"explode/groupby:   {fast_s:8.2f}s")
+    print(f"speedup:           {legacy_full_s / fast_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
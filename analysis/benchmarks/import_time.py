@@ -0,0 +1,118 @@
+"""
+Benchmark: cold import time of the analysis scripts and the dashboard.
+
+Each module is imported in a fresh interpreter under `python -X importtime`,
+a few times, keeping the fastest cumulative time. Times are compared in units
+of a baseline, the fastest wall time of `python -c pass` on the same machine,
+so the budgets hold on slower or faster runners. Results are checked against
+import_time_budget.json next to this file:
+
+  * budget — fail when an import takes more than budget x tolerance baselines
+             (+ slack baselines, so tiny imports don't flap on timer noise)
+  * forbid    — heavy packages that must not be imported just by importing
+                the module (they belong inside the functions that use them)
+
+    python analysis/benchmarks/import_time.py            # check against the budget
+    python analysis/benchmarks/import_time.py --update   # rewrite the budgets from this run
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+BUDGET_PATH = os.path.join(HERE, "import_time_budget.json")
+
+
+def clean_env():
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("MPLBACKEND", None)
+    return env
+
+
+def baseline_ms(repeat):
+    """Fastest wall time of `python -c pass`, in ms: this machine's unit for the budgets."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=clean_env(), check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_profile(module, cwd):
+    """{imported module: cumulative microseconds} for one cold `import module`."""
+    env = clean_env()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def measure(module, cwd, repeat):
+    """(fastest cumulative ms, modules imported) over `repeat` cold imports."""
+    runs = [import_profile(module, cwd) for _ in range(repeat)]
+    return min(r[module] for r in runs) / 1000, set(runs[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="cold import time vs checked-in budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--update", action="store_true",
+                        help="rewrite the budgets from this run's timings")
+    args = parser.parse_args(argv)
+
+    with open(BUDGET_PATH) as f:
+        config = json.load(f)
+    tolerance, slack = config["tolerance"], config["slack"]
+
+    unit = baseline_ms(args.repeat)
+    print(f"baseline (python -c pass): {unit:.1f} ms\n")
+
+    failures = []
+    print(f"{'module':<28}{'ms':>9}{'x base':>9}{'budget':>9}  status")
+    for module, spec in config["modules"].items():
+        ms, imported = measure(module, os.path.join(ROOT, spec["path"]), args.repeat)
+        leaked = sorted(set(spec.get("forbid", [])) & imported)
+        relative = ms / unit
+
+        status = "ok"
+        if leaked:
+            status = "imports " + ", ".join(leaked)
+        elif not args.update and relative > spec["budget"] * tolerance + slack:
+            status = f"over budget (x{tolerance})"
+        if status != "ok":
+            failures.append(module)
+        print(f"{module:<28}{ms:>9.1f}{relative:>9.2f}{spec['budget']:>9.2f}  {status}")
+
+        if args.update:
+            spec["budget"] = round(relative, 2)
+
+    if args.update:
+        with open(BUDGET_PATH, "w") as f:
+            json.dump(config, f, indent=2)
+            f.write("\n")
+        print(f"[ok] Updated budgets → {BUDGET_PATH}")
+
+    if failures:
+        print(f"\n❌ Import-time regressions: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Benchmark: wall time and peak memory of each analysis stage vs export size.
+
+Runs the stages' computations (no charts) on synthetic exports from
+synthetic.py, generating any size that isn't on disk yet:
+
+  * load_csv     — parse + type merged.csv (dataset.parse_merged)
+  * load_cached  — memory-map the typed Arrow cache (dataset.load_merged)
+  * clean        — clean_engagement
+  * hashtags     — extract hashtags, hashtag summary, per-hashtag stats
+  * words        — tokenize captions, per-word usage / engagement
+  * heatmap      — weekday x hour reach grid
+  * posttype     — post type comparison table
+  * excel        — overview.xlsx export (RawData split across sheets past Excel's row limit)
+
+Time is the best of --repeat runs; peak memory comes from one extra run
+under tracemalloc (Python / numpy / pandas allocations, not Arrow's pool).
+--save writes the results as JSON and --compare flags stages that got slower
+than a saved baseline by more than --tolerance, so regressions show up as
+numbers:
+
+    python analysis/benchmarks/stages.py --sizes 10k 100k --save baseline.json
+    python analysis/benchmarks/stages.py --sizes 10k 100k --compare baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, "..")))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from dataset import parse_merged, load_merged, clean_engagement, drop_outlier  # noqa: E402
+from synthetic import DATA_DIR, parse_size, write_synthetic  # noqa: E402
+
+
+# ---------- Stages ----------
+# Each takes the shared inputs {"csv", "raw", "engaged", "stop_words"}
+def load_csv(inputs):
+    return parse_merged(inputs["csv"])
+
+
+def load_cached(inputs):
+    return load_merged(inputs["csv"])
+
+
+def clean(inputs):
+    return clean_engagement(inputs["raw"])
+
+
+def hashtags(inputs):
+    import hashtag_analysis
+
+    tagged, tags = hashtag_analysis.with_hashtag_counts(drop_outlier(inputs["engaged"]))
+    summary = hashtag_analysis.summarize(hashtag_analysis.summary_state(tagged))
+    return summary, hashtag_analysis.per_hashtag_stats(tagged, tags)
+
+
+def words(inputs):
+    import word_cloud
+    from tokens import caption_tokens
+
+    df = drop_outlier(inputs["engaged"])
+    tokens = caption_tokens(df["Description"], "words", inputs["stop_words"])
+    matrix, vocab = word_cloud.incidence_matrix(tokens)
+    return word_cloud.word_stats(matrix, vocab, df["EngagementRate"])
+
+
+def heatmap(inputs):
+    import weekly_heatmap
+    return weekly_heatmap.reach_grid(inputs["raw"])
+
+
+def posttype(inputs):
+    import post_type_analysis
+    return post_type_analysis.summarize(post_type_analysis.type_state(inputs["engaged"]))
+
+
+def trends(inputs):
+    import trends as trend_tables
+    return trend_tables.trends(trend_tables.daily_state(inputs["engaged"]))
+
+
+def excel(inputs):
+    import overview
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        overview.run(inputs["raw"], out_dir=out_dir)
+
+
+STAGES = {
+    "load_csv": load_csv,
+    "load_cached": load_cached,
+    "clean": clean,
+    "hashtags": hashtags,
+    "words": words,
+    "heatmap": heatmap,
+    "posttype": posttype,
+    "trends": trends,
+    "excel": excel,
+}
+
+
+def measure(fn, inputs, repeat):
+    """(best seconds over `repeat` runs, peak traced MB of one more run). Stage output is discarded."""
+    best = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(inputs)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        fn(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def prepare(csv_path):
+    """Shared stage inputs for one export (the Arrow cache is built here, so load_cached is warm)."""
+    from tokens import load_stopwords
+
+    raw = load_merged(csv_path)
+    return {
+        "csv": csv_path,
+        "raw": raw,
+        "engaged": clean_engagement(raw),
+        "stop_words": load_stopwords(),
+    }
+
+
+def bench_stage(name, inputs, repeat):
+    """{"seconds", "peak_mb"} for one stage."""
+    seconds, peak_mb = measure(STAGES[name], inputs, repeat)
+    return {"seconds": round(seconds, 4), "peak_mb": round(peak_mb, 1)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="per-stage time / peak memory on synthetic exports")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"],
+                        help="synthetic sizes (see synthetic.py), generated if missing")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON from --save to check against")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="fail when a stage takes more than baseline x tolerance")
+    args = parser.parse_args(argv)
+
+    report = {}
+    print(f"{'size':<7}{'stage':<13}{'rows':>12}{'seconds':>10}{'rows/s':>13}{'peak MB':>10}")
+    for size in args.sizes:
+        csv_path = os.path.join(args.data_dir, f"merged_{size}.csv")
+        if not os.path.exists(csv_path):
+            write_synthetic(parse_size(size), args.data_dir, label=size)
+        inputs = prepare(csv_path)
+        rows = len(inputs["raw"])
+        report[size] = {"rows": rows, "stages": {}}
+
+        for name in args.stages:
+            r = report[size]["stages"][name] = bench_stage(name, inputs, args.repeat)
+            print(f"{size:<7}{name:<13}{rows:>12,}{r['seconds']:>10.3f}"
+                  f"{rows / max(r['seconds'], 1e-9):>13,.0f}{r['peak_mb']:>10.1f}", flush=True)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"[ok] Saved results → {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = []
+        for size, entry in report.items():
+            for name, r in entry["stages"].items():
+                base = baseline.get(size, {}).get("stages", {}).get(name, {})
+                if "seconds" in base and r["seconds"] > base["seconds"] * args.tolerance:
+                    regressions.append(f"{size}/{name} {base['seconds']:.3f}s → {r['seconds']:.3f}s")
+        if regressions:
+            print("\n❌ Stage regressions (x{}): {}".format(args.tolerance, "; ".join(regressions)))
+            return 1
+        print(f"[ok] No stage slower than baseline x{args.tolerance}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Synthetic Instagram exports for benchmarking.
+
+Writes merged.csv-shaped files (the 29 columns src/ produces, API and Stories
+rows mixed) and matching stories.csv files (the 20-column Meta Stories export,
+New York "MM/DD/YYYY HH:MM" times). The data is shaped like the real export:
+
+  * captions drawn from a Zipf-weighted vocabulary, with 0-12 hashtags
+    (Zipf-weighted tag popularity) and some posts without a caption
+  * heavy-tailed (log-normal) Reach, with Views / Likes / Follows ... drawn
+    relative to it, and blanks where the real export leaves a column empty
+  * IMAGE / VIDEO / CAROUSEL_ALBUM / REELS feed posts plus IG stories, with
+    the API "+0000" and Stories ".000Z" Publish time spellings
+
+Rows are generated and appended in chunks, so 10M-row files (~3.5 GB) don't
+need 10M rows in memory.
+
+    python analysis/benchmarks/synthetic.py                   # 10k 100k 1M 10M
+    python analysis/benchmarks/synthetic.py --rows 10k 100k --out-dir /tmp/bench
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, "data")
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, "..")))
+
+from publish_time import local_seconds  # noqa: E402
+
+SIZES = ["10k", "100k", "1M", "10M"]
+CHUNK_ROWS = 500_000
+
+# Column order of merged.csv (src/merge.ts) and of the Meta Stories export
+MERGED_COLUMNS = [
+    "Source", "Post ID", "Account ID", "Account username", "Account name", "Description",
+    "Duration (sec)", "Publish time", "Permalink", "Post type", "Data comment", "Date",
+    "Views", "Plays", "Reach", "Impressions", "Likes", "Comments", "Shares", "Saved",
+    "Follows", "Total Interactions", "Replies", "Navigation", "Profile visits",
+    "Link clicks", "Sticker taps", "Media URL", "Thumbnail URL",
+]
+STORIES_COLUMNS = [
+    "Post ID", "Account ID", "Account username", "Account name", "Description",
+    "Duration (sec)", "Publish time", "Permalink", "Post type", "Data comment", "Date",
+    "Views", "Reach", "Likes", "Shares", "Replies", "Navigation", "Profile visits",
+    "Link clicks", "Sticker taps",
+]
+
+ACCOUNT = {
+    "Account ID": "17841400539558029",
+    "Account username": "hamletisntdead",
+    "Account name": "Hamlet Isn't Dead",
+}
+
+# Share of feed (API) rows; the rest are stories, as in the real export
+API_SHARE = 0.32
+FEED_TYPES = ["IMAGE", "VIDEO", "CAROUSEL_ALBUM", "REELS"]
+FEED_TYPE_WEIGHTS = [0.42, 0.28, 0.2, 0.1]
+
+# Publish times fall uniformly in this window (UTC)
+START = np.datetime64("2019-01-01T00:00:00", "s").astype(np.int64)
+END = np.datetime64("2026-01-01T00:00:00", "s").astype(np.int64)
+
+WORDS = [
+    "tonight", "tickets", "shakespeare", "cast", "rehearsal", "stage", "bard",
+    "opening", "closing", "show", "photos", "director", "link", "bio", "love",
+]
+TAGS = [f"#tag{i}" for i in range(2_000)] + [
+    "#HamletIsntDead", "#Hidiots", "#Shakespeare", "#NYCShakespeare", "#TheatreKid",
+]
+FILLER = ["the", "and", "for", "with", "our", "you", "this", "that", "from", "are"]
+SYLLABLES = ["ba", "de", "ki", "lo", "mu", "ra", "se", "ti", "vo", "zen",
+             "pra", "stor", "quil", "mend", "ough", "thea", "ric", "nol", "fay", "gre"]
+# Theatre words + stopwords + ~8k made-up words (three syllables each)
+VOCAB = WORDS + FILLER + [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+
+def zipf_weights(n):
+    weights = 1.0 / np.arange(1, n + 1)
+    return weights / weights.sum()
+
+
+def captions(rng, n, words=VOCAB, word_weights=None, tags=TAGS, missing=0.05):
+    """
+    n captions of 8 words plus 0-12 hashtags (Zipf-ish tag popularity); a
+    `missing` share (scalar or per-row probability) is NaN. Words are uniform
+    unless word_weights is given.
+    """
+    n_tags = rng.integers(0, 13, size=n)
+    tag_idx = rng.choice(len(tags), size=n_tags.sum(), p=zipf_weights(len(tags)))
+    if word_weights is None:
+        word_idx = rng.integers(0, len(words), size=(n, 8))
+    else:
+        word_idx = rng.choice(len(words), size=(n, 8), p=word_weights)
+
+    words = np.array(words, dtype=object)
+    tags = np.array(tags, dtype=object)
+    bounds = np.concatenate([[0], np.cumsum(n_tags)])
+    out = [
+        " ".join(words[word_idx[i]]) + " " + " ".join(tags[tag_idx[bounds[i]:bounds[i + 1]]])
+        for i in range(n)
+    ]
+    out = pd.Series(out, dtype=object)
+    out[rng.random(n) < missing] = np.nan  # some posts have no caption
+    return out
+
+
+def _counts(rng, reach, rate, present):
+    """Binomial(reach, rate) counts as nullable Int64, blank where not present."""
+    values = pd.array(rng.binomial(reach, rate), dtype="Int64")
+    values[~present] = pd.NA
+    return values
+
+
+def _blank(values, present):
+    """Object column holding values where present, NaN (a blank cell) elsewhere."""
+    return pd.Series(np.where(present, values, None), dtype=object)
+
+
+def synthetic_merged(n, seed=0, start=0):
+    """n merged.csv rows (strings / nullable ints, blanks as missing). Post IDs start at `start`."""
+    rng = np.random.default_rng(seed)
+    api = rng.random(n) < API_SHARE
+    story = ~api
+
+    post_ids = (18_000_000_000_000_000 + start + np.arange(n)).astype(str)
+    post_type = np.where(api, rng.choice(FEED_TYPES, size=n, p=FEED_TYPE_WEIGHTS), "IG story")
+    video = np.isin(post_type, ["VIDEO", "REELS"])
+
+    epoch = rng.integers(START, END, size=n)
+    stamps = pd.Series(np.datetime_as_string(epoch.astype("datetime64[s]")))
+    publish = stamps + np.where(api, "+0000", ".000Z")
+
+    # Heavy-tailed reach: feed posts spread much wider than stories
+    reach = np.where(
+        api, rng.lognormal(6.0, 1.4, size=n), rng.lognormal(4.3, 0.5, size=n)
+    ).astype(np.int64) + 1
+    like_rate = rng.beta(2, 40, size=n)
+    everywhere = np.ones(n, dtype=bool)
+
+    df = pd.DataFrame({
+        "Source": np.where(api, "API", "Stories CSV"),
+        "Post ID": post_ids,
+        **{col: value for col, value in ACCOUNT.items()},
+        "Description": captions(
+            rng, n, word_weights=zipf_weights(len(VOCAB)), missing=np.where(api, 0.02, 0.45)
+        ),
+        "Duration (sec)": _blank(rng.choice([0, 4, 5, 10, 15], size=n), story),
+        "Publish time": publish,
+        "Permalink": pd.Series(np.where(
+            api,
+            "https://www.instagram.com/p/" + pd.Series(post_ids) + "/",
+            "https://instagram.com/stories/hamletisntdead/" + pd.Series(post_ids),
+        )).where(api | (rng.random(n) < 0.59)),
+        "Post type": post_type,
+        "Data comment": _blank(np.full(n, "Lifetime"), api),
+        "Date": "Lifetime",
+        "Views": pd.array((reach * rng.uniform(1.0, 2.5, size=n)).astype(np.int64), dtype="Int64"),
+        "Plays": pd.array(np.full(n, pd.NA), dtype="Int64"),
+        "Reach": pd.array(reach, dtype="Int64"),
+        "Impressions": _counts(rng, reach * 2, 0.6, api & (rng.random(n) < 0.47)),
+        "Likes": _counts(rng, reach, like_rate, everywhere),
+        "Comments": _counts(rng, reach, 0.003, api),
+        "Shares": _counts(rng, reach, 0.004, everywhere),
+        "Saved": _counts(rng, reach, 0.002, api),
+        "Follows": _counts(rng, reach, 0.0015, api & (rng.random(n) < 0.7)),
+        "Total Interactions": pd.array(np.full(n, pd.NA), dtype="Int64"),
+        "Replies": _counts(rng, reach, 0.002, story),
+        "Navigation": _counts(rng, reach * 2, 0.6, story),
+        "Profile visits": _counts(rng, reach, 0.01, story & (rng.random(n) < 0.29)),
+        "Link clicks": _counts(rng, reach, 0.01, story & (rng.random(n) < 0.13)),
+        "Sticker taps": _counts(rng, reach, 0.01, story & (rng.random(n) < 0.19)),
+        "Media URL": _blank("https://scontent.cdninstagram.com/v/" + post_ids + ".jpg", api),
+        "Thumbnail URL": _blank("https://scontent.cdninstagram.com/v/" + post_ids + "_t.jpg", api & video),
+    })
+    df["Total Interactions"] = (
+        df["Likes"] + df["Comments"] + df["Shares"] + df["Saved"]
+    ).where(api)
+    return df[MERGED_COLUMNS]
+
+
+def as_stories(merged):
+    """The story rows of a synthetic_merged() frame in stories.csv shape (New York local times)."""
+    stories = merged[merged["Source"] == "Stories CSV"]
+    epoch = pd.to_datetime(stories["Publish time"], format="%Y-%m-%dT%H:%M:%S.000Z")
+    local = local_seconds(epoch.to_numpy(dtype="datetime64[s]").view(np.int64))
+    iso = pd.Series(np.datetime_as_string(local.astype("datetime64[s]"), unit="m"), index=stories.index)
+    return stories.assign(**{
+        "Publish time": iso.str.slice(5, 7) + "/" + iso.str.slice(8, 10) + "/"
+                        + iso.str.slice(0, 4) + " " + iso.str.slice(11, 16),
+    })[STORIES_COLUMNS]
+
+
+def parse_size(text):
+    """'10k' / '1M' / '2500' -> row count."""
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def write_synthetic(rows, out_dir=DATA_DIR, label=None, seed=0, chunksize=CHUNK_ROWS):
+    """Write merged_<label>.csv and stories_<label>.csv with `rows` merged rows; returns both paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    label = label or str(rows)
+    merged_path = os.path.join(out_dir, f"merged_{label}.csv")
+    stories_path = os.path.join(out_dir, f"stories_{label}.csv")
+
+    for i, start in enumerate(range(0, rows, chunksize)):
+        chunk = synthetic_merged(min(chunksize, rows - start), seed=[seed, i], start=start)
+        mode = "w" if i == 0 else "a"
+        chunk.to_csv(merged_path, index=False, header=i == 0, mode=mode)
+        as_stories(chunk).to_csv(stories_path, index=False, header=i == 0, mode=mode,
+                                 encoding="utf-8-sig" if i == 0 else "utf-8")
+    return merged_path, stories_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="write synthetic merged.csv / stories.csv exports")
+    parser.add_argument("--rows", nargs="+", default=SIZES,
+                        help="merged.csv row counts, e.g. 10k 100k 1M 10M")
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for size in args.rows:
+        start = time.perf_counter()
+        merged_path, _ = write_synthetic(parse_size(size), args.out_dir, label=size, seed=args.seed)
+        mb = os.path.getsize(merged_path) / 2**20
+        print(f"[ok] {size:>5} rows → {merged_path} ({mb:,.0f} MB, {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
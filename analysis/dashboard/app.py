@@ -1,11 +1,15 @@
 from dash import Dash
 import dash_bootstrap_components as dbc
-from layout import layout
+from layout import serve_layout, build_layout
+from summary import placeholder_summary
 from callbacks import register_callbacks
 
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "Social Media Overview Dashboard"
-app.layout = layout
+# Component ids for callback validation, so assigning a layout function
+# doesn't make Dash load the data at import time
+app.validation_layout = build_layout(placeholder_summary())
+app.layout = serve_layout
 
 register_callbacks(app)
 
@@ -1,8 +1,42 @@
 from dash import Input, Output
 import dash
 from dash import html
+from data import get_post_index
+from figures import make_reach_likes_fig, conversion_records
+
+FILTER_INPUTS = [
+    Input("date-range", "start_date"),
+    Input("date-range", "end_date"),
+    Input("post-type-filter", "value"),
+]
+
 
 def register_callbacks(app):
+    @app.callback(
+        Output("reach-likes-graph", "figure"),
+        *FILTER_INPUTS,
+    )
+    def update_scatter(start_date, end_date, post_types):
+        post_index = get_post_index()
+        mask = post_index.select(start_date, end_date, post_types)
+        return make_reach_likes_fig(post_index.scatter_points(mask))
+
+    @app.callback(
+        Output("conversion-table", "data"),
+        Output("conversion-table", "page_count"),
+        *FILTER_INPUTS,
+        Input("conversion-table", "page_current"),
+        Input("conversion-table", "page_size"),
+        Input("conversion-table", "sort_by"),
+    )
+    def update_conversion_table(start_date, end_date, post_types, page_current, page_size, sort_by):
+        post_index = get_post_index()
+        mask = post_index.select(start_date, end_date, post_types)
+        rows, page_count = post_index.conversion_page(
+            mask, page=page_current or 0, page_size=page_size or 15, sort_by=sort_by,
+        )
+        return conversion_records(rows), page_count
+
     @app.callback(
         Output("details-modal", "is_open"),
         Output("modal-body", "children"),
@@ -21,9 +55,21 @@ def register_callbacks(app):
             pt = clickData["points"][0]
             reach = pt.get("x")
             likes = pt.get("y")
+
+            # Density cell (large views): no single post behind it, show the cell instead
+            if "customdata" not in pt and "z" in pt:
+                body = html.Div([
+                    html.P(f"Posts in cell: {pt['z']:,.0f}", className="mb-1 fw-semibold"),
+                    html.P(f"Reach ≈ {reach:,.0f}", className="mb-1 fw-semibold"),
+                    html.P(f"Likes ≈ {likes:,.0f}", className="mb-1 fw-semibold"),
+                ])
+                return True, body
+
             custom = pt.get("customdata", []) or []
             date = custom[0] if len(custom) >= 1 else None
             link = custom[1] if len(custom) >= 2 else None
+            if len(custom) >= 4:
+                reach, likes = custom[2], custom[3]  # outliers are drawn at the axis edge
 
             if not date or str(date).strip().lower() in ["nan", "none", ""]:
                 date = "—"
@@ -1,36 +1,39 @@
+"""
+Dashboard data, loaded on first use.
+
+Nothing is read at import time: the first page load or callback calls
+get_summary() / get_post_index(), which load the precomputed summary
+(rebuilt only when merged.csv changes) once per process.
+"""
 import os
-import pandas as pd
-import pytz
+from functools import lru_cache
 from settings import CSV_PATH
 
 # Ensure CSV_PATH is absolute
 CSV_PATH = os.path.abspath(CSV_PATH)
 
-# Derive the base directory (root of project)
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
-# Define conversion file path (../output/conversion_full.csv relative to dashboard/)
-CONV_PATH = os.path.join(BASE_DIR, "analysis", "output", "conversion_full.csv")
+@lru_cache(maxsize=1)
+def load_data():
+    """(summary dict, scatter points) for merged.csv."""
+    from summary import load_summary
+
+    print("📂 Loading dashboard summary for:", CSV_PATH)
+
+    if not os.path.exists(CSV_PATH):
+        raise FileNotFoundError(f"❌ CSV file not found at {CSV_PATH}")
 
-print("📂 Loading main CSV from:", CSV_PATH)
-print("📂 Loading conversion CSV from:", CONV_PATH)
+    # Totals, the reach grid and scatter points come from the precomputed
+    # summary. Publish time in `points` is already formatted as a New York date.
+    return load_summary(CSV_PATH)
 
-if not os.path.exists(CSV_PATH):
-    raise FileNotFoundError(f"❌ CSV file not found at {CSV_PATH}")
 
-if not os.path.exists(CONV_PATH):
-    raise FileNotFoundError(f"❌ Conversion file not found at {CONV_PATH}")
+def get_summary():
+    return load_data()[0]
 
-# Load data
-df = pd.read_csv(CSV_PATH)
-conv = pd.read_csv(CONV_PATH)
 
-# Convert and format Publish time column if present
-if "Publish time" in df.columns:
-    est = pytz.timezone("America/New_York")
-    df["Publish time"] = pd.to_datetime(df["Publish time"], errors="coerce", utc=True)
-    df["Publish time"] = (
-        df["Publish time"]
-        .dt.tz_convert(est)
-        .dt.strftime("%m/%d/%Y")
-    )
+@lru_cache(maxsize=1)
+def get_post_index():
+    """Sorted, indexed store that serves the filtered scatter / paged table callbacks."""
+    from post_index import PostIndex
+    return PostIndex(load_data()[1])
@@ -1,10 +1,65 @@
+import numpy as np
 import plotly.express as px
-from dash import html
-import base64
-from pathlib import Path
-from settings import HEATMAP_PATH
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from dash import dcc, html
+from settings import (
+    SCATTER_WEBGL_MIN_POINTS,
+    SCATTER_DENSITY_MIN_POINTS,
+    SCATTER_DENSITY_BINS,
+    SCATTER_DENSITY_HIGHLIGHT,
+)
 from dash import dash_table
-import pandas as pd
+
+
+def _axis_range(values):
+    """[0, max] with a little headroom, so no point is clipped at the edge."""
+    top = float(np.nanmax(values)) if len(values) else 0.0
+    return [0, top * 1.05 if top > 0 else 1]
+
+
+def _outlier_trace(df, x_range, y_range, custom_cols):
+    """
+    Outlier-flagged posts, pinned inside the axes (they don't set the range)
+    and marked as such; hover and customdata carry their real Reach / Likes.
+    """
+    reach = df["Reach"].to_numpy(dtype=np.float64)
+    likes = df["Likes"].to_numpy(dtype=np.float64)
+    return go.Scatter(
+        x=np.minimum(reach, x_range[1]),
+        y=np.minimum(likes, y_range[1]),
+        mode="markers",
+        name="Outlier (at axis edge)",
+        marker=dict(symbol="triangle-right", size=12, color="#d62728"),
+        customdata=np.column_stack([df[custom_cols].to_numpy(dtype=object), reach, likes]),
+        text=[f"Reach: {r:,.0f}<br>Likes: {l:,.0f}" for r, l in zip(reach, likes)],
+        hovertemplate="Outlier<br>%{text}<extra></extra>",
+    )
+
+
+def _density_trace(df, x_range, y_range, bins=SCATTER_DENSITY_BINS):
+    """Post counts binned on the server; only bins x bins cells go to the browser."""
+    counts, x_edges, y_edges = np.histogram2d(
+        df["Reach"].to_numpy(dtype=np.float64),
+        df["Likes"].to_numpy(dtype=np.float64),
+        bins=bins,
+        range=[x_range, y_range],
+    )
+    z = np.where(counts > 0, counts, np.nan).T  # empty cells stay transparent
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale="Blues",
+        colorbar=dict(title="Posts"),
+        hovertemplate="Reach ≈ %{x:,.0f}<br>Likes ≈ %{y:,.0f}<br>Posts: %{z:,}<extra></extra>",
+    )
+
+
+def _extremes(df, n=SCATTER_DENSITY_HIGHLIGHT):
+    """Top-n posts by Reach and by Likes — the ones worth clicking into."""
+    top = df["Reach"].nlargest(n).index.union(df["Likes"].nlargest(n).index)
+    return df.loc[top]
 
 
 def make_reach_likes_fig(df):
@@ -14,86 +69,142 @@ def make_reach_likes_fig(df):
     if "Permalink" in df.columns:
         custom_cols.append("Permalink")
 
+    # Outlier-flagged posts (the viral post) are drawn apart and don't set the axes
+    flagged = df["Outlier"].to_numpy(dtype=bool) if "Outlier" in df.columns else np.zeros(len(df), dtype=bool)
+    outliers, df = df[flagged], df[~flagged]
+
+    x_range = _axis_range(df["Reach"])
+    y_range = _axis_range(df["Likes"])
+    density = len(df) > SCATTER_DENSITY_MIN_POINTS
+
+    # Above the density threshold only the extremes are drawn as points
+    points = _extremes(df) if density else df
     fig = px.scatter(
-        df,
+        points,
         x="Reach",
         y="Likes",
         title="Reach vs Likes",
         hover_data={col: True for col in ["Reach", "Likes", *custom_cols]},
         custom_data=custom_cols,
         color_discrete_sequence=["#1f77b4"],
+        render_mode="webgl" if len(points) > SCATTER_WEBGL_MIN_POINTS or density else "svg",
     )
+    if density:
+        fig.add_trace(_density_trace(df, x_range, y_range))
+        fig.data = fig.data[::-1]  # density underneath, clickable points on top
     fig.update_layout(
-        xaxis=dict(range=[0, 7000], title="Reach"),
-        yaxis=dict(range=[0, 225], title="Likes"),
+        xaxis=dict(range=x_range, title="Reach"),
+        yaxis=dict(range=y_range, title="Likes"),
         template="simple_white",
         height=450,
         margin=dict(l=20, r=20, t=40, b=20),
     )
-    fig.update_traces(marker=dict(size=9))
+    fig.update_traces(marker=dict(size=9 if len(points) <= SCATTER_WEBGL_MIN_POINTS else 5),
+                      selector=dict(mode="markers"))
+    if len(outliers):
+        fig.add_trace(_outlier_trace(outliers, x_range, y_range, custom_cols))
     return fig
 
 
-def make_heatmap_image_component():
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def make_weekly_heatmap_fig(weekly):
     """
-    Return an <img> wrapped in a Div that shows the weekly heatmap PNG.
-    Uses base64 data URI so Dash can serve it without copying into assets.
+    Average reach by weekday x hour plus the collapsed 24h curve, drawn from
+    the precomputed 7x24 grid in the summary (same data as the matplotlib PNG).
     """
-    p = Path(HEATMAP_PATH)
-    if not p.exists():
-        return html.Div(
-            [
-                html.H5("Insights"),
-                html.Div(
-                    f"Heatmap not found at: {p}",
-                    className="text-danger",
-                    style={"fontWeight": 600},
-                ),
-            ]
-        )
-
-    b64 = base64.b64encode(p.read_bytes()).decode("ascii")
-    src = f"data:image/png;base64,{b64}"
+    hours = list(range(24))
+    fig = make_subplots(
+        rows=2, cols=1,
+        row_heights=[0.75, 0.25],
+        vertical_spacing=0.12,
+        subplot_titles=[
+            "Average Reach by Day & Hour (Outlier Removed)",
+            "Average Reach by Hour (Collapsed Across Week)",
+        ],
+    )
+    fig.add_trace(
+        go.Heatmap(
+            z=weekly["grid"],
+            x=hours,
+            y=WEEKDAYS,
+            colorscale="OrRd",
+            colorbar=dict(title="Avg Reach", len=0.7, y=0.63),
+            hovertemplate="%{y} %{x}:00<br>Avg Reach: %{z:,.0f}<extra></extra>",
+        ),
+        row=1, col=1,
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=hours,
+            y=weekly["curve"],
+            mode="lines+markers",
+            line=dict(color="#D35400"),
+            hovertemplate="%{x}:00<br>Avg Reach: %{y:,.0f}<extra></extra>",
+            showlegend=False,
+        ),
+        row=2, col=1,
+    )
+    fig.update_yaxes(autorange="reversed", row=1, col=1)
+    fig.update_xaxes(dtick=2, row=1, col=1)
+    fig.update_xaxes(dtick=2, range=[0, 23], title="Hour of Day (0–23)", row=2, col=1)
+    fig.update_yaxes(title="Avg Reach", row=2, col=1)
+    fig.update_layout(
+        template="simple_white",
+        height=650,
+        margin=dict(l=20, r=20, t=40, b=20),
+    )
+    return fig
 
+
+def make_heatmap_component(weekly):
+    """Insights section: the weekly heatmap as a native Plotly figure."""
     return html.Div(
         [
             html.H5("Insights", className="fw-bold mb-3"),
-            html.Img(
-                src=src,
-                style={
-                    "maxWidth": "75%",
-                    "height": "auto",
-                    "border": "1px solid #e5e5e5",
-                    "borderRadius": "10px",
-                    "boxShadow": "0 4px 14px rgba(0,0,0,0.06)",
-                },
-                alt="Weekly heatmap and curve",
+            dcc.Graph(
+                id="weekly-heatmap",
+                figure=make_weekly_heatmap_fig(weekly),
+                config={"displayModeBar": False},
+                style={"maxWidth": "75%"},
             ),
         ],
         className="mt-4",
     )
 
 
-def make_top_conversion_table(df, limit=15):
-    d = df.sort_values("Conversion", ascending=False).head(limit).copy()
+CONVERSION_TABLE_COLS = ["Image", "Description", "Follows", "Reach", "Likes", "Conversion"]
+
 
-    def img_tag(url):
-        if isinstance(url, str) and url.startswith("http"):
-            return (
-                "<img src='{0}' "
-                "style='height:80px;width:80px;object-fit:cover;"
-                "border-radius:6px'/>"
-            ).format(url)
-        return ""
+def img_tag(url):
+    if isinstance(url, str) and url.startswith("http"):
+        return (
+            "<img src='{0}' "
+            "style='height:80px;width:80px;object-fit:cover;"
+            "border-radius:6px'/>"
+        ).format(url)
+    return ""
 
+
+def conversion_records(d):
+    """Format one page of conversion rows for the DataTable."""
+    d = d.copy()
     d["Image"] = d["Media URL"].apply(img_tag)
     d["Conversion"] = d["Conversion"].round(5)
+    return d[CONVERSION_TABLE_COLS].to_dict("records")
+
 
-    cols = ["Image","Description","Follows","Reach","Likes","Conversion"]
-    d = d[cols]
+def make_conversion_table(page_size=15):
+    """
+    DataTable shell with server-side paging and sorting; rows are filled in by
+    the update_conversion_table callback, one page at a time.
+    """
+    cols = CONVERSION_TABLE_COLS
 
     return dash_table.DataTable(
-        data=d.to_dict("records"),
+        id="conversion-table",
+        data=[],
         columns=[
             (
                 {"name": c, "id": c, "presentation": "markdown"}
@@ -102,6 +213,12 @@ def make_top_conversion_table(df, limit=15):
             )
             for c in cols
         ],
+        page_action="custom",
+        page_current=0,
+        page_size=page_size,
+        sort_action="custom",
+        sort_mode="multi",
+        sort_by=[],
         markdown_options={"html": True},
         style_cell={
             "fontFamily":"Arial",
@@ -0,0 +1,95 @@
+"""
+In-memory post index behind the dashboard callbacks.
+
+Posts are kept sorted by publish time as plain numpy columns, so a date range
+is two binary searches and a post-type filter is a vectorized mask over that
+slice. The follow-conversion ranking is precomputed once; serving a page of
+the table in the default order is a filter over that ranking rather than a
+sort, and other sort orders only sort the filtered rows.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from settings import ANALYSIS_DIR
+
+# Metric definitions and the local timezone live one level up in analysis/
+if ANALYSIS_DIR not in sys.path:
+    sys.path.insert(0, ANALYSIS_DIR)
+from metrics import metric_values
+from publish_time import LOCAL_TZ
+CONVERSION_COLS = ["Media URL", "Description", "Follows", "Reach", "Likes", "Conversion"]
+
+
+def local_day_to_epoch(day, end=False):
+    """'YYYY-MM-DD' (New York calendar day) -> UTC epoch seconds at its start (or next day's start)."""
+    ts = pd.Timestamp(day[:10], tz=LOCAL_TZ)
+    if end:
+        ts += pd.Timedelta(days=1)
+    return int(ts.timestamp())
+
+
+class PostIndex:
+    def __init__(self, points):
+        points = points.sort_values("Publish epoch", kind="stable").reset_index(drop=True)
+        self.frame = points
+        self.epoch = points["Publish epoch"].to_numpy()
+
+        types = points["Post type"].fillna("")
+        self.type_codes, self.post_types = pd.factorize(types, sort=True)
+
+        reach = points["Reach"].to_numpy(dtype=np.float64)
+        follows = points["Follows"].to_numpy(dtype=np.float64)
+        self.has_conversion = (reach > 0) & (follows > 0)
+        conversion = metric_values(points, "Conversion")
+        self.frame["Conversion"] = conversion
+
+        # Global ranking, best conversion first; ties on follows, then reach,
+        # then publish order (same rule as follow_conversion_rate.RANK_KEYS)
+        ranked = np.flatnonzero(self.has_conversion)
+        self.conversion_order = ranked[
+            np.lexsort((ranked, -reach[ranked], -follows[ranked], -conversion[ranked]))
+        ]
+
+    # ---------- Filtering ----------
+    def select(self, start_date=None, end_date=None, post_types=None):
+        """Boolean mask of posts inside [start_date, end_date] with one of post_types."""
+        lo = 0 if not start_date else np.searchsorted(self.epoch, local_day_to_epoch(start_date), "left")
+        hi = (
+            len(self.epoch) if not end_date
+            else np.searchsorted(self.epoch, local_day_to_epoch(end_date, end=True), "left")
+        )
+        mask = np.zeros(len(self.epoch), dtype=bool)
+        mask[lo:hi] = True
+
+        if post_types:
+            wanted = np.flatnonzero(np.isin(self.post_types, post_types))
+            mask &= np.isin(self.type_codes, wanted)
+        return mask
+
+    # ---------- Scatter ----------
+    def scatter_points(self, mask):
+        cols = ["Reach", "Likes", "Publish time", "Permalink", "Outlier"]
+        return self.frame.loc[mask, [c for c in cols if c in self.frame.columns]]
+
+    # ---------- Conversion table ----------
+    def conversion_page(self, mask, page=0, page_size=15, sort_by=None):
+        """(rows for one page, page_count) of the conversion table for the selected posts."""
+        sort_by = [s for s in (sort_by or []) if s.get("column_id") in CONVERSION_COLS]
+
+        if not sort_by:
+            rows = self.conversion_order[mask[self.conversion_order]]
+        else:
+            rows = np.flatnonzero(mask & self.has_conversion)
+            subset = self.frame.iloc[rows]
+            subset = subset.sort_values(
+                [s["column_id"] for s in sort_by],
+                ascending=[s.get("direction") == "asc" for s in sort_by],
+                kind="stable",
+            )
+            rows = subset.index.to_numpy()  # frame has a RangeIndex, so labels are positions
+
+        page_count = max(1, -(-len(rows) // page_size))
+        start = min(page, page_count - 1) * page_size  # filters may shrink the table under the pager
+        return self.frame.iloc[rows[start:start + page_size]][CONVERSION_COLS], page_count
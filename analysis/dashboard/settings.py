@@ -8,10 +8,15 @@ OUTPUT_DIR = os.path.join(ANALYSIS_DIR, "output")
 
 # ----- Data Files -----
 CSV_PATH = os.path.join(ROOT_DIR, "merged.csv")
-HEATMAP_PATH = os.path.join(OUTPUT_DIR, "weekly_heatmap_and_curve.png")
-CONVERSION_PATH = os.path.join(OUTPUT_DIR, "conversion_full.csv")
 
-# ----- Debug printouts -----
-print("📄 settings.CSV_PATH =", CSV_PATH)
-print("📄 settings.HEATMAP_PATH =", HEATMAP_PATH)
-print("📄 settings.CONVERSION_PATH =", CONVERSION_PATH)
+# ----- Precomputed dashboard summary (rebuilt when merged.csv changes) -----
+SUMMARY_PATH = os.path.join(OUTPUT_DIR, "dashboard_summary.json")
+POINTS_PATH = os.path.join(OUTPUT_DIR, "dashboard_points.arrow")
+
+# ----- Reach vs Likes rendering -----
+# SVG markers up to SCATTER_WEBGL_MIN_POINTS, WebGL (Scattergl) above it, and a
+# server-side binned density with the extremes overlaid above SCATTER_DENSITY_MIN_POINTS.
+SCATTER_WEBGL_MIN_POINTS = 2_000
+SCATTER_DENSITY_MIN_POINTS = 100_000
+SCATTER_DENSITY_BINS = 120
+SCATTER_DENSITY_HIGHLIGHT = 500
@@ -0,0 +1,137 @@
+"""
+Materialized dashboard summary.
+
+Totals, averages, the weekday x hour reach grid behind the heatmap and the
+per-post points behind the scatter and the filterable conversion table are
+computed once from merged.csv and saved next to the other outputs (a small JSON file plus an
+Arrow file for the points, sorted by publish time). The dashboard loads
+those on start-up and only rebuilds them when merged.csv's fingerprint
+changes, so cold start no longer depends on the size of the export.
+"""
+import json
+import os
+import sys
+
+from settings import CSV_PATH, ANALYSIS_DIR, SUMMARY_PATH, POINTS_PATH
+
+# The shared loader and stage code live one level up in analysis/
+if ANALYSIS_DIR not in sys.path:
+    sys.path.insert(0, ANALYSIS_DIR)
+from dataset import load_merged, fingerprint, fingerprint_matches
+
+# Bump when the artifact layout changes so old summaries are rebuilt.
+SUMMARY_VERSION = 7
+
+TOTAL_METRICS = [
+    "Reach", "Likes", "Comments", "Shares", "Saved",
+    "Total Interactions", "Views", "Follows",
+]
+POINT_COLS = ["Post type", "Reach", "Likes", "Follows", "Permalink", "Description", "Media URL", "Outlier"]
+
+
+def build_summary(csv_path=CSV_PATH, summary_path=SUMMARY_PATH, points_path=POINTS_PATH):
+    """Recompute the summary artifacts from merged.csv and write them out."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    from overview import summary_state
+    from weekly_heatmap import reach_grid
+
+    df = load_merged(csv_path)
+
+    # ---------- Totals & averages ----------
+    state = summary_state(df).iloc[0]
+    posts = int(state["count"])
+    totals = {col: int(state[col]) if col in state.index else 0 for col in TOTAL_METRICS}
+    averages = {col: (totals[col] / posts if posts else 0) for col in ["Reach", "Follows"]}
+
+    # ---------- Post points (scatter + filterable conversion table) ----------
+    # Epoch and New York date are precomputed by the loader (publish_time.py)
+    local_date = df["Local date"]
+    points = pd.DataFrame({
+        # UTC epoch seconds; posts without a publish time sort first
+        "Publish epoch": df["Publish epoch"].fillna(0).astype("int64"),
+        "Publish time": local_date.str.slice(5, 7) + "/" + local_date.str.slice(8, 10)
+                        + "/" + local_date.str.slice(0, 4),
+    })
+    for col in POINT_COLS:
+        points[col] = df[col] if col in df.columns else None
+    points = points.sort_values("Publish epoch", kind="stable").reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(points_path), exist_ok=True)
+    tmp = points_path + ".tmp"
+    feather.write_feather(pa.Table.from_pandas(points, preserve_index=False), tmp,
+                          compression="uncompressed")
+    os.replace(tmp, points_path)
+
+    # ---------- Weekday x hour reach (rendered natively by the dashboard) ----------
+    grid, curve = reach_grid(df)
+
+    local_days = local_date.dropna()
+    summary = {
+        "version": SUMMARY_VERSION,
+        "source": fingerprint(csv_path),
+        "posts": posts,
+        "totals": totals,
+        "averages": averages,
+        "post_types": sorted(points["Post type"].dropna().unique().tolist()),
+        "weekly_reach": {
+            "grid": grid.to_numpy().tolist(),
+            "curve": curve.to_numpy().tolist(),
+        },
+        "date_range": [
+            local_days.min() if len(local_days) else None,
+            local_days.max() if len(local_days) else None,
+        ],
+    }
+    _write_json(summary_path, summary)
+    return summary, points
+
+
+def placeholder_summary():
+    """Zero-valued summary with the real layout, for building the page without data."""
+    return {
+        "version": SUMMARY_VERSION,
+        "posts": 0,
+        "totals": {col: 0 for col in TOTAL_METRICS},
+        "averages": {"Reach": 0, "Follows": 0},
+        "post_types": [],
+        "weekly_reach": {"grid": [[0] * 24 for _ in range(7)], "curve": [0] * 24},
+        "date_range": [None, None],
+    }
+
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_summary(csv_path=CSV_PATH, summary_path=SUMMARY_PATH, points_path=POINTS_PATH):
+    """
+    Return (summary dict, scatter points), reusing the saved artifacts when they were built from the current merged.csv.
+    """
+    import pyarrow.feather as feather
+
+    try:
+        with open(summary_path) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        summary = None
+
+    fresh = (
+        summary is not None
+        and summary.get("version") == SUMMARY_VERSION
+        and os.path.exists(points_path)
+    )
+    if fresh:
+        seen_mtime = summary["source"].get("mtime_ns")
+        fresh = fingerprint_matches(csv_path, summary["source"])
+    if not fresh:
+        return build_summary(csv_path, summary_path, points_path)
+
+    if summary["source"]["mtime_ns"] != seen_mtime:
+        _write_json(summary_path, summary)
+    points = feather.read_table(points_path, memory_map=True).to_pandas()
+    return summary, points
@@ -0,0 +1,342 @@
+"""
+Shared loader for merged.csv.
+
+The export is parsed and typed once, then saved next to the CSV as an
+uncompressed Arrow (Feather v2) file. Later runs check the cache against the
+CSV's size/mtime (and its SHA-256 when the mtime moved) and memory-map the
+typed columns instead of re-parsing the text.
+
+pandas and pyarrow are imported on first load, so importing this module (and
+the paths / schema constants) stays cheap.
+"""
+import hashlib
+import json
+import os
+
+# ---------- Paths ----------
+BASE = os.path.dirname(os.path.abspath(__file__))
+CSV_IN = os.path.abspath(os.path.join(BASE, "../merged.csv"))
+
+# Bump when the typed schema changes so stale caches are rebuilt.
+CACHE_VERSION = 4
+
+# ---------- Schema ----------
+ID_COLS = ["Post ID", "Account ID"]
+
+TEXT_COLS = [
+    "Source", "Account username", "Account name", "Description", "Permalink",
+    "Post type", "Data comment", "Date", "Media URL", "Thumbnail URL",
+]
+
+METRIC_COLS = [
+    "Views", "Plays", "Reach", "Impressions", "Likes", "Comments", "Shares",
+    "Saved", "Follows", "Total Interactions", "Replies", "Navigation",
+    "Profile visits", "Link clicks", "Sticker taps",
+]
+
+TIME_COL = "Publish time"
+# Also derived once at load and cached: UTC epoch seconds and New York local
+# date / weekday / hour (publish_time.DERIVED_COLS), and the outlier mask and
+# score (outliers.OUTLIER_COLS)
+
+CSV_DTYPES = {c: str for c in ID_COLS + TEXT_COLS + [TIME_COL]}
+
+# Rows per chunk for the streaming path (iter_merged / streaming.py)
+CHUNK_ROWS = 100_000
+
+
+def cache_paths(csv_path):
+    """Return (arrow_path, meta_path) for the cache that sits next to csv_path."""
+    stem, _ = os.path.splitext(csv_path)
+    arrow_path = stem + ".arrow"
+    return arrow_path, arrow_path + ".json"
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_typed(csv_path):
+    """merged.csv as a typed frame, without outlier flags."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, dtype=CSV_DTYPES)
+    df.columns = df.columns.str.strip()
+    return coerce_types(df)
+
+
+def parse_merged(csv_path=CSV_IN):
+    """Parse merged.csv into a typed frame with its outlier flags (no caching)."""
+    from outliers import outlier_columns
+
+    df = _read_typed(csv_path)
+    for col, values in outlier_columns(df).items():
+        df[col] = values
+    return df
+
+
+def iter_merged(csv_path=CSV_IN, chunksize=CHUNK_ROWS):
+    """
+    Yield merged.csv as typed frames of at most `chunksize` rows, for exports
+    too large to hold in memory. Each chunk gets the same dtypes and columns as
+    load_merged(); row order (and a running RangeIndex) is preserved across
+    chunks. Outlier flags depend on every post, so they come from a first pass
+    over Reach and Post type only.
+    """
+    import pandas as pd
+    from outliers import scan_csv
+
+    csv_path = os.path.abspath(csv_path)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV file not found at {csv_path}")
+
+    flags = scan_csv(csv_path, chunksize)
+    start = 0
+    with pd.read_csv(csv_path, dtype=CSV_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            chunk = coerce_types(chunk)
+            for col, values in flags.items():
+                chunk[col] = values[start:start + len(chunk)]
+            start += len(chunk)
+            yield chunk
+
+
+def coerce_types(df):
+    """
+    Apply the shared dtypes: metrics as int64 counts (blanks -> 0), ids as
+    strings, UTC times plus their derived epoch / New York local columns.
+    """
+    import pandas as pd
+    from publish_time import parse_publish_time, local_time_columns
+
+    for col in ID_COLS:
+        if col in df.columns:
+            df[col] = df[col].fillna("").astype(str).str.strip()
+
+    for col in METRIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+
+    if "Duration (sec)" in df.columns:
+        df["Duration (sec)"] = pd.to_numeric(df["Duration (sec)"], errors="coerce")
+
+    if TIME_COL in df.columns:
+        # API rows end in "+0000", Stories rows in ".000Z" — don't infer one format from row 0
+        df[TIME_COL] = parse_publish_time(df[TIME_COL])
+        for col, values in local_time_columns(df[TIME_COL]).items():
+            df[col] = values
+
+    return df
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, meta_path)
+
+
+def fingerprint(csv_path=CSV_IN):
+    """
+    Return the cache fingerprint (size, mtime and content hash) for csv_path,
+    plus the outlier rule the cached flags were computed with.
+    """
+    from outliers import current_rule, rule_spec
+
+    st = os.stat(csv_path)
+    return {
+        "version": CACHE_VERSION,
+        "outliers": rule_spec(current_rule()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": file_sha256(csv_path),
+    }
+
+
+def fingerprint_matches(csv_path, meta):
+    """
+    True when `meta` (a fingerprint() dict) still describes csv_path: same size
+    and mtime, or the same content hash after the mtime moved (checkout, copy,
+    touch). In the latter case meta["mtime_ns"] is refreshed in place so the
+    caller can persist it and skip hashing next time.
+    """
+    from outliers import current_rule, rule_spec
+
+    if not meta or meta.get("version") != CACHE_VERSION:
+        return False
+    if meta.get("outliers") != rule_spec(current_rule()):
+        return False
+
+    st = os.stat(csv_path)
+    if meta.get("size") != st.st_size:
+        return False
+    if meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+
+    if meta.get("sha256") != file_sha256(csv_path):
+        return False
+    meta["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+def _cache_is_fresh(csv_path, arrow_path, meta_path):
+    meta = _read_meta(meta_path)
+    seen_mtime = meta.get("mtime_ns") if meta else None
+    if not os.path.exists(arrow_path) or not fingerprint_matches(csv_path, meta):
+        return False
+    if meta["mtime_ns"] != seen_mtime:
+        _write_meta(meta_path, meta)
+    return True
+
+
+def load_merged(csv_path=CSV_IN, use_cache=True):
+    """
+    Return merged.csv as a typed DataFrame.
+
+    Post ID / Account ID stay strings, metric columns are int64 counts with
+    blanks filled as 0 and Publish time is tz-aware UTC. When pyarrow is
+    available the typed frame is cached next to the CSV and memory-mapped on
+    later calls.
+    """
+    csv_path = os.path.abspath(csv_path)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV file not found at {csv_path}")
+
+    if not use_cache:
+        return parse_merged(csv_path)
+
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return parse_merged(csv_path)
+
+    arrow_path, meta_path = cache_paths(csv_path)
+    if _cache_is_fresh(csv_path, arrow_path, meta_path):
+        return feather.read_table(arrow_path, memory_map=True).to_pandas()
+
+    df = parse_merged(csv_path)
+    tmp = arrow_path + ".tmp"
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, arrow_path)
+    _write_meta(meta_path, fingerprint(csv_path))
+    return df
+
+
+# ---------- Multi-account partitions ----------
+ACCOUNT_COL = "Account ID"
+PARTITION_DIR = os.path.join(BASE, "store", "accounts")
+POST_KEY = ["Post ID", "Source"]
+
+
+def _account_label(account, usernames, taken):
+    """Directory name for an account: its username (file-name safe), else its ID."""
+    import re
+
+    names = [u for u in usernames if u]
+    label = re.sub(r"[^A-Za-z0-9._-]+", "_", names[-1]).strip("._") if names else ""
+    label = label or account or "unknown"
+    return f"{label}-{account}" if label in taken else label
+
+
+def partition_accounts(csv_paths, partition_dir=PARTITION_DIR):
+    """
+    Combine merged.csv exports (one per account, or mixed) and split them by
+    Account ID into per-account Arrow partitions under partition_dir:
+
+        store/accounts/account=<Account ID>/merged.arrow
+
+    A post in several exports keeps its last version. Outlier flags are
+    computed per account (and only there), since they compare each post with
+    its own account's posts. Returns [{"account", "label", "path", "posts"}]; the
+    partitions are only rewritten when an export changed.
+    """
+    import shutil
+
+    csv_paths = [os.path.abspath(p) for p in csv_paths]
+    meta_path = os.path.join(partition_dir, "partitions.json")
+    meta = _read_meta(meta_path)
+    if (
+        meta and meta.get("paths") == csv_paths
+        and all(fingerprint_matches(p, m) for p, m in zip(csv_paths, meta["sources"]))
+        and all(os.path.exists(a["path"]) for a in meta["accounts"])
+    ):
+        return meta["accounts"]
+
+    import pandas as pd
+    import pyarrow.feather as feather
+    from outliers import outlier_columns
+
+    exports = [_read_typed(p) for p in csv_paths]
+    df = pd.concat(exports, ignore_index=True).drop_duplicates(subset=POST_KEY, keep="last")
+
+    os.makedirs(partition_dir, exist_ok=True)
+    accounts, taken = [], set()
+    for account, part in df.groupby(ACCOUNT_COL, sort=True):
+        part = part.reset_index(drop=True)
+        for col, values in outlier_columns(part).items():
+            part[col] = values
+
+        part_dir = os.path.join(partition_dir, f"account={account}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, "merged.arrow")
+        feather.write_feather(part, path + ".tmp", compression="uncompressed")
+        os.replace(path + ".tmp", path)
+
+        label = _account_label(account, part["Account username"].dropna().tolist(), taken)
+        taken.add(label)
+        accounts.append({"account": account, "label": label, "path": path, "posts": len(part)})
+
+    # Drop partitions of accounts no longer in any export
+    kept = {os.path.dirname(a["path"]) for a in accounts}
+    for name in os.listdir(partition_dir):
+        stale = os.path.join(partition_dir, name)
+        if name.startswith("account=") and stale not in kept:
+            shutil.rmtree(stale)
+
+    _write_meta(meta_path, {
+        "paths": csv_paths, "sources": [fingerprint(p) for p in csv_paths], "accounts": accounts,
+    })
+    return accounts
+
+
+def load_partition(path):
+    """One account partition (partition_accounts()) as a typed frame, memory-mapped."""
+    import pyarrow.feather as feather
+
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+# ---------- Shared cleaning ----------
+# Metrics (metrics.py) every clean_engagement() frame carries
+ENGAGEMENT_METRICS = ["TotalEngagements", "EngagementRate", "FollowConversionRate"]
+
+
+def drop_outlier(df):
+    """Drop the posts flagged as outliers (outliers.py) — the cached "Outlier" mask when df has it."""
+    from outliers import outlier_mask
+
+    return df[~outlier_mask(df)]
+
+
+def clean_engagement(df):
+    """
+    Add TotalEngagements, EngagementRate and FollowConversionRate (both as % of
+    Reach; see metrics.py) and keep rows with 0 <= EngagementRate <= 99.99.
+    """
+    from metrics import with_metrics, in_range
+
+    out = with_metrics(df, ENGAGEMENT_METRICS)
+    return out[in_range(out, "EngagementRate")]
@@ -1,46 +1,47 @@
-import pandas as pd
 import os
+from dataset import load_merged, clean_engagement
+from ranking import top_k
+from outputs import write_table
 
 # ---------- Paths ----------
 BASE = os.path.dirname(os.path.abspath(__file__))
-CSV_IN  = os.path.join(BASE, "../merged.csv")
 OUT_DIR = os.path.join(BASE, "output")
-CSV_OUT = os.path.join(OUT_DIR, "engagement_top25.csv")
 
-os.makedirs(OUT_DIR, exist_ok=True)
+TOP_N = 25
 
-# ---------- Load Data ----------
-df = pd.read_csv(CSV_IN)
+# Ranking keys: engagement rate, then total engagements and reach for ties
+RANK_KEYS = ["EngagementRate", "TotalEngagements", "Reach"]
 
-# ---------- Numeric Conversion ----------
-for col in ["Reach", "Likes", "Comments", "Shares", "Saved"]:
-    df[col] = pd.to_numeric(df.get(col, 0), errors="coerce").fillna(0)
+KEEP_COLS = [
+    "Publish time", "Description", "Reach", "Likes", "Comments",
+    "Shares", "Saved", "Media URL", "Permalink", "EngagementRate"
+]
 
-# ---------- Compute Engagement ----------
-df["TotalEngagements"] = df["Likes"] + df["Comments"] + df["Shares"] + df["Saved"]
-df["EngagementRate"] = (df["TotalEngagements"] / df["Reach"].replace(0, pd.NA)) * 100
 
-# ---------- Clean Data ----------
-df = df[df["EngagementRate"].notna()]
-df = df[df["EngagementRate"] >= 0]
-df = df[df["EngagementRate"] <= 99.99]
+def top_posts(df, k=TOP_N):
+    """Top k posts by RANK_KEYS (all columns). Expects a clean_engagement() frame."""
+    return top_k(df, k, RANK_KEYS)
 
 
-# ---------- Keep Relevant Columns ----------
-keep_cols = [
-    "Publish time", "Description", "Reach", "Likes", "Comments",
-    "Shares", "Saved", "Media URL", "Permalink", "EngagementRate"
-]
-keep_cols = [c for c in keep_cols if c in df.columns]
+def run(df, out_dir=OUT_DIR):
+    """Write the top 25 posts by engagement rate. Expects a clean_engagement() frame."""
+    # ---------- Keep Relevant Columns ----------
+    keep_cols = [c for c in KEEP_COLS if c in df.columns]
+
+    # ---------- Top 25 (bounded selection, no full sort) ----------
+    out = top_posts(df)[keep_cols]
+
+    # ---------- Save ----------
+    paths = write_table(out, out_dir, "engagement_top25")
 
-# ---------- Sort & Slice Top 25 ----------
-out = df[keep_cols].sort_values("EngagementRate", ascending=False).head(25)
+    # ---------- Print Summary ----------
+    print(f"[ok] Wrote top 25 engagement posts → {', '.join(paths)}")
+    print(f"Average engagement rate (Top 25): {out['EngagementRate'].mean():.2f}%")
+    print("\nTop 5 Preview:")
+    print(out.head(5)[['Publish time', 'EngagementRate']])
+    return out
 
-# ---------- Save ----------
-out.to_csv(CSV_OUT, index=False)
 
-# ---------- Print Summary ----------
-print(f"[ok] Wrote top 25 engagement posts → {CSV_OUT}")
-print(f"Average engagement rate (Top 25): {out['EngagementRate'].mean():.2f}%")
-print("\nTop 5 Preview:")
-print(out.head(5)[['Publish time', 'EngagementRate']])
+if __name__ == "__main__":
+    # ---------- Load & Clean Data ----------
+    run(clean_engagement(load_merged()))
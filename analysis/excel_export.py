@@ -0,0 +1,189 @@
+"""
+Streaming .xlsx writer.
+
+Rows are written in order and flushed as they go — xlsxwriter's
+constant_memory mode, or an openpyxl write_only workbook when xlsxwriter
+isn't installed — so memory doesn't grow with the sheet. Styling is per
+column: one header style, one number format per column and widths from
+vectorized string lengths, instead of styling / measuring cell by cell.
+
+Frames longer than Excel's row limit continue on "<name> (2)", "<name> (3)",
+... (split=True), or raise (split=False). The name is shortened so the suffix
+fits Excel's 31-character sheet names.
+"""
+import os
+
+import numpy as np
+
+EXCEL_MAX_ROWS = 1_048_576  # per sheet, header included
+EXCEL_MAX_NAME = 31  # characters per sheet name
+BLOCK_ROWS = 50_000  # rows converted to Python values at a time
+MAX_WIDTH = 60
+WIDTH_PADDING = 3
+
+HEADER_COLOR = "4472C4"
+DATE_FORMAT = "yyyy-mm-dd hh:mm:ss"
+EXCEL_EPOCH_DAY = 25569  # 1970-01-01 as an Excel serial day
+
+
+def _is_datetime(col):
+    import pandas as pd
+    return pd.api.types.is_datetime64_any_dtype(col)
+
+
+def column_widths(frame):
+    """Width per column: longest value or header + padding, capped at MAX_WIDTH."""
+    import pandas as pd
+
+    widths = []
+    for name in frame.columns:
+        col = frame[name].dropna()
+        if col.empty:
+            longest = 0
+        elif _is_datetime(col):
+            longest = len(DATE_FORMAT)
+        elif pd.api.types.is_integer_dtype(col):
+            longest = max(len(str(col.min())), len(str(col.max())))
+        elif pd.api.types.is_string_dtype(col) and not pd.api.types.is_object_dtype(col):
+            longest = int(col.str.len().max())
+        else:
+            longest = int(col.astype(str).str.len().max())
+        widths.append(min(max(longest, len(str(name))) + WIDTH_PADDING, MAX_WIDTH))
+    return widths
+
+
+def _cells(col):
+    """Python values for one column block: None for blanks, datetimes as Excel serial days."""
+    missing = col.isna().to_numpy()
+    if _is_datetime(col):
+        if col.dt.tz is not None:
+            col = col.dt.tz_convert(None)  # Excel has no timezone support — write naive UTC
+        values = col.to_numpy(dtype="datetime64[ns]").view(np.int64) / 86_400e9 + EXCEL_EPOCH_DAY
+    else:
+        values = col.to_numpy(dtype=object)
+    values = values.astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def _rows(frame):
+    """Yield each row of frame as a tuple of cell values, BLOCK_ROWS at a time."""
+    for start in range(0, len(frame), BLOCK_ROWS):
+        block = frame.iloc[start:start + BLOCK_ROWS]
+        yield from zip(*[_cells(block[name]) for name in block.columns])
+
+
+def _parts(sheets, split):
+    """Yield (sheet name, frame slice, formats) per output sheet, splitting at the row limit."""
+    per_sheet = EXCEL_MAX_ROWS - 1
+    for name, frame, formats in sheets:
+        if len(frame) <= per_sheet:
+            yield name, frame, formats
+            continue
+        if not split:
+            raise ValueError(
+                f"{name} has {len(frame):,} rows; Excel sheets hold {per_sheet:,} — pass split=True"
+            )
+        for i, start in enumerate(range(0, len(frame), per_sheet)):
+            yield _part_name(name, i), frame.iloc[start:start + per_sheet], formats
+
+
+def _part_name(name, i):
+    """Sheet name of part i: name, then "<name> (2)", ... shortened to fit EXCEL_MAX_NAME."""
+    if i == 0:
+        return name
+    suffix = f" ({i + 1})"
+    return name[:EXCEL_MAX_NAME - len(suffix)].rstrip() + suffix
+
+
+def _column_formats(frame, formats):
+    """Number format per column position (datetime columns default to DATE_FORMAT)."""
+    return [
+        formats.get(name, DATE_FORMAT if _is_datetime(frame[name]) else None)
+        for name in frame.columns
+    ]
+
+
+def _write_xlsxwriter(path, parts):
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "strings_to_numbers": False,
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+    })
+    header = wb.add_format({
+        "bold": True, "font_color": "#FFFFFF", "bg_color": f"#{HEADER_COLOR}",
+        "align": "center", "valign": "vcenter",
+    })
+    number_formats = {}
+
+    for name, frame, formats in parts:
+        ws = wb.add_worksheet(name)
+        # Column formats apply to every cell written without its own format
+        for i, (width, fmt) in enumerate(zip(column_widths(frame), _column_formats(frame, formats))):
+            if fmt and fmt not in number_formats:
+                number_formats[fmt] = wb.add_format({"num_format": fmt})
+            ws.set_column(i, i, width, number_formats.get(fmt))
+        ws.write_row(0, 0, [str(c) for c in frame.columns], header)
+        for r, row in enumerate(_rows(frame), start=1):
+            ws.write_row(r, 0, row)
+    wb.close()
+
+
+def _write_openpyxl(path, parts):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+    font = Font(color="FFFFFF", bold=True)
+    align = Alignment(horizontal="center", vertical="center")
+
+    for name, frame, formats in parts:
+        ws = wb.create_sheet(name)
+        for i, width in enumerate(column_widths(frame), start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+
+        header = []
+        for col in frame.columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.fill, cell.font, cell.alignment = fill, font, align
+            header.append(cell)
+        ws.append(header)
+
+        # openpyxl writes no column styles onto cells, so formatted columns get styled cells
+        styled = [(i, fmt) for i, fmt in enumerate(_column_formats(frame, formats)) if fmt]
+        for row in _rows(frame):
+            row = list(row)
+            for i, fmt in styled:
+                if row[i] is not None:
+                    row[i] = WriteOnlyCell(ws, value=row[i])
+                    row[i].number_format = fmt
+            ws.append(row)
+    wb.save(path)
+
+
+def write_workbook(path, sheets, engine=None, split=True):
+    """
+    Write sheets = [(name, frame, {column: number format})] to path, in order.
+    engine is "xlsxwriter", "openpyxl" or None (xlsxwriter when installed).
+    """
+    if engine is None:
+        try:
+            import xlsxwriter  # noqa: F401
+            engine = "xlsxwriter"
+        except ImportError:
+            engine = "openpyxl"
+    writers = {"xlsxwriter": _write_xlsxwriter, "openpyxl": _write_openpyxl}
+    if engine not in writers:
+        raise ValueError(f"Unknown Excel engine {engine!r} (expected one of {sorted(writers)})")
+
+    parts = list(_parts(sheets, split))  # row-limit errors before anything is written
+    tmp = path + ".tmp"
+    writers[engine](tmp, parts)
+    os.replace(tmp, path)
+    return engine
@@ -1,29 +1,39 @@
-import pandas as pd
 import os
+from dataset import load_merged
+from ranking import top_k
+from outputs import write_table
+from metrics import with_metrics
 
 BASE = os.path.dirname(os.path.abspath(__file__))
-CSV_IN  = os.path.join(BASE, "../merged.csv")
 OUT_DIR = os.path.join(BASE, "output")
-CSV_OUT = os.path.join(OUT_DIR, "conversion_full.csv")
 
-os.makedirs(OUT_DIR, exist_ok=True)
+# Ranking keys: conversion, then follows and reach for ties
+RANK_KEYS = ["Conversion", "Follows", "Reach"]
 
-df = pd.read_csv(CSV_IN)
 
-# numeric coercion
-for col in ["Reach","Follows"]:
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+def conversion_table(df, k=None):
+    """
+    Posts with follows ranked by Conversion = Follows / Reach — all of them, or
+    only the top k (bounded selection). Expects the raw typed frame.
+    """
+    # Conversion from metrics.py
+    df = with_metrics(df, ["Conversion"])
 
-# filter | must have follows and reach > 0
-df = df[(df["Reach"] > 0) & (df["Follows"] > 0)]
+    # filter | must have follows and reach > 0
+    df = df[(df["Reach"] > 0) & (df["Follows"] > 0)]
 
-# compute conversion
-df["Conversion"] = df["Follows"] / df["Reach"]
+    keep_cols = ["Publish time","Description","Follows","Reach","Likes","Media URL","Permalink","Conversion"]
+    keep_cols = [c for c in keep_cols if c in df.columns]
 
-keep_cols = ["Publish time","Description","Follows","Reach","Likes","Media URL","Permalink","Conversion"]
-keep_cols = [c for c in keep_cols if c in df.columns]
+    return top_k(df, len(df) if k is None else k, RANK_KEYS)[keep_cols]
 
-out = df[keep_cols].sort_values("Conversion", ascending=False)
 
-out.to_csv(CSV_OUT, index=False)
-print("[ok] wrote:", CSV_OUT)
\ No newline at end of file
+def run(df, out_dir=OUT_DIR):
+    out = conversion_table(df)
+    paths = write_table(out, out_dir, "conversion_full")
+    print("[ok] wrote:", ", ".join(paths))
+    return out
+
+
+if __name__ == "__main__":
+    run(load_merged())
@@ -1,168 +1,197 @@
-import pandas as pd
-import re
 import os
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy.interpolate import make_interp_spline
+from dataset import load_merged, clean_engagement, drop_outlier
+from aggregates import sum_state, state_means
+from plotting import ChartSpec, submit
+from outputs import write_table
 
 # ---------- Paths ----------
 BASE = os.path.dirname(os.path.abspath(__file__))
-CSV_IN  = os.path.join(BASE, "../merged.csv")
 OUT_DIR = os.path.join(BASE, "output")
-os.makedirs(OUT_DIR, exist_ok=True)
 
-TAGS_OUT = os.path.join(OUT_DIR, "top_hashtags.csv")
-SUMMARY_OUT = os.path.join(OUT_DIR, "hashtag_summary.csv")
 
-# ---------- Load ----------
-df = pd.read_csv(CSV_IN)
+# ---------- Extract hashtags ----------
+HASHTAG_PATTERN = r"#\w+"
 
-# ---------- Remove outlier ----------
-OUTLIER_POST_ID = "18073628026714616"
-if "Post ID" in df.columns:
-    df = df[df["Post ID"].astype(str) != OUTLIER_POST_ID]
 
-# ---------- Ensure numeric ----------
-for col in ["Reach", "Likes", "Comments", "Shares", "Saved"]:
-    df[col] = pd.to_numeric(df.get(col, 0), errors="coerce").fillna(0)
+def extract_hashtags(descriptions):
+    """Lower-cased hashtag lists per caption (NaN where the caption is missing)."""
+    return descriptions.str.lower().str.findall(HASHTAG_PATTERN)
 
-# ---------- Compute Engagement ----------
-df["TotalEngagements"] = (
-    df["Likes"] + df["Comments"] + df["Shares"] + df["Saved"]
-)
-df["EngagementRate"] = (
-    df["TotalEngagements"] / df["Reach"].replace(0, pd.NA)
-) * 100
 
-# ---------- Clean Data ----------
-df = df[df["EngagementRate"].notna()]
-df = df[df["EngagementRate"] >= 0]
-df = df[df["EngagementRate"] <= 99.99]
+TAG_METRICS = ["EngagementRate", "Reach", "Likes"]
+SUMMARY_METRICS = ["EngagementRate", "Reach", "Likes", "NumHashtags"]
 
-# ---------- Extract hashtags ----------
-def extract_hashtags(text):
-    if not isinstance(text, str):
-        return []
-    return re.findall(r"#\w+", text.lower())
-
-df["Hashtags"] = df["Description"].apply(extract_hashtags)
-df["NumHashtags"] = df["Hashtags"].apply(len)
-df["HasHashtags"] = df["NumHashtags"] > 0
-
-# ---------- Hashtag vs Non-Hashtag Summary ----------
-summary = (
-    df.groupby("HasHashtags")
-      .agg({
-          "EngagementRate": "mean",
-          "Reach": "mean",
-          "Likes": "mean",
-          "NumHashtags": "mean",
-      })
-      .rename(index={True: "Has hashtags", False: "No hashtags"})
-)
-summary.to_csv(SUMMARY_OUT)
-print(f"[ok] Wrote summary comparison → {SUMMARY_OUT}\n")
-print(summary)
-
-# ---------- Per-Hashtag Breakdown ----------
-rows = []
-for _, r in df.iterrows():
-    for h in r["Hashtags"]:
-        rows.append((h, r["EngagementRate"], r["Reach"], r["Likes"]))
-
-tags_df = pd.DataFrame(rows, columns=["Hashtag", "EngagementRate", "Reach", "Likes"])
-
-if not tags_df.empty:
-    top_tags = (
-        tags_df.groupby("Hashtag")
-               .agg({
-                   "EngagementRate": "mean",   # mean to reduce viral bias
-                   "Reach": "mean",
-                   "Likes": "mean",
-                   "Hashtag": "count",
-               })
-               .rename(columns={"Hashtag": "PostCount"})
+
+def tag_state(df, hashtags):
+    """
+    Mergeable per-hashtag sums + counts (see aggregates.py) in one columnar
+    pass: explode the tag lists against the metric columns, then groupby.
+    """
+    tags_df = (
+        df[TAG_METRICS]
+        .assign(Hashtag=hashtags)
+        .explode("Hashtag")
+        .dropna(subset=["Hashtag"])
     )
+    return sum_state(tags_df, TAG_METRICS, by="Hashtag")
+
+
+def tag_stats(state):
+    """Mean EngagementRate / Reach / Likes and PostCount per hashtag from a tag_state."""
+    state = state.sort_index()  # merged states keep first-seen order; ties sort by tag
+    stats = state_means(state, TAG_METRICS)   # mean to reduce viral bias
+    stats["PostCount"] = state["count"].astype("int64")
+    return stats
+
+
+def per_hashtag_stats(df, hashtags):
+    """Per-hashtag means + PostCount for one in-memory frame."""
+    return tag_stats(tag_state(df, hashtags))
+
+
+def with_hashtag_counts(df):
+    """(df + NumHashtags / HasHashtags columns, per-post hashtag lists)."""
+    hashtags = extract_hashtags(df["Description"])
+    num = hashtags.str.len().fillna(0).astype("int64")
+    return df.assign(NumHashtags=num, HasHashtags=num > 0), hashtags
+
+
+def summary_state(df):
+    """Mergeable sums + counts behind hashtag_summary.csv. Expects with_hashtag_counts() output."""
+    return sum_state(df, SUMMARY_METRICS, by="HasHashtags")
 
-    # Require at least 3 posts per hashtag
-    top_tags = top_tags[top_tags["PostCount"] >= 3]
-
-    # Sort by mean engagement
-    top_tags = top_tags.sort_values("EngagementRate", ascending=False)
-
-    top_tags.to_csv(TAGS_OUT)
-    print(f"[ok] Wrote per-hashtag stats → {TAGS_OUT}")
-
-    # ---------- Quick visualization ----------
-    top10 = top_tags.head(10)
-    plt.figure(figsize=(10, 5))
-    plt.barh(top10.index[::-1], top10["EngagementRate"][::-1], color="#0047AB")
-    plt.xlabel("Mean Engagement Rate (%)")
-    plt.title("Top 10 Hashtags by Mean Engagement Rate (≥3 posts)")
-    plt.tight_layout()
-    plt.savefig(os.path.join(OUT_DIR, "top_hashtags_chart.png"))
-    print("[ok] Saved bar chart → output/top_hashtags_chart.png")
-else:
-    print("No hashtags found in dataset.")
-
-# ---------- Scatter with Average Line ----------
-plt.figure(figsize=(7, 5))
-
-# Pale blue scatter points
-plt.scatter(
-    df["NumHashtags"],
-    df["EngagementRate"],
-    alpha=0.5,
-    color="#9EC9FF",
-    edgecolors="none",
-    label="Posts",
-)
-
-# Mean engagement per hashtag count
-mean_curve = (
-    df.groupby("NumHashtags")["EngagementRate"]
-      .mean()
-      .reset_index()
-      .sort_values("NumHashtags")
-)
-
-# Ignore hashtag counts with too few posts (<5)
-counts = df["NumHashtags"].value_counts()
-valid_counts = counts[counts >= 5].index
-mean_curve = mean_curve[mean_curve["NumHashtags"].isin(valid_counts)]
-
-# Plot the average line (light smoothing)
-x = mean_curve["NumHashtags"]
-y = mean_curve["EngagementRate"]
-
-if len(x) > 3:
-    x_smooth = np.linspace(x.min(), x.max(), 200)
-    y_smooth = make_interp_spline(x, y, k=1)(x_smooth)  # gentle continuity only
-    plt.plot(x_smooth, y_smooth, color="red", linewidth=2, label="Average Engagement")
-else:
-    plt.plot(x, y, color="red", linewidth=2, label="Average Engagement")
-
-# Annotate the main peak
-if len(x) > 0:
-    peak_idx = np.argmax(y)
-    peak_x = x.iloc[peak_idx]
-    peak_y = y.iloc[peak_idx]
-    plt.scatter(peak_x, peak_y, color="red", s=40, zorder=5)
-    plt.text(
-        peak_x,
-        peak_y + 1,
-        f"Peak ≈ {peak_x:.0f} hashtags\n({peak_y:.1f}%)",
-        color="red",
-        fontsize=8,
-        ha="center",
+
+def summarize(state):
+    """Hashtag vs non-hashtag means from a summary_state."""
+    return (
+        state_means(state, SUMMARY_METRICS)
+        .rename(index={True: "Has hashtags", False: "No hashtags"})
+    )
+
+
+def top_tags_table(tag_stats_df, min_posts=3):
+    """Hashtags used in >= min_posts posts, best mean engagement first."""
+    top_tags = tag_stats_df[tag_stats_df["PostCount"] >= min_posts]
+    return top_tags.sort_values("EngagementRate", ascending=False)
+
+
+def draw_top_hashtags(fig, top10):
+    """Bar chart of the ten best hashtags by mean engagement (a top_tags_table() head)."""
+    ax = fig.add_subplot()
+    ax.barh(top10.index[::-1], top10["EngagementRate"][::-1], color="#0047AB")
+    ax.set_xlabel("Mean Engagement Rate (%)")
+    ax.set_title("Top 10 Hashtags by Mean Engagement Rate (≥3 posts)")
+    fig.tight_layout()
+
+
+def draw_count_scatter(fig, df):
+    """Engagement rate vs hashtag count per post, with the mean curve. df: NumHashtags + EngagementRate."""
+    ax = fig.add_subplot()
+
+    # Pale blue scatter points
+    ax.scatter(
+        df["NumHashtags"],
+        df["EngagementRate"],
+        alpha=0.5,
+        color="#9EC9FF",
+        edgecolors="none",
+        label="Posts",
     )
 
-plt.xlabel("Number of Hashtags")
-plt.ylabel("Average Engagement Rate (%)")
-plt.title("Engagement vs. Number of Hashtags")
-plt.legend()
-plt.grid(alpha=0.2)
-plt.tight_layout()
+    # Mean engagement per hashtag count
+    mean_curve = (
+        df.groupby("NumHashtags")["EngagementRate"]
+          .mean()
+          .reset_index()
+          .sort_values("NumHashtags")
+    )
 
-plt.savefig(os.path.join(OUT_DIR, "hashtag_count_scatter.png"))
-print("[ok] Saved clean average scatter → output/hashtag_count_scatter.png")
+    # Ignore hashtag counts with too few posts (<5)
+    counts = df["NumHashtags"].value_counts()
+    valid_counts = counts[counts >= 5].index
+    mean_curve = mean_curve[mean_curve["NumHashtags"].isin(valid_counts)]
+
+    # Plot the average line (light smoothing)
+    x = mean_curve["NumHashtags"]
+    y = mean_curve["EngagementRate"]
+
+    if len(x) > 3:
+        from scipy.interpolate import make_interp_spline
+        x_smooth = np.linspace(x.min(), x.max(), 200)
+        y_smooth = make_interp_spline(x, y, k=1)(x_smooth)  # gentle continuity only
+        ax.plot(x_smooth, y_smooth, color="red", linewidth=2, label="Average Engagement")
+    else:
+        ax.plot(x, y, color="red", linewidth=2, label="Average Engagement")
+
+    # Annotate the main peak
+    if len(x) > 0:
+        peak_idx = np.argmax(y)
+        peak_x = x.iloc[peak_idx]
+        peak_y = y.iloc[peak_idx]
+        ax.scatter(peak_x, peak_y, color="red", s=40, zorder=5)
+        ax.text(
+            peak_x,
+            peak_y + 1,
+            f"Peak ≈ {peak_x:.0f} hashtags\n({peak_y:.1f}%)",
+            color="red",
+            fontsize=8,
+            ha="center",
+        )
+
+    ax.set_xlabel("Number of Hashtags")
+    ax.set_ylabel("Average Engagement Rate (%)")
+    ax.set_title("Engagement vs. Number of Hashtags")
+    ax.legend()
+    ax.grid(alpha=0.2)
+    fig.tight_layout()
+
+
+def run(df, out_dir=OUT_DIR, charts=None):
+    """
+    Hashtag summary, per-hashtag stats and charts. Expects a clean_engagement()
+    frame. Charts go through plotting.submit (collected into `charts` under run_all).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    specs = []
+
+    # ---------- Remove outlier ----------
+    df, hashtags = with_hashtag_counts(drop_outlier(df))
+
+    # ---------- Hashtag vs Non-Hashtag Summary ----------
+    summary = summarize(summary_state(df))
+    paths = write_table(summary, out_dir, "hashtag_summary", index=True)
+    print(f"[ok] Wrote summary comparison → {', '.join(paths)}\n")
+    print(summary)
+
+    # ---------- Per-Hashtag Breakdown ----------
+    top_tags = per_hashtag_stats(df, hashtags)
+
+    if not top_tags.empty:
+        # Require at least 3 posts per hashtag, sorted by mean engagement
+        top_tags = top_tags_table(top_tags)
+
+        paths = write_table(top_tags, out_dir, "top_hashtags", index=True)
+        print(f"[ok] Wrote per-hashtag stats → {', '.join(paths)}")
+
+        # ---------- Quick visualization ----------
+        specs.append(ChartSpec(
+            "top_hashtags_chart", os.path.join(out_dir, "top_hashtags_chart.png"),
+            draw_top_hashtags, top_tags.head(10), figsize=(10, 5),
+        ))
+    else:
+        print("No hashtags found in dataset.")
+
+    # ---------- Scatter with Average Line ----------
+    specs.append(ChartSpec(
+        "hashtag_count_scatter", os.path.join(out_dir, "hashtag_count_scatter.png"),
+        draw_count_scatter, df[["NumHashtags", "EngagementRate"]], figsize=(7, 5),
+    ))
+
+    submit(specs, charts)
+    return summary
+
+
+if __name__ == "__main__":
+    # ---------- Load & Clean ----------
+    run(clean_engagement(load_merged()))
@@ -0,0 +1,118 @@
+"""
+Derived per-post metrics, defined once.
+
+Each metric is registered here by name as a vectorized numpy function of the
+export's count columns (or of other metrics), with the range of values the
+stages accept. Stages ask for metrics by name instead of deriving them:
+
+    from metrics import with_metrics, in_range
+    df = with_metrics(raw, ["EngagementRate", "FollowConversionRate"])
+    df = df[in_range(df, "EngagementRate")]
+
+Values are computed from the frame's columns on every call; a frame that
+already carries a metric column (a clean_engagement() frame) is used as is.
+Count columns the export lacks count as 0, like blanks.
+
+  TotalEngagements      Likes + Comments + Shares + Saved
+  EngagementRate        TotalEngagements as % of Reach, kept in [0, 99.99]
+  FollowConversionRate  Follows as % of Reach
+  Conversion            Follows / Reach (fraction; follow_conversion_rate)
+  BoostEngagements      Total Interactions, or the six-count sum where it's 0 (videos)
+  BoostScore            BoostEngagements / Reach (fraction), kept in [0, 1] (videos)
+
+Rates are NaN where Reach is 0.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+MAX_ENGAGEMENT_RATE = 99.99
+MAX_BOOST_SCORE = 1.0
+
+# inputs: frame columns or other metrics, passed to compute() in order;
+# bounds: (low, high) values the stages keep, or None
+Metric = namedtuple("Metric", ["name", "inputs", "compute", "bounds"])
+
+REGISTRY = {}
+
+
+def register(name, inputs, bounds=None):
+    """Decorator adding a metric computed by the decorated function."""
+    def wrap(fn):
+        REGISTRY[name] = Metric(name, tuple(inputs), fn, bounds)
+        return fn
+    return wrap
+
+
+def _per_reach(values, reach, scale=None):
+    out = np.full(len(values), np.nan)
+    np.divide(values, reach, out=out, where=reach != 0)
+    return out if scale is None else out * scale
+
+
+# ---------- Definitions ----------
+@register("TotalEngagements", ["Likes", "Comments", "Shares", "Saved"])
+def total_engagements(likes, comments, shares, saved):
+    return likes + comments + shares + saved
+
+
+@register("EngagementRate", ["TotalEngagements", "Reach"], bounds=(0, MAX_ENGAGEMENT_RATE))
+def engagement_rate(engagements, reach):
+    return _per_reach(engagements, reach, 100)
+
+
+@register("FollowConversionRate", ["Follows", "Reach"])
+def follow_conversion_rate(follows, reach):
+    return _per_reach(follows, reach, 100)
+
+
+@register("Conversion", ["Follows", "Reach"])
+def conversion(follows, reach):
+    return _per_reach(follows, reach)
+
+
+@register("BoostEngagements", ["Total Interactions", "Likes", "Comments", "Shares", "Saved", "Replies", "Follows"])
+def boost_engagements(total, *counts):
+    return np.where(total <= 0, sum(counts), total)
+
+
+@register("BoostScore", ["BoostEngagements", "Reach"], bounds=(0, MAX_BOOST_SCORE))
+def boost_score(engagements, reach):
+    return _per_reach(engagements, reach)
+
+
+# ---------- Lookup ----------
+def _input(df, name):
+    if name in REGISTRY:
+        return metric_values(df, name)
+    if name not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    return df[name].to_numpy()
+
+
+def metric_values(df, name):
+    """One metric for every row of df, as a numpy array."""
+    if name in df.columns:
+        return df[name].to_numpy()
+    if name not in REGISTRY:
+        raise KeyError(f"Unknown metric {name!r} (expected one of {sorted(REGISTRY)})")
+
+    m = REGISTRY[name]
+    return m.compute(*(_input(df, col) for col in m.inputs))
+
+
+def with_metrics(df, names):
+    """
+    df plus the named metric columns. `names` is a list of metrics, or a dict
+    {output column: metric} to store them under other column names.
+    """
+    if not isinstance(names, dict):
+        names = {name: name for name in names}
+    return df.assign(**{col: metric_values(df, name) for col, name in names.items()})
+
+
+def in_range(df, name, column=None):
+    """Boolean mask of rows whose metric (stored in `column`, default its name) lies in the metric's bounds."""
+    values = df[column or name].to_numpy(dtype=np.float64)
+    low, high = REGISTRY[name].bounds
+    return ~np.isnan(values) & (values >= low) & (values <= high)
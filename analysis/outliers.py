@@ -0,0 +1,221 @@
+"""
+Outlier flags for viral posts.
+
+A few posts reach far past their post type's usual audience, and averages
+over them are dominated by those posts. Instead of excluding a hard-coded
+Post ID, every post is scored once when the export is loaded, by a rule over
+the whole export:
+
+  fold[:F]       Reach above F times the post type's median (default 200)
+  mad[:Z]        robust z-score of log(1 + Reach) within the post type,
+                 0.6745 * (x - median) / MAD, above Z (default 3.5)
+  quantile[:Q]   Reach above the post type's Q quantile (default 0.995)
+  none           nothing is flagged
+
+Only the high side is flagged. Post types with fewer than MIN_GROUP posts,
+and posts without a type, are scored against all posts instead.
+
+The default, fold:200, excludes only the viral video in the current export
+(about 360x the video median; no other post passes 100x). mad and quantile
+are opt-in: on this export they also flag ordinary stories and images, since
+story reach is low and tightly spread.
+
+The rule comes from ANALYSIS_OUTLIER_RULE (default "fold:200"; run_all
+--outliers). dataset.py stores the result in the typed cache as OUTLIER_COLS
+— the "Outlier" mask and its "Outlier score" (Reach over the median or cap,
+or the z-score) — and rebuilds the cache when the rule changes;
+drop_outlier() filters on the stored mask. The store (store.py) keeps each
+post's flag from the export it was ingested with.
+
+    python analysis/outliers.py             # write outlier_report
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "output")
+
+ENV_VAR = "ANALYSIS_OUTLIER_RULE"
+DEFAULT_RULE = "fold:200"
+DEFAULT_PARAMS = {"fold": 200, "mad": 3.5, "quantile": 0.995, "none": None}
+MIN_GROUP = 10
+ALL_POSTS = "all posts"
+
+# Loader columns (cached with the typed frame); not export fields
+OUTLIER_COLS = ["Outlier", "Outlier score"]
+
+Rule = namedtuple("Rule", ["method", "param"])
+
+# Per post: flagged, score, the limit it's compared against, and the group
+# (post type, or ALL_POSTS) it was scored in
+Assessment = namedtuple("Assessment", ["flags", "score", "limit", "group"])
+
+
+# ---------- Rule ----------
+def parse_rule(spec):
+    """'fold:200' / 'mad:3.5' / 'quantile' / 'none' -> Rule, validated."""
+    method, _, param = str(spec).strip().lower().partition(":")
+    if method not in DEFAULT_PARAMS:
+        raise ValueError(f"Unknown outlier rule {spec!r} (expected one of {sorted(DEFAULT_PARAMS)})")
+    if method == "none":
+        return Rule(method, None)
+    value = float(param) if param else DEFAULT_PARAMS[method]
+    if value <= 0 or (method == "quantile" and value >= 1) or (method == "fold" and value <= 1):
+        raise ValueError(f"Outlier rule {spec!r} is out of range")
+    return Rule(method, value)
+
+
+def current_rule():
+    """The configured rule (ANALYSIS_OUTLIER_RULE, default fold:200)."""
+    return parse_rule(os.environ.get(ENV_VAR) or DEFAULT_RULE)
+
+
+def set_rule(spec):
+    """Configure the rule for this process and the worker processes it starts."""
+    os.environ[ENV_VAR] = rule_spec(parse_rule(spec))
+
+
+def rule_spec(rule):
+    return rule.method if rule.param is None else f"{rule.method}:{rule.param:g}"
+
+
+# ---------- Scoring ----------
+def _robust_z(x, groups):
+    """0.6745 * (x - median) / MAD within each group (mean absolute deviation when the MAD is 0)."""
+    center = pd.Series(x).groupby(groups).transform("median").to_numpy()
+    diff = x - center
+    dev = pd.Series(np.abs(diff)).groupby(groups)
+    mad = dev.transform("median").to_numpy()
+    mean_ad = dev.transform("mean").to_numpy()
+
+    z = np.zeros(len(x))
+    np.divide(0.6745 * diff, mad, out=z, where=mad > 0)
+    np.divide(diff, 1.253314 * mean_ad, out=z, where=(mad == 0) & (mean_ad > 0))
+    return z
+
+
+def _over_cap(reach, groups, q):
+    """Reach / (q quantile of Reach within each group); inf for reach over a cap of 0."""
+    cap = pd.Series(reach).groupby(groups).transform(lambda s: s.quantile(q)).to_numpy()
+    score = np.where(reach > 0, np.inf, 0.0)
+    np.divide(reach, cap, out=score, where=cap > 0)
+    return score
+
+
+def assess(reach, post_types, rule=None):
+    """Score every post under `rule` (default: the configured one). reach / post_types are aligned arrays."""
+    rule = current_rule() if rule is None else rule
+    reach = np.asarray(reach, dtype=np.float64)
+    codes, types = pd.factorize(pd.Series(post_types, dtype=object))
+    counts = np.bincount(codes[codes >= 0], minlength=len(types))
+    small = (codes < 0) | (counts[np.maximum(codes, 0)] < MIN_GROUP)
+    group = np.where(small, ALL_POSTS, np.asarray(types, dtype=object)[np.maximum(codes, 0)])
+
+    if rule.method == "none":
+        score, limit = np.zeros(len(reach)), np.inf
+    elif rule.method == "fold":
+        overall = np.zeros(len(reach))
+        score = np.where(small, _over_cap(reach, overall, 0.5), _over_cap(reach, codes, 0.5))
+        limit = rule.param
+    elif rule.method == "mad":
+        x = np.log1p(np.maximum(reach, 0))
+        score = np.where(small, _robust_z(x, np.zeros(len(x))), _robust_z(x, codes))
+        limit = rule.param
+    else:
+        overall = np.zeros(len(reach))
+        score = np.where(small, _over_cap(reach, overall, rule.param), _over_cap(reach, codes, rule.param))
+        limit = 1.0
+    return Assessment(score > limit, score, limit, group)
+
+
+def outlier_columns(df, rule=None):
+    """OUTLIER_COLS for a typed frame (the whole export: scores depend on every post)."""
+    a = assess(df["Reach"].to_numpy(), df["Post type"].to_numpy(dtype=object), rule)
+    return {"Outlier": a.flags, "Outlier score": a.score}
+
+
+def outlier_mask(df):
+    """The cached "Outlier" mask as a bool array, or the rule applied to df when it has none."""
+    if "Outlier" in df.columns:
+        return df["Outlier"].to_numpy(dtype=bool)
+    return outlier_columns(df)["Outlier"]
+
+
+def scan_csv(csv_path, chunksize, rule=None):
+    """
+    OUTLIER_COLS for every row of a CSV export, in file order, reading only
+    Reach and Post type (for the chunked path, where no chunk sees all posts).
+    """
+    wanted = {"Reach", "Post type"}
+    reach, types = [], []
+    with pd.read_csv(csv_path, usecols=lambda c: c.strip() in wanted, dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            reach.append(pd.to_numeric(chunk["Reach"], errors="coerce").fillna(0).to_numpy())
+            types.append(chunk["Post type"].to_numpy(dtype=object))
+    if not reach:
+        return {"Outlier": np.zeros(0, dtype=bool), "Outlier score": np.zeros(0)}
+    a = assess(np.concatenate(reach), np.concatenate(types), rule)
+    return {"Outlier": a.flags, "Outlier score": a.score}
+
+
+# ---------- Report ----------
+def _reason(rule, score, limit, group, reach, median):
+    base = f"Reach {reach:,.0f} vs {group} median {median:,.0f}"
+    if rule.method == "fold":
+        return f"{base}: {score:.0f}x the median > {limit:g}x"
+    if rule.method == "mad":
+        return f"{base}: log-reach robust z {score:.1f} > {limit:g}"
+    return f"{base}: over the {rule.param:g} quantile cap ({score:.1f}x)"
+
+
+def outlier_report(df, rule=None):
+    """
+    One row per excluded post (by the frame's Outlier mask): the rule, the
+    group it was scored in and why it was excluded.
+    """
+    rule = current_rule() if rule is None else rule
+    reach = df["Reach"].to_numpy(dtype=np.float64)
+    a = assess(reach, df["Post type"].to_numpy(dtype=object), rule)
+    mask = outlier_mask(df)
+
+    medians = pd.Series(reach).groupby(a.group).median()
+    medians[ALL_POSTS] = np.median(reach) if len(reach) else np.nan
+    group_median = medians.reindex(a.group).to_numpy()
+
+    cols = [c for c in ["Post ID", "Source", "Post type", "Publish time", "Reach"] if c in df.columns]
+    report = df.loc[mask, cols].copy()
+    report["Group"] = a.group[mask]
+    report["Group median reach"] = group_median[mask]
+    score = df["Outlier score"].to_numpy() if "Outlier score" in df.columns else a.score
+    report["Score"] = score[mask].round(2)
+    report["Limit"] = a.limit
+    report["Rule"] = rule_spec(rule)
+    report["Reason"] = [
+        _reason(rule, s, a.limit, g, r, m)
+        for s, g, r, m in zip(score[mask], a.group[mask], reach[mask], group_median[mask])
+    ]
+    return report.sort_values("Score", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def run(df, out_dir=OUT_DIR):
+    """Write outlier_report: the posts drop_outlier() excludes, and why. Expects the raw typed frame."""
+    from outputs import write_table
+
+    report = outlier_report(df)
+    paths = write_table(report, out_dir, "outlier_report")
+    print(f"[ok] Wrote outlier report → {', '.join(paths)}")
+    print(f"Excluded {len(report)} of {len(df)} posts ({rule_spec(current_rule())})")
+    if len(report):
+        print("\nTop 5:")
+        print(report[["Post ID", "Post type", "Reach", "Score"]].head(5).to_string(index=False))
+    return report
+
+
+if __name__ == "__main__":
+    from dataset import load_merged
+
+    run(load_merged())
@@ -0,0 +1,104 @@
+"""
+Output format layer for the analysis/output tables.
+
+Stages write their tables with write_table(frame, out_dir, name) instead of
+frame.to_csv(...). Each table is written in every configured format:
+
+  * csv      — <name>.csv, as before (the default); timestamps are written
+               in the export's "2024-03-08T14:28:27+0000" spelling
+  * parquet  — <name>.parquet, compressed, schema preserved
+  * feather  — <name>.feather (Arrow IPC), fastest to read back
+
+The columnar formats keep dtypes that CSV loses on a round trip: Post ID
+stays a string, Conversion a float, Publish time a tz-aware timestamp, and
+nullable integers stay integers. Formats come from set_formats() (run_all
+--formats) or the ANALYSIS_OUTPUT_FORMATS environment variable, e.g.
+"csv,parquet" or "feather". read_table() loads a table back from whichever
+format is on disk, preferring the columnar ones.
+"""
+import os
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+ENV_VAR = "ANALYSIS_OUTPUT_FORMATS"
+DEFAULT_FORMATS = ("csv",)
+
+# Preference order for read_table()
+READ_ORDER = ("feather", "parquet", "csv")
+
+# Timestamps in CSV tables keep the export's spelling ("2024-03-08T14:28:27+0000")
+CSV_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def parse_formats(spec):
+    """'csv, parquet' / ["csv", "parquet"] -> ("csv", "parquet"), validated."""
+    if isinstance(spec, str):
+        spec = spec.split(",")
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in spec if f.strip()))
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"Unknown output format(s) {unknown or spec!r} (expected {sorted(FORMATS)})")
+    return formats
+
+
+def output_formats():
+    """The configured output formats."""
+    spec = os.environ.get(ENV_VAR)
+    return parse_formats(spec) if spec else DEFAULT_FORMATS
+
+
+def set_formats(formats):
+    """Configure the output formats for this process and the worker processes it starts."""
+    os.environ[ENV_VAR] = ",".join(parse_formats(formats))
+
+
+def table_path(out_dir, name, fmt):
+    return os.path.join(out_dir, name + FORMATS[fmt])
+
+
+def write_table(frame, out_dir, name, index=False, formats=None):
+    """
+    Write frame as <name>.<ext> in out_dir for each output format and return
+    the paths. With index=True the index is kept (as the first CSV column, and
+    restored by read_table for the columnar formats).
+    """
+    formats = output_formats() if formats is None else parse_formats(formats)
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    for fmt in formats:
+        path = table_path(out_dir, name, fmt)
+        if fmt == "csv":
+            frame.to_csv(path, index=index, date_format=CSV_DATE_FORMAT)
+        else:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(frame, preserve_index=index)
+            if fmt == "parquet":
+                import pyarrow.parquet as pq
+                pq.write_table(table, path)
+            else:
+                import pyarrow.feather as feather
+                feather.write_feather(table, path)
+        paths.append(path)
+    return paths
+
+
+def read_table(out_dir, name, index=False):
+    """
+    Read <name> back from out_dir, preferring Feather, then Parquet, then CSV.
+    index=True reads the first CSV column as the index (columnar formats
+    restore it on their own).
+    """
+    for fmt in READ_ORDER:
+        path = table_path(out_dir, name, fmt)
+        if not os.path.exists(path):
+            continue
+        if fmt == "csv":
+            import pandas as pd
+            return pd.read_csv(path, index_col=0 if index else None)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.read_table(path).to_pandas()
+        import pyarrow.feather as feather
+        return feather.read_table(path, memory_map=True).to_pandas()
+    raise FileNotFoundError(f"No {name} table ({', '.join(READ_ORDER)}) in {out_dir}")
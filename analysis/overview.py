@@ -1,76 +1,89 @@
 import pandas as pd
 import os
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Alignment
+from dataset import load_merged
+from aggregates import sum_state
+from publish_time import DERIVED_COLS
+from outliers import OUTLIER_COLS
+from excel_export import write_workbook
 
 # --- File setup ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-CSV_PATH = os.path.join(BASE_DIR, "../merged.csv")
-OUT_PATH = os.path.join(BASE_DIR, "output/overview.xlsx")
-os.makedirs(os.path.join(BASE_DIR, "output"), exist_ok=True)
+OUT_DIR = os.path.join(BASE_DIR, "output")
 
-# --- Load data ---
-df = pd.read_csv(CSV_PATH)
 
-# --- Clean numeric metrics ---
-metrics = [
+SUMMARY_METRICS = [
     "Reach", "Likes", "Comments", "Shares", "Saved",
-    "Total Interactions", "Plays", "Views", "Follows"
+    "Total Interactions", "Views", "Plays", "Follows",
 ]
-for col in metrics:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-# --- Build summary ---
-summary = pd.DataFrame([{
-    "Total Posts": len(df),
-    "Total Reach": df["Reach"].sum() if "Reach" in df else None,
-    "Average Reach": df["Reach"].mean() if "Reach" in df else None,
-
-    "Total Likes": df["Likes"].sum() if "Likes" in df else None,
-    "Total Comments": df["Comments"].sum() if "Comments" in df else None,
-    "Total Shares": df["Shares"].sum() if "Shares" in df else None,
-    "Total Saves": df["Saved"].sum() if "Saved" in df else None,
-
-    "Total Interactions": df["Total Interactions"].sum() if "Total Interactions" in df else None,
-
-    "Total Views": df["Views"].sum() if "Views" in df else None,
-    "Total Plays": df["Plays"].sum() if "Plays" in df else None,
-
-    "Total Follows": df["Follows"].sum() if "Follows" in df else None,
-    "Average Follows": df["Follows"].mean() if "Follows" in df else None,
-}])
-
-# --- Write Excel with styling ---
-with pd.ExcelWriter(OUT_PATH, engine="openpyxl") as writer:
-    summary.to_excel(writer, index=False, sheet_name="Summary")
-    df.to_excel(writer, index=False, sheet_name="RawData")
-
-    wb = writer.book
-    ws = wb["Summary"]
-
-    # Style header
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    # Style numeric cells
-    for row in ws.iter_rows(min_row=2):
-        for cell in row:
-            if isinstance(cell.value, (int, float)):
-                cell.number_format = "#,##0"
-
-    # Auto-fit column widths
-    for column_cells in ws.columns:
-        length = max(
-            len(str(cell.value)) if cell.value is not None else 0
-            for cell in column_cells
-        )
-        ws.column_dimensions[get_column_letter(column_cells[0].column)].width = length + 3
-
-print(f"[ok] wrote: {OUT_PATH}")
-print(summary.T)
\ No newline at end of file
+
+
+def summary_state(df):
+    """Mergeable sums + post count behind the Summary sheet (see aggregates.py)."""
+    return sum_state(df, [c for c in SUMMARY_METRICS if c in df.columns])
+
+
+def build_summary(df=None, state=None):
+    """Summary sheet row, from a frame or from a (delta-updated) summary_state."""
+    if state is None:
+        state = summary_state(df)
+    row = state.iloc[0]
+    count = int(row["count"])
+
+    def total(col):
+        return row[col] if col in row.index else None
+
+    def average(col):
+        return row[col] / count if col in row.index and count else None
+
+    return pd.DataFrame([{
+        "Total Posts": count,
+        "Total Reach": total("Reach"),
+        "Average Reach": average("Reach"),
+
+        "Total Likes": total("Likes"),
+        "Total Comments": total("Comments"),
+        "Total Shares": total("Shares"),
+        "Total Saves": total("Saved"),
+
+        "Total Interactions": total("Total Interactions"),
+
+        "Total Views": total("Views"),
+        "Total Plays": total("Plays"),
+
+        "Total Follows": total("Follows"),
+        "Average Follows": average("Follows"),
+    }])
+
+
+def run(df, out_dir=OUT_DIR, engine=None, split=True):
+    """
+    Write overview.xlsx (Summary + RawData sheets) with the streaming writer in
+    excel_export.py. RawData longer than Excel's row limit continues on
+    "RawData (2)", ... unless split=False. Expects the raw typed frame.
+
+    RawData holds the loader's types, not the export's text: ids are text
+    cells (full precision), Publish time is a date cell in UTC, and blank
+    metric counts are written as 0.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, "overview.xlsx")
+
+    # --- Build summary ---
+    summary = build_summary(df)
+
+    # --- Write Excel: header style, number formats and widths per column ---
+    # The loader's derived time / outlier columns aren't export fields; Publish time is written as naive UTC
+    raw = df.drop(columns=DERIVED_COLS + OUTLIER_COLS, errors="ignore")
+    write_workbook(out_path, [
+        ("Summary", summary, dict.fromkeys(summary.columns, "#,##0")),
+        ("RawData", raw, {}),
+    ], engine=engine, split=split)
+
+    print(f"[ok] wrote: {out_path}")
+    print(summary.T)
+    return summary
+
+
+if __name__ == "__main__":
+    # --- Load data ---
+    run(load_merged())
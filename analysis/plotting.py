@@ -0,0 +1,75 @@
+"""
+Chart rendering for the chart-producing stages.
+
+Stages don't draw with pyplot. Each chart is described by a ChartSpec — the
+output path, a module-level draw(fig, data) function and the (picklable)
+data it needs — and render_charts() draws every spec on its own explicit
+matplotlib Figure saved through the Agg canvas: no pyplot global state, no
+GUI backend, nothing to show(). Several specs are rendered in a process
+pool, so a batch takes about as long as its slowest chart rather than the
+sum; run_all collects the specs of all stages and renders them together.
+
+matplotlib is imported only where charts are rendered.
+"""
+import os
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# draw(fig, data) fills a fresh Figure(figsize=figsize), which is then saved
+# to path at dpi ("figure": the figure's own dpi). draw must be importable
+# (a module-level function) so specs can be sent to worker processes.
+ChartSpec = namedtuple("ChartSpec", ["name", "path", "draw", "data", "figsize", "dpi"],
+                       defaults=["figure"])
+
+
+def render_chart(spec):
+    """Draw and save one chart; returns (name, path, seconds, error)."""
+    from matplotlib.figure import Figure
+
+    start = time.perf_counter()
+    error = None
+    try:
+        fig = Figure(figsize=spec.figsize)
+        spec.draw(fig, spec.data)
+        fig.savefig(spec.path, dpi=spec.dpi)
+    except Exception as e:  # keep going so one broken chart doesn't hide the rest
+        traceback.print_exc()
+        error = f"{type(e).__name__}: {e}"
+    return spec.name, spec.path, time.perf_counter() - start, error
+
+
+def render_charts(specs, jobs=None):
+    """
+    Render specs in a process pool of up to `jobs` workers (default: one per
+    chart, at most one per CPU; jobs <= 1 renders in this process). Returns
+    [(name, path, seconds, error)] in spec order.
+    """
+    specs = list(specs)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(specs))
+    if jobs <= 1:
+        return [render_chart(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(render_chart, specs))
+
+
+def print_renders(renders):
+    for name, path, seconds, error in renders:
+        if error is None:
+            print(f"[ok] Saved {name} → {path} ({seconds:.2f}s)")
+        else:
+            print(f"❌ {name} failed: {error}")
+
+
+def submit(specs, charts=None):
+    """
+    Render a stage's chart specs now, or — when run_all passes a `charts`
+    list — collect them to be rendered with every other stage's charts.
+    """
+    if charts is not None:
+        charts.extend(specs)
+        return
+    print_renders(render_charts(specs))
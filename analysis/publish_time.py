@@ -0,0 +1,168 @@
+"""
+Publish time parsing and New York–local fields.
+
+Exports carry ISO timestamps in two spellings (API "…T13:39:44+0000", Stories
+"…T00:32:00.000Z"); older CSVs may use the formats src/csv.ts accepts
+("5/29/25 5:04", "5/29/25 5:04 PM", … read as New York time). Instead of
+letting pandas infer a format per element, the fixed-width ISO prefix is
+parsed with one explicit format (pyarrow compute when available) and the few
+distinct suffixes (fraction + offset) are resolved once each; only rows that
+don't fit fall through to the csv.ts formats.
+
+Local fields use a timezone-offset cache: the UTC offset is looked up once per
+distinct UTC hour (DST only changes on hour boundaries) rather than
+converting every row.
+"""
+import re
+
+import numpy as np
+
+LOCAL_TZ = "America/New_York"
+
+ISO_BASE = "%Y-%m-%dT%H:%M:%S"
+ISO_SUFFIX = re.compile(r"^(?:\.(\d{1,9}))?(Z|[+-]\d{2}:?\d{2})?$")
+
+# Same order as src/csv.ts; naive values are New York time
+LOCAL_FORMATS = [
+    "%m/%d/%y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y %I:%M %p",
+    "%m/%d/%Y %I:%M %p",
+]
+
+DERIVED_COLS = ["Publish epoch", "Local date", "Local weekday", "Local hour"]
+
+
+def _split_suffix(suffix):
+    """(fraction seconds, UTC offset seconds or NaN if none) for an ISO suffix like
+    ".000Z" or "+0000"; None when it isn't one."""
+    m = ISO_SUFFIX.match(suffix)
+    if not m:
+        return None
+    fraction, zone = m.groups()
+    fraction = float("0." + fraction) if fraction else 0.0
+    if zone is None:
+        return fraction, np.nan
+    if zone == "Z":
+        return fraction, 0
+    digits = zone[1:].replace(":", "")
+    sign = 1 if zone[0] == "+" else -1
+    return fraction, sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+
+
+def _iso_parts(raw):
+    """
+    (ISO prefix as datetime64[s], NaT where it doesn't parse; per-row suffix
+    codes; distinct suffixes). Uses pyarrow compute when available.
+    """
+    import pandas as pd
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        text = raw.str.strip()
+        base = pd.to_datetime(text.str.slice(0, 19), format=ISO_BASE, errors="coerce")
+        codes, suffixes = pd.factorize(text.str.slice(19))
+        return base.to_numpy(dtype="datetime64[s]"), codes, list(suffixes)
+
+    text = pa.array(raw, type=pa.string())
+    if isinstance(text, pa.ChunkedArray):
+        text = text.combine_chunks()
+    text = pc.utf8_trim_whitespace(text)
+    base = pc.strptime(pc.utf8_slice_codeunits(text, 0, 19), format=ISO_BASE, unit="s", error_is_null=True)
+    suffix = pc.dictionary_encode(pc.utf8_slice_codeunits(text, 19, 64))
+    codes = suffix.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    return base.to_numpy(zero_copy_only=False), codes, suffix.dictionary.to_pylist()
+
+
+def parse_publish_time(raw):
+    """Series of Publish time strings -> tz-aware UTC datetimes (NaT if unparseable)."""
+    import pandas as pd
+
+    index = raw.index
+    raw = raw.reset_index(drop=True)
+    out = np.full(len(raw), np.datetime64("NaT", "ns"))
+
+    # ---------- ISO: explicit format on the prefix, suffixes resolved once each ----------
+    base, codes, suffixes = _iso_parts(raw)
+    parts = [_split_suffix(s) for s in suffixes] + [None]  # code -1 (missing) -> None
+    known = np.array([p is not None for p in parts])
+    fraction_ns = np.array([round(p[0] * 1e9) if p else 0 for p in parts], dtype=np.int64)
+    offset_s = np.array([p[1] if p else np.nan for p in parts])
+
+    iso = ~np.isnat(base) & known[codes]
+    wall = base.astype("datetime64[ns]") + fraction_ns[codes].astype("timedelta64[ns]")
+    offset = offset_s[codes]
+    zoned = iso & ~np.isnan(offset)
+    out[zoned] = wall[zoned] - (offset[zoned] * 1e9).astype("timedelta64[ns]")
+
+    # ---------- No offset: ISO without zone and the csv.ts formats, as New York time ----------
+    naive = iso & np.isnan(offset)
+    local = [pd.Series(wall[naive], index=np.flatnonzero(naive))]
+    rest = raw.notna().to_numpy() & ~iso
+    for fmt in LOCAL_FORMATS:
+        if not rest.any():
+            break
+        parsed = pd.to_datetime(raw[rest].str.strip(), format=fmt, errors="coerce").dropna()
+        local.append(parsed)
+        rest[parsed.index] = False
+
+    local = pd.concat(local)
+    if len(local):
+        utc = local.dt.tz_localize(LOCAL_TZ, ambiguous="NaT", nonexistent="shift_forward")
+        out[local.index] = utc.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+
+    # ---------- Anything else ISO 8601 (other widths / offsets) ----------
+    if rest.any():
+        parsed = pd.to_datetime(raw[rest], format="ISO8601", utc=True, errors="coerce")
+        out[rest] = parsed.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+
+    return pd.Series(out, index=index).dt.tz_localize("UTC")
+
+
+def epoch_seconds(times):
+    """(int64 UTC epoch seconds, valid mask) for a tz-aware datetime Series."""
+    seconds = times.to_numpy(dtype="datetime64[s]").view(np.int64)
+    return seconds, times.notna().to_numpy()
+
+
+def local_seconds(epoch, tz=LOCAL_TZ):
+    """Wall-clock seconds in tz for UTC epoch seconds, via one offset lookup per distinct UTC hour."""
+    import pandas as pd
+
+    if len(epoch) == 0:
+        return epoch.copy()
+    hours, inverse = np.unique(epoch // 3600, return_inverse=True)
+    utc = pd.DatetimeIndex((hours * 3600).astype("datetime64[s]")).tz_localize("UTC")
+    wall = utc.tz_convert(tz).tz_localize(None)
+    offsets = wall.as_unit("s").asi8 - utc.tz_localize(None).as_unit("s").asi8
+    return epoch + offsets[inverse]
+
+
+def local_time_columns(times, tz=LOCAL_TZ):
+    """
+    Derived columns stored in the typed cache: UTC epoch seconds plus the local
+    calendar date ("YYYY-MM-DD"), weekday (Mon=0) and hour, null where the
+    publish time is missing.
+    """
+    import pandas as pd
+
+    epoch, valid = epoch_seconds(times)
+    wall = local_seconds(epoch[valid], tz)
+    days = wall // 86400
+
+    day_values, day_inverse = np.unique(days, return_inverse=True)
+    day_labels = np.datetime_as_string(day_values.astype("datetime64[D]"))
+
+    def column(values, dtype):
+        col = pd.Series(pd.NA, index=times.index, dtype=dtype)
+        col[valid] = values
+        return col
+
+    return {
+        "Publish epoch": column(epoch[valid], "Int64"),
+        "Local date": column(day_labels[day_inverse], "str"),
+        "Local weekday": column((days + 3) % 7, "Int8"),  # 1970-01-01 was a Thursday (3)
+        "Local hour": column(wall // 3600 % 24, "Int8"),
+    }
@@ -0,0 +1,68 @@
+"""
+Bounded top-K ranking.
+
+top_k(df, k, by) returns the same rows, in the same order, as
+df.sort_values(by, ascending=False, kind="stable").head(k), without sorting
+the whole frame: np.argpartition finds the k-th best value of the first key,
+and only rows at or above it (ties included) are lexsorted on all keys. Rows
+that tie on every key keep the frame's row order, so results are
+deterministic.
+
+A top-k board is itself mergeable: merge_top_k(board, new_rows, k, by) keeps
+the best k of both, so leaderboards can be built chunk by chunk (see
+streaming.py) or updated as new posts arrive, in O(k + new rows) memory.
+"""
+import numpy as np
+
+
+def _sort_keys(df, by, ascending):
+    """One float key per column, arranged so that smaller sorts first; NaN sorts last."""
+    keys = []
+    for col, asc in zip(by, ascending):
+        values = df[col].to_numpy(dtype=np.float64)
+        values = values if asc else -values
+        keys.append(np.where(np.isnan(values), np.inf, values))
+    return keys
+
+
+def top_k_positions(df, k, by, ascending=False):
+    """Row positions of the k best rows of df, best first."""
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+
+    n = len(df)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    keys = _sort_keys(df, by, ascending)
+    candidates = np.arange(n)
+    if k < n:
+        cut = np.partition(keys[0], k - 1)[k - 1]
+        candidates = np.flatnonzero(keys[0] <= cut)  # keep every row tied with the k-th
+
+    # np.lexsort sorts by its last key first: primary key last, row position as the final tie-break
+    order = np.lexsort([candidates] + [key[candidates] for key in reversed(keys)])
+    return candidates[order[:k]]
+
+
+def top_k(df, k, by, ascending=False):
+    """The k best rows of df by `by` (earlier columns win), best first."""
+    return df.iloc[top_k_positions(df, k, by, ascending)]
+
+
+def rank_all(df, by, ascending=False):
+    """Every row of df, best first (a full ranking with the same tie rules as top_k)."""
+    return top_k(df, len(df), by, ascending)
+
+
+def merge_top_k(board, rows, k, by, ascending=False):
+    """
+    Best k of an existing board and new rows. Board rows come first, so on a
+    full tie the earlier post keeps its place.
+    """
+    import pandas as pd
+
+    if board is None or board.empty:
+        return top_k(rows, k, by, ascending)
+    return top_k(pd.concat([board, rows]), k, by, ascending)
@@ -0,0 +1,233 @@
+"""
+Regenerate analysis/output/ in one process.
+
+merged.csv is loaded once through the shared loader, the engagement-rate
+cleaning is applied once, and every stage runs against those frames. Use
+--jobs N to run the stages in a process pool instead; each worker then loads
+the (memory-mapped) Arrow cache once. --formats picks the table formats
+(CSV, Parquet, Feather; see outputs.py) and --outliers the outlier rule
+(outliers.py). Chart stages only describe their charts; all of them are
+rendered together at the end in a headless worker pool (plotting.py), with
+per-chart timings in the report.
+
+Several exports (or --per-account) are split by Account ID into Arrow
+partitions (dataset.partition_accounts); every stage then runs per account,
+each (account, stage) pair a pool task, into output/<account>/, and
+account_comparison.csv lines the accounts up side by side.
+
+    python analysis/run_all.py
+    python analysis/run_all.py --jobs 4 --stages hashtag heatmap
+    python analysis/run_all.py --formats csv parquet
+    python analysis/run_all.py --csv a/merged.csv b/merged.csv --jobs 4
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+import traceback
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dataset import CSV_IN, load_merged, load_partition, partition_accounts, clean_engagement
+from outputs import ENV_VAR, FORMATS, set_formats
+from plotting import print_renders, render_charts
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "output")
+
+# ---------- Stages ----------
+# name -> (module, input frame): "raw" is the typed frame, "engaged" is clean_engagement(raw)
+STAGES = {
+    "engagement": ("engagement_rate", "engaged"),
+    "conversion": ("follow_conversion_rate", "raw"),
+    "hashtag": ("hashtag_analysis", "engaged"),
+    "posttype": ("post_type_analysis", "engaged"),
+    "heatmap": ("weekly_heatmap", "raw"),
+    "wordcloud": ("word_cloud", "engaged"),
+    "video": ("videos", "raw"),
+    "overview": ("overview", "raw"),
+    "trends": ("trends", "engaged"),
+    "outliers": ("outliers", "raw"),
+}
+# Stages that hand their charts back as plotting.ChartSpecs instead of rendering them
+CHART_STAGES = {"hashtag", "posttype", "heatmap", "wordcloud"}
+
+_frames = None
+_partition_frames = {}
+
+
+def load_frames(csv_path=CSV_IN):
+    raw = load_merged(csv_path)
+    return {"raw": raw, "engaged": clean_engagement(raw)}
+
+
+def run_stage(name, frames, out_dir=OUT_DIR, charts=None):
+    """
+    Run one stage and return (name, seconds, peak_bytes, error). Chart stages
+    append their chart specs to `charts` (rendered right away when None).
+    """
+    module_name, frame_key = STAGES[name]
+    kwargs = {"charts": charts} if name in CHART_STAGES else {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    error = None
+    try:
+        module = importlib.import_module(module_name)
+        module.run(frames[frame_key], out_dir=out_dir, **kwargs)
+    except Exception as e:  # keep going so one broken stage doesn't hide the rest
+        traceback.print_exc()
+        lines = str(e).strip().splitlines()
+        error = type(e).__name__ + (f": {lines[0]}" if lines else "")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return name, elapsed, peak, error
+
+
+def _init_worker(csv_path):
+    global _frames
+    _frames = load_frames(csv_path)
+
+
+def _run_in_worker(name, out_dir):
+    charts = []
+    return run_stage(name, _frames, out_dir, charts), charts
+
+
+# ---------- Per-account runs ----------
+def partition_frames(path):
+    """Stage frames for one account partition, loaded once per process."""
+    if path not in _partition_frames:
+        raw = load_partition(path)
+        _partition_frames[path] = {"raw": raw, "engaged": clean_engagement(raw)}
+    return _partition_frames[path]
+
+
+def _run_partition_stage(label, path, name, out_dir):
+    charts = []
+    name, elapsed, peak, error = run_stage(name, partition_frames(path), os.path.join(out_dir, label), charts)
+    charts = [spec._replace(name=f"{label}/{spec.name}") for spec in charts]
+    return (f"{label}/{name}", elapsed, peak, error), charts
+
+
+def run_accounts(csv_paths, stages, out_dir=OUT_DIR, jobs=1):
+    """
+    Run `stages` for every account in the exports (dataset.partition_accounts)
+    into out_dir/<account>/, as (account, stage) tasks over a pool of `jobs`
+    workers, then write out_dir/account_comparison. Returns (results, charts).
+    """
+    import accounts
+
+    partitions = partition_accounts(csv_paths)
+    print(f"[ok] {len(partitions)} account(s): "
+          + ", ".join(f"{p['label']} ({p['posts']} posts)" for p in partitions))
+    tasks = [(p["label"], p["path"], name) for p in partitions for name in stages]
+
+    results, charts = [], []
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_run_partition_stage, *task, out_dir) for task in tasks]
+            for future in as_completed(futures):
+                result, stage_charts = future.result()
+                results.append(result)
+                charts.extend(stage_charts)
+        order = [f"{label}/{name}" for label, _, name in tasks]
+        results.sort(key=lambda r: order.index(r[0]))
+    else:
+        for task in tasks:
+            result, stage_charts = _run_partition_stage(*task, out_dir)
+            results.append(result)
+            charts.extend(stage_charts)
+
+    # ---------- Cross-account comparison ----------
+    accounts.run(partitions, out_dir)
+    return results, charts
+
+
+def print_report(results, total):
+    width = max([12] + [len(r[0]) + 2 for r in results])
+    print("\n---------- Stage timings ----------")
+    print(f"{'stage':<{width}}{'wall (s)':>10}{'peak MB':>10}  status")
+    for name, elapsed, peak, error in results:
+        status = "ok" if error is None else f"FAILED ({error})"
+        print(f"{name:<{width}}{elapsed:>10.2f}{peak / 1e6:>10.1f}  {status}")
+    print(f"{'total':<{width}}{total:>10.2f}")
+
+
+def print_chart_report(renders, wall):
+    width = max([34] + [len(r[0]) + 2 for r in renders])
+    print("\n---------- Chart timings ----------")
+    print(f"{'chart':<{width}}{'render (s)':>11}  status")
+    for name, _, seconds, error in renders:
+        print(f"{name:<{width}}{seconds:>11.2f}  {'ok' if error is None else f'FAILED ({error})'}")
+    print(f"{'sum':<{width}}{sum(r[2] for r in renders):>11.2f}")
+    print(f"{'wall (pool)':<{width}}{wall:>11.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", nargs="+", default=[CSV_IN],
+                        help="merged.csv export(s) to analyse; several run per account")
+    parser.add_argument("--per-account", action="store_true",
+                        help="run every stage per Account ID into OUT_DIR/<account>/, plus account_comparison")
+    parser.add_argument("--out-dir", default=OUT_DIR, help="where stage outputs are written")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES),
+                        help="subset of stages to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="run stages in a process pool of this size (default: 1, in-process)")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS),
+                        help=f"table formats to write (default: ${ENV_VAR} or csv)")
+    parser.add_argument("--outliers", metavar="RULE",
+                        help="outlier rule: fold[:F], mad[:Z], quantile[:Q] or none "
+                             "(default: $ANALYSIS_OUTLIER_RULE or fold:200)")
+    args = parser.parse_args(argv)
+    if args.formats:
+        set_formats(args.formats)  # via the environment, so pool workers see it too
+    if args.outliers:
+        from outliers import set_rule
+        set_rule(args.outliers)
+
+    start = time.perf_counter()
+    results = []
+    charts = []
+
+    if args.per_account or len(args.csv) > 1:
+        results, charts = run_accounts(args.csv, args.stages, args.out_dir, args.jobs)
+    elif args.jobs > 1:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=_init_worker,
+            initargs=(args.csv[0],),
+        ) as pool:
+            futures = [pool.submit(_run_in_worker, name, args.out_dir) for name in args.stages]
+            for future in as_completed(futures):
+                result, stage_charts = future.result()
+                results.append(result)
+                charts.extend(stage_charts)
+        results.sort(key=lambda r: args.stages.index(r[0]))
+    else:
+        load_start = time.perf_counter()
+        frames = load_frames(args.csv[0])
+        print(f"[ok] Loaded {len(frames['raw'])} posts in {time.perf_counter() - load_start:.2f}s")
+        for name in args.stages:
+            results.append(run_stage(name, frames, args.out_dir, charts))
+
+    # ---------- Charts ----------
+    renders = []
+    if charts:
+        charts.sort(key=lambda spec: spec.name)
+        render_start = time.perf_counter()
+        renders = render_charts(charts)
+        render_wall = time.perf_counter() - render_start
+        print_renders(renders)
+
+    print_report(results, time.perf_counter() - start)
+    if renders:
+        print_chart_report(renders, render_wall)
+    failed = any(error for *_, error in results) or any(error for *_, error in renders)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
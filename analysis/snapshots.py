@@ -0,0 +1,233 @@
+"""
+Append-only snapshot store of per-post insights over time.
+
+merged.csv only carries each post's lifetime totals (Date / Data comment are
+always "Lifetime"), so every refresh overwrites the last. Each refresh is
+appended here as a snapshot — one row per post: Post ID, Source, snapshot
+time, Publish time and the insight metrics as int32 — in Parquet files
+partitioned by snapshot month:
+
+    store/snapshots/month=2026-10/snapshot-20261018T154500.123456Z.parquet
+
+growth_curves() turns the snapshots into reach / likes / follows at age N
+curves for many posts at once: one merge_asof picks, per post and age, the
+latest snapshot at or before publish + N. read_snapshots() only opens the
+month partitions inside the requested time range.
+
+Snapshots are keyed by their time to the microsecond; a second snapshot at
+the same instant replaces the first. store.py's ingest() appends a snapshot
+of every export once it is stored. An export that is already in the manifest
+(same SHA-256) isn't appended again.
+
+    python analysis/snapshots.py                            # snapshot ../merged.csv
+    python analysis/snapshots.py --curves 1D 7D 30D 90D     # write growth_curves
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset import BASE, CSV_IN, METRIC_COLS, file_sha256, load_merged
+from outputs import write_table
+
+SNAPSHOT_DIR = os.path.join(BASE, "store", "snapshots")
+OUT_DIR = os.path.join(BASE, "output")
+
+KEY = ["Post ID", "Source"]
+CURVE_METRICS = ["Reach", "Likes", "Follows"]
+DEFAULT_AGES = ["1D", "2D", "7D", "30D", "90D"]
+
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def manifest_path(snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, "manifest.csv")
+
+
+def read_manifest(snapshot_dir=SNAPSHOT_DIR):
+    """One row per snapshot: snapshot time, export SHA-256, rows, file."""
+    path = manifest_path(snapshot_dir)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["snapshot", "sha256", "rows", "path"])
+    manifest = pd.read_csv(path, dtype={"sha256": str, "path": str})
+    manifest["snapshot"] = pd.to_datetime(manifest["snapshot"], utc=True, format="ISO8601")
+    return manifest
+
+
+def snapshot_table(export, at):
+    """The snapshot rows for one typed export (load_merged()) taken at `at`, as an Arrow table."""
+    import pyarrow as pa
+
+    values = export[METRIC_COLS].to_numpy(dtype=np.int64)
+    if len(values) and (values.min() < 0 or values.max() > INT32_MAX):
+        raise ValueError(f"Metric values outside int32 (max {values.max():,}) — can't snapshot this export")
+
+    publish = export["Publish time"].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy("datetime64[s]")
+    columns = {
+        "Post ID": pa.array(export["Post ID"].to_numpy(dtype=object), pa.string()),
+        "Source": pa.array(export["Source"].to_numpy(dtype=object), pa.string()).dictionary_encode(),
+        "snapshot": pa.array(np.full(len(export), at.tz_localize(None).to_datetime64(), dtype="datetime64[us]"),
+                             pa.timestamp("us", tz="UTC")),
+        "Publish time": pa.array(publish, pa.timestamp("s", tz="UTC"), mask=np.isnat(publish)),
+    }
+    for i, col in enumerate(METRIC_COLS):
+        columns[col] = pa.array(values[:, i].astype(np.int32), pa.int32())
+    return pa.table(columns)
+
+
+def append_snapshot(export, at=None, sha256=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Append `export` as the snapshot taken at `at` (default: now, UTC). Returns
+    the new file, or None when an export with this sha256 is already stored.
+    A snapshot already taken at `at` (to the microsecond) is replaced.
+    """
+    import pyarrow.parquet as pq
+
+    manifest = read_manifest(snapshot_dir)
+    if sha256 is not None and (manifest["sha256"] == sha256).any():
+        return None
+
+    at = pd.Timestamp.now("UTC") if at is None else _utc(at)
+    at = at.floor("us")
+
+    month_dir = os.path.join(snapshot_dir, f"month={at:%Y-%m}")
+    os.makedirs(month_dir, exist_ok=True)
+    path = os.path.join(month_dir, f"snapshot-{at:%Y%m%dT%H%M%S.%fZ}.parquet")
+    tmp = path + ".tmp"
+    pq.write_table(snapshot_table(export, at), tmp, compression="zstd")
+    os.replace(tmp, path)
+
+    entry = pd.DataFrame([{
+        "snapshot": at.isoformat(), "sha256": sha256 or "", "rows": len(export),
+        "path": os.path.relpath(path, snapshot_dir),
+    }])
+    replaced = manifest["snapshot"] == at
+    if replaced.any():
+        # Same instant: the file was overwritten above, so rewrite its manifest line
+        rest = manifest[~replaced].assign(snapshot=lambda m: m["snapshot"].map(pd.Timestamp.isoformat))
+        pd.concat([rest, entry], ignore_index=True).to_csv(manifest_path(snapshot_dir), index=False)
+    else:
+        entry.to_csv(manifest_path(snapshot_dir), mode="a", header=manifest.empty, index=False)
+    return path
+
+
+def record(csv_path=CSV_IN, at=None, snapshot_dir=SNAPSHOT_DIR, export=None):
+    """Snapshot one merged.csv export (skipped if this exact file is already stored)."""
+    export = load_merged(csv_path) if export is None else export
+    return append_snapshot(export, at, file_sha256(csv_path), snapshot_dir)
+
+
+def read_snapshots(posts=None, start=None, end=None, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Snapshot rows as a DataFrame, optionally only for `posts` (Post IDs) and
+    snapshots taken in [start, end]. Months outside the range aren't read.
+    """
+    import pyarrow.dataset as ds
+
+    if not os.path.isdir(snapshot_dir) or read_manifest(snapshot_dir).empty:
+        return None
+
+    dataset = ds.dataset(snapshot_dir, format="parquet", partitioning="hive",
+                         exclude_invalid_files=True, ignore_prefixes=["manifest", "."])
+    filters = []
+    if start is not None:
+        start = _utc(start)
+        filters += [ds.field("month") >= f"{start:%Y-%m}", ds.field("snapshot") >= start]
+    if end is not None:
+        end = _utc(end)
+        filters += [ds.field("month") <= f"{end:%Y-%m}", ds.field("snapshot") <= end]
+    if posts is not None:
+        filters.append(ds.field("Post ID").isin(list(posts)))
+
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas(coerce_temporal_nanoseconds=True)
+
+
+def growth_curves(ages=DEFAULT_AGES, metrics=CURVE_METRICS, posts=None, tolerance=None,
+                  snapshot_dir=SNAPSHOT_DIR):
+    """
+    Metric values at each age after publishing ("1D", "12h", ...), for every
+    post (or `posts`), as a long frame: KEY, Publish time, age, the snapshot
+    used and its observed age, and metrics as nullable int32.
+
+    Each (post, age) takes the latest snapshot at or before publish + age — a
+    single merge_asof over all posts. Values are missing when no snapshot is
+    that old yet, when the age lies past the newest snapshot, or when the
+    nearest snapshot is more than `tolerance` (e.g. "1D") earlier.
+    """
+    ages = pd.to_timedelta(pd.Index(ages)).astype("timedelta64[ns]")
+    snaps = read_snapshots(posts, columns=KEY + ["snapshot", "Publish time"] + list(metrics),
+                           snapshot_dir=snapshot_dir)
+    out_cols = KEY + ["Publish time", "age", "snapshot", "observed_age"] + list(metrics)
+    if snaps is None or snaps.empty:
+        return pd.DataFrame(columns=out_cols)
+    snaps = snaps.sort_values("snapshot", kind="stable")
+
+    # ---------- One target time per (post, age) ----------
+    published = snaps.drop_duplicates(KEY, keep="last")[KEY + ["Publish time"]]
+    published = published.dropna(subset=["Publish time"])
+    targets = published.loc[published.index.repeat(len(ages))].reset_index(drop=True)
+    targets["age"] = np.tile(ages.to_numpy(), len(published))
+    targets["at"] = targets["Publish time"] + targets["age"]
+
+    # ---------- As-of join: latest snapshot at or before each target ----------
+    curves = pd.merge_asof(
+        targets.sort_values("at", kind="stable"),
+        snaps[KEY + ["snapshot"] + list(metrics)],
+        left_on="at", right_on="snapshot", by=KEY, direction="backward",
+        tolerance=None if tolerance is None else pd.Timedelta(tolerance),
+    )
+    for col in metrics:
+        curves[col] = curves[col].astype("Int32")
+    # Ages past the newest snapshot haven't been observed yet
+    unobserved = curves["at"] > snaps["snapshot"].max()
+    curves.loc[unobserved, list(metrics)] = pd.NA
+    curves.loc[unobserved, "snapshot"] = pd.NaT
+    curves["observed_age"] = curves["snapshot"] - curves["Publish time"]
+
+    return curves.sort_values(KEY + ["age"], kind="stable").reset_index(drop=True)[out_cols]
+
+
+def _age_label(age):
+    days, rest = divmod(age, pd.Timedelta("1D"))
+    return f"{days}D" if not rest else f"{age / pd.Timedelta('1h'):g}h"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="per-post insight snapshots and growth curves")
+    parser.add_argument("--csv", default=CSV_IN, help="export to snapshot")
+    parser.add_argument("--at", help="snapshot time (ISO 8601, default: now UTC)")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--curves", nargs="*", metavar="AGE",
+                        help=f"write growth_curves for these ages instead (default ages: {' '.join(DEFAULT_AGES)})")
+    parser.add_argument("--tolerance", help="max gap between an age and the snapshot used, e.g. 1D")
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.curves is None:
+        path = record(args.csv, args.at, args.snapshot_dir)
+        if path is None:
+            print(f"Export already snapshotted: {args.csv}")
+        else:
+            print(f"[ok] Snapshot → {path}")
+        return
+
+    curves = growth_curves(args.curves or DEFAULT_AGES, tolerance=args.tolerance,
+                           snapshot_dir=args.snapshot_dir)
+    paths = write_table(curves.assign(age=curves["age"].map(_age_label)), args.out_dir, "growth_curves")
+    print(f"[ok] Wrote growth curves for {curves['Post ID'].nunique()} posts → {', '.join(paths)}\n")
+    print("Median by age:")
+    print(curves.groupby("age")[CURVE_METRICS].median().rename(index=_age_label).to_string())
+
+
+if __name__ == "__main__":
+    main()
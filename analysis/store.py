@@ -0,0 +1,181 @@
+"""
+Keyed post store with incremental (delta) ingest.
+
+Posts are keyed by (Post ID, Source). Ingesting a new merged.csv export
+appends posts the store hasn't seen, upserts posts whose insight metrics
+changed, leaves everything else alone and appends one line per change to
+changes.csv. Every export is also appended to the per-post snapshot store
+(snapshots.py) once it is stored, which keeps the metric history the post
+table overwrites.
+The overview and post-type aggregates are kept as mergeable
+sum/count states (aggregates.py) and updated from the delta instead of being
+recomputed over the full history.
+
+    python analysis/store.py                 # ingest ../merged.csv
+    python analysis/store.py path/to/export.csv
+"""
+import os
+import sys
+from collections import namedtuple
+
+import pandas as pd
+
+from dataset import CSV_IN, METRIC_COLS, load_merged, clean_engagement
+from aggregates import merge_states, subtract_state, read_state, write_state
+import snapshots
+from outputs import write_table
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE, "store")
+OUT_DIR = os.path.join(BASE, "output")
+
+KEY = ["Post ID", "Source"]
+
+# inserted: posts new to the store; before/after: old and new versions of updated posts
+Delta = namedtuple("Delta", ["inserted", "before", "after", "changes"])
+
+
+def store_paths(store_dir=STORE_DIR):
+    return {
+        "posts": os.path.join(store_dir, "posts.arrow"),
+        "changes": os.path.join(store_dir, "changes.csv"),
+        "overview": os.path.join(store_dir, "aggregates", "overview.csv"),
+        "posttype": os.path.join(store_dir, "aggregates", "posttype.csv"),
+    }
+
+
+def load_store(store_dir=STORE_DIR):
+    """Current store contents (None if nothing has been ingested yet)."""
+    path = store_paths(store_dir)["posts"]
+    if not os.path.exists(path):
+        return None
+    import pyarrow.feather as feather
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def diff_export(current, export, ingested_at=None):
+    """
+    Compare an export against the store on KEY. Posts are "updated" when any
+    insight metric differs; other fields (e.g. signed Media URLs) don't count.
+    """
+    ingested_at = ingested_at or pd.Timestamp.now("UTC").isoformat()
+    export = export.drop_duplicates(subset=KEY, keep="last").set_index(KEY)
+    metrics = [c for c in METRIC_COLS if c in export.columns]
+
+    if current is None or current.empty:
+        inserted = export
+        before = after = export.iloc[0:0]
+        changed_cols = []
+    else:
+        current = current.set_index(KEY)
+        is_new = ~export.index.isin(current.index)
+        inserted = export[is_new]
+
+        common = export.index[~is_new]
+        old_vals = current.loc[common, metrics].to_numpy()
+        new_vals = export.loc[common, metrics].to_numpy()
+        differs = old_vals != new_vals
+        changed = differs.any(axis=1)
+
+        before = current.loc[common[changed]]
+        after = export.loc[common[changed]]
+        names = pd.Index(metrics)
+        changed_cols = [";".join(names[row]) for row in differs[changed]]
+
+    changes = pd.concat([
+        pd.DataFrame({"change": "insert", "columns": ""}, index=inserted.index),
+        pd.DataFrame({"change": "update", "columns": changed_cols}, index=after.index),
+    ]).reset_index()
+    changes.insert(0, "ingested_at", ingested_at)
+
+    return Delta(inserted.reset_index(), before.reset_index(), after.reset_index(), changes)
+
+
+def apply_delta(current, delta):
+    """Store contents after upserting `delta` (updated rows replaced, new rows appended)."""
+    if current is None or current.empty:
+        return delta.inserted.reset_index(drop=True)
+    keys = pd.MultiIndex.from_frame(delta.after[KEY]) if len(delta.after) else None
+    kept = current
+    if keys is not None:
+        kept = current[~pd.MultiIndex.from_frame(current[KEY]).isin(keys)]
+    return pd.concat([kept, delta.after, delta.inserted], ignore_index=True)
+
+
+def update_aggregates(delta, store, store_dir=STORE_DIR, rebuild=False):
+    """
+    Apply the delta to the saved overview / post-type states. A missing state
+    (or rebuild=True) is built from the full store instead.
+    """
+    from overview import summary_state
+    from post_type_analysis import type_state
+
+    paths = store_paths(store_dir)
+    added = pd.concat([delta.inserted, delta.after], ignore_index=True)
+
+    states = {}
+    for name, build, prepare in [
+        ("overview", summary_state, lambda df: df),
+        ("posttype", type_state, clean_engagement),
+    ]:
+        state = read_state(paths[name])
+        if state is None or rebuild:
+            state = build(prepare(store))
+        else:
+            state = merge_states(state, build(prepare(added)))
+            state = subtract_state(state, build(prepare(delta.before)))
+        write_state(state, paths[name])
+        states[name] = state
+    return states
+
+
+def ingest(csv_path=CSV_IN, store_dir=STORE_DIR):
+    """Ingest one export as a delta; returns (delta, updated aggregate states)."""
+    paths = store_paths(store_dir)
+    os.makedirs(store_dir, exist_ok=True)
+
+    current = load_store(store_dir)
+    export = load_merged(csv_path)
+    delta = diff_export(current, export)
+
+    states = None
+    if current is None or not delta.changes.empty:
+        store = apply_delta(current, delta)
+
+        import pyarrow.feather as feather
+        tmp = paths["posts"] + ".tmp"
+        feather.write_feather(store, tmp, compression="uncompressed")
+        os.replace(tmp, paths["posts"])
+
+        log_exists = os.path.exists(paths["changes"])
+        delta.changes.to_csv(paths["changes"], mode="a", header=not log_exists, index=False)
+        states = update_aggregates(delta, store, store_dir, rebuild=current is None)
+
+    # Only once the store is written, so a failed ingest leaves no snapshot behind
+    snapshots.record(csv_path, snapshot_dir=os.path.join(store_dir, "snapshots"), export=export)
+    return delta, states
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    csv_path = argv[0] if argv else CSV_IN
+
+    delta, states = ingest(csv_path)
+    print(f"[ok] Ingested {csv_path}: {len(delta.inserted)} new, {len(delta.after)} updated")
+    if states is None:
+        print("No changes — aggregates untouched.")
+        return
+
+    from overview import build_summary
+    from post_type_analysis import summarize
+
+    posttype = summarize(states["posttype"])
+    paths = write_table(posttype, OUT_DIR, "posttype_comparison")
+    print(f"[ok] Updated post type comparison from delta → {', '.join(paths)}\n")
+    print(posttype.to_string(index=False))
+    print()
+    print(build_summary(state=states["overview"]).T)
+
+
+if __name__ == "__main__":
+    main()
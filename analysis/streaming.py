@@ -0,0 +1,197 @@
+"""
+Streaming (chunked) metric computation for exports too large to load at once.
+
+merged.csv is read in fixed-size chunks (dataset.iter_merged). Every chunk is
+reduced to the same mergeable sum/count states the in-memory stages use
+(aggregates.py) — overview totals, per post type, hashtag vs no-hashtag, per
+hashtag and per word, plus a weekday x hour week_grid accumulator — and the
+states are merged in file order. Leaderboards (top posts by engagement rate)
+are kept as bounded top-k boards (ranking.merge_top_k).
+
+Peak memory is one chunk plus the states, which grow with the number of
+distinct groups (hashtags, words), not with the number of rows.
+
+The tables written here match the in-memory stages' CSV outputs (up to float
+summation order); charts still need the in-memory path.
+
+    python analysis/streaming.py
+    python analysis/streaming.py --csv big.csv --chunksize 50000 --check
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from functools import partial
+
+from dataset import CSV_IN, CHUNK_ROWS, iter_merged, load_merged, clean_engagement, drop_outlier
+from aggregates import merge_states
+from ranking import merge_top_k
+from week_grid import merge_grids
+from outputs import read_table, write_table
+from tokens import caption_tokens, load_stopwords
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "output", "streamed")
+
+STATES = [
+    "overview", "posttype", "hashtag_summary", "hashtags", "weekly_reach", "words",
+    "engagement_top",
+]
+
+# Tables whose index is data (kept on write, like the in-memory outputs)
+INDEXED_TABLES = {"hashtag_summary", "top_hashtags", "weekly_reach_grid", "weekly_reach_curve"}
+# Tables the stages write themselves; --check compares them as read back from disk
+WRITTEN_TABLES = ["posttype_comparison", "hashtag_summary", "top_hashtags", "wordcloud_data", "engagement_top25"]
+
+
+def mergers():
+    """State name -> merge function, for states that aren't aggregates.py sum/count frames."""
+    import engagement_rate
+    return {
+        "weekly_reach": merge_grids,
+        "engagement_top": partial(merge_top_k, k=engagement_rate.TOP_N, by=engagement_rate.RANK_KEYS),
+    }
+
+
+def chunk_states(chunk, stop_words):
+    """All mergeable states for one typed chunk of merged.csv."""
+    import overview
+    import post_type_analysis
+    import hashtag_analysis
+    import weekly_heatmap
+    import word_cloud
+    import engagement_rate
+
+    engaged = clean_engagement(chunk)
+    clean = drop_outlier(engaged)
+    tagged, hashtags = hashtag_analysis.with_hashtag_counts(clean)
+    words = caption_tokens(clean["Description"], "words", stop_words)
+
+    return {
+        "overview": overview.summary_state(chunk),
+        "posttype": post_type_analysis.type_state(engaged),
+        "hashtag_summary": hashtag_analysis.summary_state(tagged),
+        "hashtags": hashtag_analysis.tag_state(tagged, hashtags),
+        "weekly_reach": weekly_heatmap.reach_state(chunk),
+        "words": word_cloud.word_state(words, clean["EngagementRate"]),
+        "engagement_top": engagement_rate.top_posts(engaged),
+    }
+
+
+def stream_states(csv_path=CSV_IN, chunksize=CHUNK_ROWS):
+    """Merged states over the whole CSV, reading `chunksize` rows at a time."""
+    stop_words = load_stopwords()
+    merge = mergers()
+    states = dict.fromkeys(STATES)
+    for chunk in iter_merged(csv_path, chunksize):
+        for name, state in chunk_states(chunk, stop_words).items():
+            states[name] = merge.get(name, merge_states)(states[name], state)
+    return states
+
+
+def tables(states):
+    """Output tables from merged states, shaped like the in-memory stage outputs."""
+    import overview
+    import post_type_analysis
+    import hashtag_analysis
+    import weekly_heatmap
+    import word_cloud
+    import engagement_rate
+
+    top = states["engagement_top"]
+    grid, curve = weekly_heatmap.grid_from_state(states["weekly_reach"])
+    return {
+        "overview_summary": overview.build_summary(state=states["overview"]),
+        "posttype_comparison": post_type_analysis.summarize(states["posttype"]),
+        "hashtag_summary": hashtag_analysis.summarize(states["hashtag_summary"]),
+        "top_hashtags": hashtag_analysis.top_tags_table(
+            hashtag_analysis.tag_stats(states["hashtags"])
+        ),
+        "weekly_reach_grid": grid,
+        "weekly_reach_curve": curve.rename("Reach").to_frame(),
+        "wordcloud_data": word_cloud.normalize_engagement(
+            word_cloud.state_word_stats(states["words"])
+        ),
+        "engagement_top25": top[[c for c in engagement_rate.KEEP_COLS if c in top.columns]],
+    }
+
+
+def stage_tables(df, out_dir):
+    """
+    The same tables from the stages' own run() over one in-memory frame (the
+    reference for --check). Tables the stages write are read back from
+    out_dir; the overview summary and the reach grid / curve come from run()'s
+    return values. Charts are collected, not drawn.
+    """
+    import contextlib
+    import io
+    import overview
+    import post_type_analysis
+    import hashtag_analysis
+    import weekly_heatmap
+    import word_cloud
+    import engagement_rate
+
+    engaged = clean_engagement(df)
+    charts = []
+    with contextlib.redirect_stdout(io.StringIO()):  # the stages print previews
+        summary = overview.run(df, out_dir)
+        grid, curve = weekly_heatmap.run(df, out_dir, charts)
+        post_type_analysis.run(engaged, out_dir, charts)
+        hashtag_analysis.run(engaged, out_dir, charts)
+        word_cloud.run(engaged, out_dir, charts)
+        engagement_rate.run(engaged, out_dir)
+
+    reference = {name: read_table(out_dir, name) for name in WRITTEN_TABLES}
+    reference.update({
+        "overview_summary": summary,
+        "weekly_reach_grid": grid,
+        "weekly_reach_curve": curve.rename("Reach").to_frame(),
+    })
+    return reference
+
+
+def check(streamed, out_dir, reference):
+    """Assert every streamed table equals the stage's own output (written tables as read back)."""
+    import pandas as pd
+
+    for name, table in streamed.items():
+        got = read_table(out_dir, name) if name in WRITTEN_TABLES else table
+        pd.testing.assert_frame_equal(
+            got, reference[name], check_exact=False, rtol=1e-9, check_dtype=False,
+        )
+        print(f"[ok] {name} matches the stage's output")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chunked metric computation over merged.csv")
+    parser.add_argument("--csv", default=CSV_IN)
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--check", action="store_true",
+                        help="also run the stages in memory and compare with their outputs (loads the full CSV)")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    states = stream_states(args.csv, args.chunksize)
+    streamed = tables(states)
+    secs = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for name, table in streamed.items():
+        write_table(table, args.out_dir, name, index=name in INDEXED_TABLES)
+    posts = int(states["overview"]["count"].iloc[0])
+    print(f"[ok] Streamed {posts:,} posts in chunks of {args.chunksize:,} "
+          f"({secs:.2f}s, peak {peak / 2**20:.1f} MB) → {args.out_dir}")
+
+    if args.check:
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as ref_dir:
+            check(streamed, args.out_dir, stage_tables(load_merged(args.csv), ref_dir))
+
+
+if __name__ == "__main__":
+    main()
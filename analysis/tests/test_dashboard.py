@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("plotly")
+# The dashboard modules import each other from analysis/dashboard/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard"))
+
+from figures import make_reach_likes_fig  # noqa: E402
+from post_index import PostIndex  # noqa: E402
+
+
+def scatter_points(outlier_reach=251351):
+    return pd.DataFrame({
+        "Reach": [120, 800, 5000, outlier_reach],
+        "Likes": [4, 30, 180, 9936],
+        "Publish time": ["01/02/2024"] * 4,
+        "Permalink": [f"https://example.com/p/{i}" for i in range(4)],
+        "Outlier": [False, False, False, True],
+    })
+
+
+def test_reach_likes_axes_ignore_the_outlier_but_still_draw_it():
+    fig = make_reach_likes_fig(scatter_points())
+
+    assert fig.layout.xaxis.range[1] == pytest.approx(5000 * 1.05)
+    assert fig.layout.yaxis.range[1] == pytest.approx(180 * 1.05)
+    posts, outlier = fig.data
+    assert len(posts.x) == 3
+    # Pinned at the axis edge; its real values travel in customdata
+    assert list(outlier.x) == [pytest.approx(5000 * 1.05)]
+    assert list(outlier.customdata[0][2:]) == [251351, 9936]
+
+
+def test_conversion_table_ranks_posts_by_follows_per_reach():
+    points = pd.DataFrame({
+        "Publish epoch": [3, 1, 2, 4],
+        "Post type": ["IMAGE", "VIDEO", "IMAGE", "IMAGE"],
+        "Reach": [200, 100, 0, 400],
+        "Follows": [1, 3, 5, 4],
+        "Likes": [1, 2, 3, 4],
+        "Media URL": [None] * 4,
+        "Description": ["c", "a", "b", "d"],
+    })
+    index = PostIndex(points)
+
+    rows, pages = index.conversion_page(index.select())
+
+    # Posts without reach can't convert and are left out
+    assert rows["Description"].tolist() == ["a", "d", "c"]
+    assert rows["Conversion"].tolist() == [0.03, 0.01, 0.005]
+    assert pages == 1
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+import outliers
+from dataset import coerce_types, load_merged, partition_accounts
+from outputs import write_table
+
+HEADER = "Source,Post ID,Account ID,Post type,Publish time,Reach,Likes,Comments,Shares,Saved,Follows\n"
+
+
+def write_export(path, rows):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows))
+    return str(path)
+
+
+def test_publish_time_parses_api_and_stories_formats(tmp_path):
+    csv = write_export(tmp_path / "merged.csv", [
+        "API,1,9,IMAGE,2024-03-08T14:28:27+0000,100,1,0,0,0,0",
+        "Stories CSV,2,9,IG story,2024-10-27T00:32:00.000Z,50,0,0,0,0,0",
+    ])
+    df = load_merged(csv, use_cache=False)
+
+    assert df["Publish time"].notna().all()
+    assert list(df["Publish time"]) == [
+        pd.Timestamp("2024-03-08 14:28:27", tz="UTC"),
+        pd.Timestamp("2024-10-27 00:32:00", tz="UTC"),
+    ]
+    # The story was posted on the evening of the 26th, New York time
+    assert list(df["Local date"]) == ["2024-03-08", "2024-10-26"]
+
+
+@pytest.mark.parametrize("first", ["api", "stories"])
+def test_publish_time_does_not_depend_on_the_first_row(first):
+    # pandas infers one format from the first value, which turned every row of the other spelling into NaT
+    api, story = "2024-03-08T14:28:27+0000", "2024-10-27T00:32:00.000Z"
+    times = [api, story] * 3 if first == "api" else [story, api] * 3
+    df = coerce_types(pd.DataFrame({"Publish time": pd.Series(times + [None], dtype="str")}))
+
+    assert df["Publish time"].iloc[:-1].notna().all()
+    assert pd.isna(df["Publish time"].iloc[-1])
+    assert set(df["Publish time"].dropna()) == {
+        pd.Timestamp("2024-03-08 14:28:27", tz="UTC"),
+        pd.Timestamp("2024-10-27 00:32:00", tz="UTC"),
+    }
+
+
+def test_csv_tables_keep_export_timestamp_format(tmp_path):
+    csv = write_export(tmp_path / "merged.csv", [
+        "API,1,9,IMAGE,2024-03-08T14:28:27+0000,100,1,0,0,0,0",
+        "Stories CSV,2,9,IG story,2024-10-27T00:32:00.000Z,50,0,0,0,0,0",
+    ])
+    df = load_merged(csv, use_cache=False)
+    (path,) = write_table(df[["Post ID", "Publish time"]], str(tmp_path / "out"), "table", formats="csv")
+
+    written = pd.read_csv(path, dtype=str)["Publish time"].tolist()
+    assert written == ["2024-03-08T14:28:27+0000", "2024-10-27T00:32:00+0000"]
+
+
+PARTITION_HEADER = "Source,Post ID,Account ID,Account username,Post type,Publish time,Reach\n"
+
+
+def test_partition_accounts_of_header_only_export(tmp_path):
+    csv = tmp_path / "merged.csv"
+    csv.write_text(PARTITION_HEADER)
+
+    assert partition_accounts([str(csv)], str(tmp_path / "accounts")) == []
+
+
+def test_partition_accounts_flags_outliers_once_per_account(tmp_path, monkeypatch):
+    csv = tmp_path / "merged.csv"
+    csv.write_text(PARTITION_HEADER + "".join(
+        f"API,{i},{account},{name},IMAGE,2024-03-08T14:28:27+0000,100\n"
+        for i, (account, name) in enumerate([("1", "a"), ("1", "a"), ("2", "b")])
+    ))
+    calls = []
+    real = outliers.outlier_columns
+    monkeypatch.setattr(outliers, "outlier_columns", lambda df, rule=None: calls.append(len(df)) or real(df, rule))
+
+    parts = partition_accounts([str(csv)], str(tmp_path / "accounts"))
+
+    assert [(p["label"], p["posts"]) for p in parts] == [("a", 2), ("b", 1)]
+    assert sorted(calls) == [1, 2]
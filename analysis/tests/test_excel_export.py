@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import excel_export
+from excel_export import EXCEL_MAX_NAME, write_workbook
+
+
+@pytest.mark.parametrize("engine", ["xlsxwriter", "openpyxl"])
+def test_split_sheet_names_fit_excel_limit(tmp_path, monkeypatch, engine):
+    pytest.importorskip(engine)
+    monkeypatch.setattr(excel_export, "EXCEL_MAX_ROWS", 3)  # two data rows per sheet
+    name = "Posts by publish time and type"  # 30 characters
+    path = str(tmp_path / "book.xlsx")
+
+    write_workbook(path, [(name, pd.DataFrame({"Reach": range(5)}), {})], engine=engine)
+
+    sheets = list(pd.read_excel(path, sheet_name=None))
+    assert sheets == [name, "Posts by publish time and t (2)", "Posts by publish time and t (3)"]
+    assert all(len(s) <= EXCEL_MAX_NAME for s in sheets)
+
+
+def test_rawdata_cells_carry_the_loader_types(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    import overview
+    from dataset import load_merged
+
+    csv = tmp_path / "merged.csv"
+    csv.write_text(
+        "Source,Post ID,Account ID,Post type,Publish time,Reach,Likes,Replies\n"
+        "API,18083604170019341,17841400539558029,IMAGE,2024-10-27T00:32:00.000Z,100,,\n"
+    )
+    overview.run(load_merged(str(csv), use_cache=False), out_dir=str(tmp_path))
+
+    ws = openpyxl.load_workbook(tmp_path / "overview.xlsx", read_only=True)["RawData"]
+    header, row = ([c.value for c in r] for r in ws.iter_rows(max_row=2))
+    cells = dict(zip(header, row))
+    assert cells["Post ID"] == "18083604170019341"
+    assert cells["Publish time"] == datetime(2024, 10, 27, 0, 32)
+    assert cells["Likes"] == 0 and cells["Replies"] == 0
@@ -0,0 +1,51 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from hashtag_analysis import extract_hashtags, per_hashtag_stats, with_hashtag_counts
+
+CAPTIONS = pd.Series([
+    "Opening night! #HamletIsntDead #NYCTheatre",
+    "Link fragments count too: https://hid.example/#tickets",
+    None,
+    "#hamletisntdead again, plus #For_Bards_Sake and #2024",
+    "Emoji then tag 💕#NYCtheatre#Hidiots",
+    "",
+], dtype="str")
+
+
+def test_extract_hashtags_matches_per_caption_findall():
+    # hashtag_analysis.py before vectorizing: re.findall on each lower-cased caption
+    expected = [re.findall(r"#\w+", c.lower()) if isinstance(c, str) else [] for c in CAPTIONS]
+
+    found = extract_hashtags(CAPTIONS)
+
+    assert [tags if isinstance(tags, list) else [] for tags in found] == expected
+
+
+def test_per_hashtag_stats_match_the_row_loop():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "Description": CAPTIONS,
+        "EngagementRate": rng.random(len(CAPTIONS)) * 20,
+        "Reach": rng.integers(1, 1000, len(CAPTIONS)),
+        "Likes": rng.integers(0, 50, len(CAPTIONS)),
+    })
+    df, hashtags = with_hashtag_counts(df)
+
+    rows = []
+    for r, tags in zip(df.itertuples(), hashtags):
+        for h in tags if isinstance(tags, list) else []:
+            rows.append((h, r.EngagementRate, r.Reach, r.Likes))
+    expected = (
+        pd.DataFrame(rows, columns=["Hashtag", "EngagementRate", "Reach", "Likes"])
+        .groupby("Hashtag")
+        .agg({"EngagementRate": "mean", "Reach": "mean", "Likes": "mean", "Hashtag": "count"})
+        .rename(columns={"Hashtag": "PostCount"})
+    )
+
+    stats = per_hashtag_stats(df, hashtags)
+
+    assert df["NumHashtags"].tolist() == [2, 1, 0, 3, 2, 0]
+    pd.testing.assert_frame_equal(stats, expected, check_dtype=False, check_index_type=False)
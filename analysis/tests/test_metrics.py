@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from dataset import clean_engagement
+from metrics import in_range, metric_values, with_metrics
+
+
+def counts():
+    rng = np.random.default_rng(0)
+    n = 500
+    reach = rng.integers(0, 2000, n)
+    reach[:10] = 0  # posts without reach
+    frame = pd.DataFrame({
+        "Reach": reach,
+        **{col: rng.integers(0, 80, n) for col in
+           ["Likes", "Comments", "Shares", "Saved", "Follows", "Replies"]},
+        "Total Interactions": rng.integers(0, 200, n) * (rng.random(n) < 0.7),
+    })
+    frame.loc[20:30, "Likes"] = 5000  # rates over 100%
+    return frame
+
+
+def test_clean_engagement_matches_the_inline_formulas():
+    df = counts()
+    reach = df["Reach"].where(df["Reach"] != 0)
+    expected = df.assign(TotalEngagements=df["Likes"] + df["Comments"] + df["Shares"] + df["Saved"])
+    expected["EngagementRate"] = expected["TotalEngagements"] / reach * 100
+    expected["FollowConversionRate"] = expected["Follows"] / reach * 100
+    rate = expected["EngagementRate"]
+    expected = expected[rate.notna() & (rate >= 0) & (rate <= 99.99)]
+
+    pd.testing.assert_frame_equal(clean_engagement(df), expected, check_dtype=False)
+
+
+def test_conversion_and_boost_score_match_the_inline_formulas():
+    df = counts()
+    conversion = df["Follows"] / df["Reach"].where(df["Reach"] != 0)
+    total = df["Total Interactions"].where(
+        df["Total Interactions"] > 0,
+        df[["Likes", "Comments", "Shares", "Saved", "Replies", "Follows"]].sum(axis=1),
+    )
+    boost = total / df["Reach"].where(df["Reach"] != 0)
+
+    np.testing.assert_allclose(metric_values(df, "Conversion"), conversion)
+    scored = with_metrics(df, {"score": "BoostScore"})
+    kept = in_range(scored, "BoostScore", "score")
+    np.testing.assert_array_equal(kept, (boost.notna() & (boost >= 0) & (boost <= 1.0)).to_numpy())
+    np.testing.assert_allclose(scored["score"][kept], boost[kept])
+
+
+def test_metrics_follow_in_place_edits():
+    df = counts()
+    before = metric_values(df, "Conversion").copy()
+    df["Follows"] = df["Follows"] * 2
+
+    np.testing.assert_allclose(metric_values(df, "Conversion"), before * 2)
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pytest
+
+from dataset import CSV_IN
+from outliers import DEFAULT_RULE, assess, parse_rule
+
+VIRAL_POST = "18073628026714616"
+
+
+def sample():
+    """Videos around 700 reach plus one viral video; stories around 70 with a few busy ones."""
+    rng = np.random.default_rng(0)
+    videos = list(rng.integers(400, 1000, 30)) + [251351]
+    stories = list(rng.integers(50, 90, 200)) + [571, 693, 823]
+    reach = np.array(videos + stories)
+    types = np.array(["VIDEO"] * len(videos) + ["IG story"] * len(stories), dtype=object)
+    return reach, types
+
+
+def test_default_rule_flags_the_viral_post_but_not_busy_stories():
+    reach, types = sample()
+    flags = assess(reach, types, parse_rule(DEFAULT_RULE)).flags
+
+    assert list(reach[flags]) == [251351]
+
+
+def test_mad_is_stricter_on_tightly_spread_stories():
+    reach, types = sample()
+    flags = assess(reach, types, parse_rule("mad:3.5")).flags
+
+    assert 251351 in reach[flags]
+    assert {571, 693, 823} <= set(reach[flags & (types == "IG story")])
+
+
+@pytest.mark.skipif(not os.path.exists(CSV_IN), reason="merged export not available")
+def test_default_rule_excludes_only_the_viral_post_in_the_export():
+    from dataset import load_merged
+
+    df = load_merged(use_cache=False)
+    flags = assess(df["Reach"].to_numpy(), df["Post type"].to_numpy(dtype=object), parse_rule(DEFAULT_RULE)).flags
+
+    assert df.loc[flags, "Post ID"].tolist() == [VIRAL_POST]
@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+import pytest
+
+import outputs
+from outputs import parse_formats, read_table, set_formats, write_table
+
+
+def table():
+    return pd.DataFrame({
+        "Post ID": pd.array(["0018073628026714616", "42"], dtype="str"),
+        "Conversion": [0.0125, 0.5],
+        "Follows": pd.array([3, None], dtype="Int64"),
+        "Publish time": pd.to_datetime(["2024-03-08T14:28:27+0000", "2024-10-27T00:32:00.000Z"], format="ISO8601"),
+    }, index=pd.Index(["IMAGE", "REELS"], name="Post type"))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_columnar_formats_round_trip_dtypes(tmp_path, fmt):
+    pytest.importorskip("pyarrow")
+    frame = table()
+
+    (path,) = write_table(frame, str(tmp_path), "conversion", index=True, formats=fmt)
+
+    assert path == os.path.join(str(tmp_path), "conversion." + fmt)
+    back = read_table(str(tmp_path), "conversion", index=True)
+    pd.testing.assert_frame_equal(back, frame, check_dtype=False)
+    assert back["Post ID"].tolist() == ["0018073628026714616", "42"]  # leading zeros kept
+    assert str(back["Follows"].dtype) == "Int64"
+
+
+def test_csv_keeps_the_export_spelling_and_index(tmp_path):
+    write_table(table(), str(tmp_path), "conversion", index=True, formats="csv")
+
+    back = read_table(str(tmp_path), "conversion", index=True)
+
+    assert back.index.tolist() == ["IMAGE", "REELS"]
+    assert back["Publish time"].tolist() == ["2024-03-08T14:28:27+0000", "2024-10-27T00:32:00+0000"]
+    assert back["Conversion"].tolist() == [0.0125, 0.5]
+
+
+def test_read_table_prefers_columnar_formats(tmp_path):
+    pytest.importorskip("pyarrow")
+    paths = write_table(table(), str(tmp_path), "conversion", formats=["csv", "parquet"])
+    assert [os.path.basename(p) for p in paths] == ["conversion.csv", "conversion.parquet"]
+
+    # Parquet wins over CSV, so Post ID keeps its leading zeros
+    assert read_table(str(tmp_path), "conversion")["Post ID"][0] == "0018073628026714616"
+    with pytest.raises(FileNotFoundError):
+        read_table(str(tmp_path), "missing")
+
+
+def test_formats_come_from_the_environment(monkeypatch):
+    monkeypatch.delenv(outputs.ENV_VAR, raising=False)
+    assert outputs.output_formats() == ("csv",)
+
+    set_formats(" Parquet, csv,parquet ")
+    assert outputs.output_formats() == ("parquet", "csv")
+    with pytest.raises(ValueError):
+        parse_formats("csv,xlsx")
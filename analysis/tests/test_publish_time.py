@@ -0,0 +1,62 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from publish_time import LOCAL_TZ, local_time_columns, parse_publish_time
+
+ISO = [
+    "2024-03-08T14:28:27+0000",
+    "2024-10-27T00:32:00.000Z",
+    "2024-10-27T00:32:00.125Z",
+    "2024-07-01T09:15:00+05:30",
+    "2024-07-01T09:15:00-0400",
+    " 2024-01-05T23:59:59+0000 ",
+]
+LOCAL = ["2024-07-01T09:15:00", "5/29/25 5:04", "5/29/2025 17:04", "5/29/25 5:04 PM"]
+BROKEN = ["not a time", "", None]
+
+
+@pytest.fixture(params=["pyarrow", "pandas"])
+def strings(request, monkeypatch):
+    """Series factory for Publish time text; the "pandas" case runs without pyarrow."""
+    if request.param == "pyarrow":
+        return lambda values, **kw: pd.Series(values, dtype="str", **kw)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # import pyarrow raises ImportError
+    return lambda values, **kw: pd.Series(values, dtype=object, **kw)
+
+
+def test_iso_times_match_pandas_iso8601(strings):
+    raw = strings(ISO, index=range(10, 10 + len(ISO)))
+
+    parsed = parse_publish_time(raw)
+
+    expected = pd.to_datetime(raw.str.strip(), format="ISO8601", utc=True)
+    pd.testing.assert_series_equal(parsed, expected, check_dtype=False)
+
+
+def test_times_without_an_offset_are_new_york_time(strings):
+    parsed = parse_publish_time(strings(LOCAL + BROKEN))
+
+    assert parsed.iloc[len(LOCAL):].isna().all()
+    assert list(parsed.iloc[:len(LOCAL)].dt.tz_convert(LOCAL_TZ).dt.strftime("%Y-%m-%d %H:%M")) == [
+        "2024-07-01 09:15", "2025-05-29 05:04", "2025-05-29 17:04", "2025-05-29 17:04",
+    ]
+
+
+def test_local_columns_match_tz_convert():
+    rng = np.random.default_rng(0)
+    # Two years of UTC times, so both DST switches are crossed
+    times = pd.Series(pd.to_datetime(rng.integers(1_700_000_000, 1_763_000_000, 500), unit="s", utc=True))
+    times[::37] = pd.NaT
+
+    cols = local_time_columns(times)
+
+    local = times.dt.tz_convert(LOCAL_TZ)
+    valid = times.notna()
+    assert cols["Publish epoch"][valid].tolist() == times[valid].dt.as_unit("s").astype("int64").tolist()
+    assert cols["Local date"][valid].tolist() == local[valid].dt.strftime("%Y-%m-%d").tolist()
+    assert cols["Local weekday"][valid].tolist() == local[valid].dt.dayofweek.tolist()
+    assert cols["Local hour"][valid].tolist() == local[valid].dt.hour.tolist()
+    assert all(cols[name][~valid].isna().all() for name in cols)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking import merge_top_k, rank_all, top_k
+
+
+def posts(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    rate = rng.integers(0, 20, n).astype(float)  # plenty of ties
+    rate[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "EngagementRate": rate,
+        "Reach": rng.integers(0, 5, n),
+        "Post ID": [f"p{i}" for i in range(n)],
+    }, index=rng.permutation(n))
+
+
+@pytest.mark.parametrize("k", [0, 1, 7, 50, 400, 1000])
+@pytest.mark.parametrize("by, ascending", [
+    ("EngagementRate", False),
+    (["EngagementRate", "Reach"], False),
+    (["EngagementRate", "Reach"], [False, True]),
+    ("Reach", True),
+])
+def test_top_k_matches_a_stable_sort(k, by, ascending):
+    df = posts()
+
+    expected = df.sort_values(by, ascending=ascending, kind="stable").head(k)
+
+    pd.testing.assert_frame_equal(top_k(df, k, by, ascending), expected)
+
+
+def test_rank_all_is_the_full_stable_sort():
+    df = posts()
+    by = ["EngagementRate", "Reach"]
+
+    pd.testing.assert_frame_equal(rank_all(df, by), df.sort_values(by, ascending=False, kind="stable"))
+
+
+@pytest.mark.parametrize("chunk", [1, 33, 400])
+def test_merge_top_k_over_chunks_matches_one_pass(chunk):
+    df = posts()
+    by = ["EngagementRate", "Reach"]
+
+    board = None
+    for start in range(0, len(df), chunk):
+        board = merge_top_k(board, df.iloc[start:start + chunk], 25, by)
+
+    pd.testing.assert_frame_equal(board, top_k(df, 25, by))
@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+
+import snapshots
+import store
+from dataset import METRIC_COLS
+
+HEADER = ",".join(["Source", "Post ID", "Account ID", "Post type", "Publish time"] + METRIC_COLS) + "\n"
+
+
+def write_export(path, reach):
+    """A two-post export; `reach` is the first post's Reach."""
+    blanks = "," * (len(METRIC_COLS) - 3)
+    rows = [
+        f"API,1,9,IMAGE,2024-03-08T14:28:27+0000,,,{reach}{blanks}",
+        f"API,2,9,REELS,2024-03-09T18:00:00+0000,,,40{blanks}",
+    ]
+    path.write_text(HEADER + "".join(row + "\n" for row in rows))
+    return str(path)
+
+
+def test_back_to_back_ingests_each_get_a_snapshot(tmp_path):
+    store_dir = str(tmp_path / "store")
+    first = write_export(tmp_path / "first.csv", reach=100)
+    second = write_export(tmp_path / "second.csv", reach=150)
+
+    # Well within one second of each other
+    store.ingest(first, store_dir)
+    delta, _ = store.ingest(second, store_dir)
+
+    assert len(delta.after) == 1
+    manifest = snapshots.read_manifest(str(tmp_path / "store" / "snapshots"))
+    assert len(manifest) == 2
+    assert manifest["snapshot"].is_unique
+
+
+def test_snapshot_at_the_same_instant_replaces_the_first(tmp_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+    at = pd.Timestamp("2026-10-18 15:45:00.5", tz="UTC")
+    first = write_export(tmp_path / "first.csv", reach=100)
+    second = write_export(tmp_path / "second.csv", reach=150)
+
+    snapshots.record(first, at, snapshot_dir)
+    snapshots.record(second, at, snapshot_dir)
+
+    manifest = snapshots.read_manifest(snapshot_dir)
+    assert list(manifest["snapshot"]) == [at]
+    rows = snapshots.read_snapshots(snapshot_dir=snapshot_dir)
+    assert rows.set_index("Post ID").loc["1", "Reach"] == 150
+
+
+def test_failed_store_write_leaves_no_snapshot(tmp_path, monkeypatch):
+    store_dir = str(tmp_path / "store")
+    export = write_export(tmp_path / "merged.csv", reach=100)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "update_aggregates", fail)
+    with pytest.raises(OSError):
+        store.ingest(export, store_dir)
+
+    assert snapshots.read_manifest(str(tmp_path / "store" / "snapshots")).empty
+
+
+def write_posts(path, posts):
+    """One export row per (post id, post type, reach, likes, follows); other metrics blank."""
+    rows = []
+    for i, (pid, kind, reach, likes, follows) in enumerate(posts):
+        metrics = dict.fromkeys(METRIC_COLS, "") | {"Reach": reach, "Likes": likes, "Saved": 2, "Follows": follows}
+        rows.append(",".join(["API", str(pid), "9", kind, f"2024-03-0{1 + i % 9}T14:28:27+0000"]
+                             + [str(metrics[c]) for c in METRIC_COLS]))
+    path.write_text(HEADER + "".join(row + "\n" for row in rows))
+    return str(path)
+
+
+def test_delta_aggregates_match_a_rebuild_from_the_store(tmp_path):
+    store_dir = str(tmp_path / "store")
+    first = write_posts(tmp_path / "first.csv", [
+        (1, "IMAGE", 100, 10, 1), (2, "REELS", 300, 25, 0), (3, "IMAGE", 120, 8, 2),
+    ])
+    second = write_posts(tmp_path / "second.csv", [
+        (1, "IMAGE", 180, 14, 3),  # metrics grew
+        (2, "REELS", 300, 25, 0),  # unchanged
+        (3, "IMAGE", 120, 8, 2),
+        (4, "CAROUSEL_ALBUM", 90, 6, 1),  # new
+    ])
+
+    store.ingest(first, store_dir)
+    delta, states = store.ingest(second, store_dir)
+
+    assert delta.inserted["Post ID"].tolist() == ["4"]
+    assert delta.after["Post ID"].tolist() == ["1"]
+    assert delta.changes.set_index("Post ID")["columns"].to_dict() == {"4": "", "1": "Reach;Likes;Follows"}
+
+    stored = store.load_store(store_dir)
+    assert sorted(stored["Post ID"]) == ["1", "2", "3", "4"]
+    assert stored.set_index("Post ID").loc["1", "Reach"] == 180
+
+    rebuilt = store.update_aggregates(delta, stored, str(tmp_path / "rebuilt"), rebuild=True)
+    for name in ["overview", "posttype"]:
+        pd.testing.assert_frame_equal(
+            states[name].sort_index(), rebuilt[name].sort_index(), check_dtype=False, check_like=True,
+        )
+
+
+def test_unchanged_export_leaves_the_store_alone(tmp_path):
+    store_dir = str(tmp_path / "store")
+    export = write_posts(tmp_path / "merged.csv", [(1, "IMAGE", 100, 10, 1), (2, "REELS", 300, 25, 0)])
+
+    store.ingest(export, store_dir)
+    delta, states = store.ingest(export, store_dir)
+
+    assert delta.changes.empty and states is None
+    assert len(store.load_store(store_dir)) == 2
@@ -0,0 +1,41 @@
+import re
+from collections import Counter
+
+import pandas as pd
+
+from tokens import caption_tokens
+
+CAPTIONS = pd.Series([
+    "Rehearsals for #HIDAllsWell are underway! Tickets: https://hid.example/tix",
+    None,
+    "Meet the cast of The House of Trials 💕 #HamletIsntDead",
+    None,
+], dtype="str")
+
+
+def test_missing_captions_get_their_own_empty_lists():
+    for field in ["words", "counter_words"]:
+        tokens = caption_tokens(CAPTIONS, field)
+
+        assert tokens[1] == [] and tokens[3] == []
+        tokens[1].append("edited")
+        assert tokens[3] == []
+
+
+def test_counter_words_match_the_joined_text_pipeline():
+    # word_counter.py before per-caption tokens: one regex pass over all captions joined
+    text = " ".join(CAPTIONS.dropna().astype(str))
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^a-zA-Z ]", " ", text)
+    expected = Counter(w.lower() for w in text.split() if len(w) > 3)
+
+    tokens = caption_tokens(CAPTIONS, "counter_words")
+
+    assert Counter(w for caption in tokens for w in caption) == expected
+
+
+def test_words_are_lower_cased_plain_words_without_stopwords():
+    tokens = caption_tokens(CAPTIONS, "words", stop_words={"the", "for", "are", "meet"})
+
+    assert tokens[0] == ["rehearsals", "hidallswell", "underway", "tickets", "https", "hid", "example", "tix"]
+    assert tokens[2] == ["cast", "house", "trials", "hamletisntdead"]
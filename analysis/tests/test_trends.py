@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import trends
+
+
+def posts(days=120, n=400, seed=0):
+    """A clean_engagement()-shaped frame with Local dates over `days` days from 2024-01-01."""
+    rng = np.random.default_rng(seed)
+    day = np.datetime64("2024-01-01") + rng.integers(0, days, n)
+    return pd.DataFrame({
+        "Post type": rng.choice(["IMAGE", "REELS", "CAROUSEL_ALBUM"], n),
+        "Local date": np.datetime_as_string(day),
+        "Reach": rng.integers(1, 3000, n).astype(float),
+        "EngagementRate": rng.random(n) * 30,
+        "FollowConversionRate": rng.random(n),
+        "Outlier": False,
+    })
+
+
+def edited(df):
+    """The next export: one post's metrics grew, old posts fell off, newer days and a new post type arrived."""
+    df = df.copy()
+    df.loc[df.index[200], ["Reach", "EngagementRate"]] *= 3
+    df = df[df["Local date"] >= "2024-01-20"]
+    new = posts(days=20, n=30, seed=1).assign(
+        **{"Local date": lambda d: (pd.to_datetime(d["Local date"]) + pd.Timedelta(days=125)).dt.strftime("%Y-%m-%d")}
+    )
+    new.loc[new.index[:5], "Post type"] = "STORY"
+    return pd.concat([df, new], ignore_index=True)
+
+
+def test_full_run_matches_a_naive_window_mean():
+    df = posts()
+    rolling, cohorts, _ = trends.trends(trends.daily_state(df))
+
+    day = pd.to_datetime(df["Local date"])
+    for w, post_type, date in [(7, "IMAGE", "2024-02-10"), (30, "All", "2024-03-31"), (90, "REELS", "2024-04-29")]:
+        end = pd.Timestamp(date)
+        picked = df[(day > end - pd.Timedelta(days=w)) & (day <= end)]
+        if post_type != trends.TOTAL:
+            picked = picked[picked["Post type"] == post_type]
+        row = rolling[(rolling["Window"] == w) & (rolling["Post type"] == post_type) & (rolling["Date"] == date)]
+        assert row["Posts"].item() == len(picked)
+        assert row["AvgEngagementRate"].item() == pytest.approx(round(picked["EngagementRate"].mean(), 2))
+
+    march = df[df["Local date"].str.startswith("2024-03")]
+    row = cohorts[(cohorts["Post type"] == trends.TOTAL) & (cohorts["Cohort"] == "2024-03")]
+    assert row["Posts"].item() == len(march)
+    assert row["AvgReach"].item() == round(march["Reach"].mean())
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_incremental_run_matches_a_full_recompute(tmp_path, monkeypatch, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setenv("ANALYSIS_OUTPUT_FORMATS", fmt)
+    incremental, full = str(tmp_path / "incremental"), str(tmp_path / "full")
+    df = posts()
+    trends.run(df, incremental)
+
+    rolling, cohorts = trends.run(edited(df), incremental)
+    expected_rolling, expected_cohorts = trends.run(edited(df), full, full=True)
+
+    pd.testing.assert_frame_equal(rolling, expected_rolling, check_dtype=False)
+    pd.testing.assert_frame_equal(cohorts, expected_cohorts, check_dtype=False)
+
+
+def test_unchanged_state_recomputes_nothing():
+    state = trends.daily_state(posts())
+    rolling, cohorts, _ = trends.trends(state)
+    previous = (state, rolling, cohorts)
+
+    again, again_cohorts, recomputed = trends.trends(state, previous=previous)
+
+    assert recomputed == 0
+    pd.testing.assert_frame_equal(again, rolling)
+    pd.testing.assert_frame_equal(again_cohorts, cohorts)
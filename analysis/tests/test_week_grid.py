@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from publish_time import LOCAL_TZ, local_time_columns
+from week_grid import accumulate, heatmap, hour_curve, merge_grids, weekday_curve
+
+
+def posts(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    # Two years of UTC times, so both DST switches are crossed
+    seconds = rng.integers(1_700_000_000, 1_763_000_000, n)
+    times = pd.Series(pd.to_datetime(seconds, unit="s", utc=True))
+    times[rng.random(n) < 0.03] = pd.NaT
+    reach = rng.integers(0, 3000, n).astype(float)
+    reach[rng.random(n) < 0.05] = np.nan
+    df = pd.DataFrame({"Publish time": times, "Reach": reach, "Likes": rng.integers(0, 90, n)})
+    return df.assign(**local_time_columns(df["Publish time"]))
+
+
+def test_heatmap_matches_a_pivot_of_local_weekday_and_hour():
+    # weekly_heatmap.py before the bincount grid: tz_convert, then pivot_table of means
+    df = posts()
+    local = df["Publish time"].dt.tz_convert(LOCAL_TZ)
+    expected = (
+        df.assign(weekday=local.dt.dayofweek, hour=local.dt.hour)
+        .pivot_table(index="weekday", columns="hour", values="Reach", aggfunc="mean")
+        .reindex(index=range(7), columns=range(24))
+        .fillna(0)
+    )
+
+    grid = accumulate(df, ["Reach", "Likes"])
+
+    np.testing.assert_allclose(heatmap(grid, "Reach"), expected.to_numpy())
+    by_hour = df.groupby(local.dt.hour)["Reach"].mean().reindex(range(24)).fillna(0)
+    by_day = df.groupby(local.dt.dayofweek)["Likes"].mean().reindex(range(7)).fillna(0)
+    np.testing.assert_allclose(hour_curve(grid, "Reach"), by_hour)
+    np.testing.assert_allclose(weekday_curve(grid, "Likes"), by_day)
+
+
+def test_cached_local_columns_give_the_same_grid():
+    df = posts()
+
+    cached = accumulate(df, "Reach")
+    converted = accumulate(df.drop(columns=["Local weekday", "Local hour"]), "Reach")
+
+    np.testing.assert_array_equal(cached.counts, converted.counts)
+    np.testing.assert_allclose(cached.sums, converted.sums)
+
+
+@pytest.mark.parametrize("chunk", [1, 97, 600])
+def test_merged_chunk_grids_match_a_single_pass(chunk):
+    df = posts()
+    metrics = ["Reach", "Likes"]
+
+    merged = merge_grids(*[accumulate(df.iloc[i:i + chunk], metrics) for i in range(0, len(df), chunk)], None)
+    whole = accumulate(df, metrics)
+
+    assert merged.metrics == whole.metrics
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_allclose(merged.sums, whole.sums)
+
+
+def test_merge_grids_rejects_different_metrics():
+    df = posts(n=20)
+
+    assert merge_grids(None) is None
+    with pytest.raises(ValueError):
+        merge_grids(accumulate(df, "Reach"), accumulate(df, "Likes"))
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+from word_cloud import incidence_matrix, state_word_stats, word_stats, word_state  # noqa: E402
+
+WORDS = pd.Series([
+    ["rehearsal", "tonight", "rehearsal", "cast"],
+    [],
+    ["cast", "tickets", "tonight"],
+    ["tickets", "rehearsal"],
+    ["hamlet"],
+    ["cast", "hamlet", "tickets"],
+])
+ENGAGEMENT = pd.Series([4.0, 9.0, 2.5, 7.0, 1.0, 3.5])
+
+
+def row_loop_stats(words, engagement, min_posts, top_n):
+    # word_cloud.py before the sparse matrix: count each word once per post, keep first appearance on ties
+    counts, totals = {}, {}
+    for tokens, eng in zip(words, engagement):
+        for w in dict.fromkeys(tokens):
+            counts[w] = counts.get(w, 0) + 1
+            totals[w] = totals.get(w, 0.0) + eng
+    kept = [w for w in counts if counts[w] >= min_posts]
+    top = sorted(kept, key=lambda w: -counts[w])[:top_n]
+    return pd.DataFrame({
+        "Word": top,
+        "UsageCount": [counts[w] for w in top],
+        "MeanEngagementRate": [totals[w] / counts[w] for w in top],
+    })
+
+
+@pytest.mark.parametrize("top_n", [2, 3, 50])
+def test_word_stats_match_the_row_loop(top_n):
+    expected = row_loop_stats(WORDS, ENGAGEMENT, min_posts=2, top_n=top_n)
+
+    matrix, vocab = incidence_matrix(WORDS)
+    streamed = state_word_stats(word_state(WORDS, ENGAGEMENT), min_posts=2, top_n=top_n)
+
+    pd.testing.assert_frame_equal(word_stats(matrix, vocab, ENGAGEMENT, top_n=top_n), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_incidence_matrix_counts_each_word_once_per_post():
+    matrix, vocab = incidence_matrix(WORDS)
+
+    assert matrix.shape == (len(WORDS), len(vocab))
+    assert list(vocab) == ["rehearsal", "tonight", "cast", "tickets", "hamlet"]
+    np.testing.assert_array_equal(matrix.toarray()[0], [1, 1, 1, 0, 0])
+    assert matrix[1].nnz == 0
@@ -0,0 +1,71 @@
+"""
+Caption tokenizers shared by the word stages.
+
+caption_tokens() returns one token field per caption — stopword-filtered
+words (word_cloud, streaming) or word_counter words — and computes only the
+field it is asked for, in one findall over the column. Hashtags stay in
+hashtag_analysis.extract_hashtags (a vectorized str.findall).
+
+Stopwords are bundled (wordlists/stopwords_english.txt, NLTK's English list)
+plus the optional project list in wordlists/stopwords_project.txt, so nothing
+is downloaded and nltk isn't needed. Words are found with WORD_PATTERN and
+filtered with a frozenset lookup.
+"""
+import os
+import re
+from functools import lru_cache
+
+from dataset import BASE
+
+# ---------- Stopwords ----------
+WORDLISTS = os.path.join(BASE, "wordlists")
+STOPWORDS_FILE = os.path.join(WORDLISTS, "stopwords_english.txt")
+PROJECT_STOPWORDS_FILE = os.path.join(WORDLISTS, "stopwords_project.txt")
+
+
+def read_wordlist(path):
+    """Lower-cased words from a one-per-line list; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [w for w in (line.strip().lower() for line in f) if w and not w.startswith("#")]
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(extra=PROJECT_STOPWORDS_FILE):
+    """Bundled English stopwords plus the `extra` list (skipped if missing or None), as a frozenset."""
+    words = read_wordlist(STOPWORDS_FILE)
+    if extra and os.path.exists(extra):
+        words += read_wordlist(extra)
+    return frozenset(words)
+
+
+# ---------- Tokenizers ----------
+# Plain words (3+ letters); hashtags and mentions don't match
+WORD_PATTERN = re.compile(r"\b[a-z]{3,}[a-z0-9_]*\b", re.IGNORECASE)
+LINK_PATTERN = re.compile(r"http\S+")
+# word_counter.py's words: runs of 4+ ASCII letters once links are removed
+LETTER_RUNS = re.compile(r"[a-zA-Z]{4,}")
+
+FIELDS = ("words", "counter_words")
+
+
+def counter_words(text):
+    """word_counter.py's words: links removed, letters only, longer than 3 characters."""
+    return " ".join(LETTER_RUNS.findall(LINK_PATTERN.sub("", text))).lower().split()
+
+
+def caption_tokens(descriptions, field, stop_words=None):
+    """
+    One token field ("words" or "counter_words") of a Description column, as
+    a Series of lists on the same index. Rows without a caption get their own
+    empty list.
+    """
+    if field not in FIELDS:
+        raise ValueError(f"Unknown token field {field!r} (expected one of {list(FIELDS)})")
+    if field == "words":
+        stop_words = load_stopwords() if stop_words is None else frozenset(stop_words)
+        found = descriptions.str.lower().str.findall(WORD_PATTERN)
+        return found.map(
+            lambda words: [w for w in words if w not in stop_words] if isinstance(words, list) else []
+        ).rename(field)
+    found = descriptions.map(counter_words, na_action="ignore")
+    return found.map(lambda tokens: tokens if isinstance(tokens, list) else []).rename(field)
@@ -0,0 +1,256 @@
+"""
+Rolling-window and monthly-cohort trends by post type.
+
+For each post type, and for all posts together: mean engagement rate, follow
+conversion and reach over the trailing 7 / 30 / 90 days ending on each day
+(trend_rolling), and over the posts published in each calendar month
+(trend_cohorts). Days and months are New York local time.
+
+Both come from one daily sum/count state (aggregates.py) per (Post type,
+Local date), laid out as a dense post type x day array: a single cumulative
+sum along the days, after which any window is cs[end] - cs[start].
+
+The daily state is written next to the tables (trend_daily). On the next run
+it is diffed against the new state, and only the windows that cover a changed
+day — those ending within W days after it, and its month — are recomputed and
+spliced into the previous trend_rolling / trend_cohorts.
+
+    python analysis/trends.py
+    python analysis/trends.py --full      # recompute every window
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from aggregates import sum_state
+from dataset import load_merged, clean_engagement, drop_outlier
+from outputs import read_table, write_table
+from post_type_analysis import AVERAGED, format_metrics
+
+# ---------- Paths ----------
+BASE = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "output")
+
+SUMS = list(AVERAGED.values()) + ["count"]
+WINDOWS = (7, 30, 90)
+KEY = ["Post type", "Local date"]
+TOTAL = "All"  # post type label of the all-posts rows
+
+ROLLING_COLS = ["Window", "Post type", "Date", "Posts"] + list(AVERAGED)
+COHORT_COLS = ["Cohort", "Post type", "Posts"] + list(AVERAGED)
+
+
+def daily_state(df):
+    """
+    Mergeable per (Post type, Local date) sums + counts. Expects a
+    clean_engagement() frame; the outlier and undated posts are dropped here.
+    """
+    df = drop_outlier(df).dropna(subset=KEY)
+    return sum_state(df, list(AVERAGED.values()), by=KEY)
+
+
+def cumulative(state):
+    """
+    (post types, first day, cumulative sums) for a daily_state. The sums have
+    shape (types, days + 1, len(SUMS)); the last type is TOTAL, and
+    cs[:, i] covers the days before first + i.
+    """
+    types = sorted(state.index.unique(KEY[0]))
+    t = pd.Index(types).get_indexer(state.index.get_level_values(0))
+    day = state.index.get_level_values(1).to_numpy(dtype=str).astype("datetime64[D]")
+    first = day.min()
+    d = (day - first).astype(np.int64)
+
+    daily = np.zeros((len(types) + 1, d.max() + 1, len(SUMS)))
+    daily[t, d] = state[SUMS].to_numpy(dtype=float)  # one state row per (type, day)
+    daily[-1] = daily[:-1].sum(axis=0)
+
+    cs = np.zeros((daily.shape[0], daily.shape[1] + 1, len(SUMS)))
+    np.cumsum(daily, axis=1, out=cs[:, 1:])
+    return types + [TOTAL], first, cs
+
+
+def _means(types, labels, sums):
+    """Long frame from window sums (types x windows x SUMS); windows without posts are dropped."""
+    n = sums.shape[1]
+    out = pd.DataFrame({"Post type": np.repeat(types, n)})
+    for col, values in labels.items():
+        out[col] = np.tile(values, len(types))
+
+    flat = sums.reshape(-1, len(SUMS))
+    count = np.rint(flat[:, -1]).astype(np.int64)
+    out["Posts"] = count
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for j, col in enumerate(AVERAGED):
+            out[col] = flat[:, j] / count
+    out = out[count > 0]
+
+    # ---------- Format Metrics ----------
+    return format_metrics(out)
+
+
+def rolling_windows(layout, windows=WINDOWS, ends=None):
+    """
+    Trailing-window means ending on each day from the first to the last post
+    (or only on `ends`: per window, a bool mask over those days).
+    """
+    types, first, cs = layout
+    n_days = cs.shape[1] - 1
+    dates = np.datetime_as_string(first + np.arange(n_days))
+
+    frames = []
+    for w in windows:
+        idx = np.arange(n_days) if ends is None else np.flatnonzero(ends[w])
+        hi = idx + 1
+        sums = cs[:, hi] - cs[:, np.maximum(hi - w, 0)]
+        frames.append(_means(types, {"Window": np.full(len(idx), w), "Date": dates[idx]}, sums))
+    return pd.concat(frames)[ROLLING_COLS]
+
+
+def monthly_cohorts(layout, months=None):
+    """Means per publish month ("YYYY-MM"), for every month or only `months`."""
+    types, first, cs = layout
+    n_days = cs.shape[1] - 1
+    if months is None:
+        last = first + n_days - 1
+        months = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1)
+    months = np.asarray(months, dtype="datetime64[M]")
+
+    start = np.clip((months.astype("datetime64[D]") - first).astype(np.int64), 0, n_days)
+    end = np.clip(((months + 1).astype("datetime64[D]") - first).astype(np.int64), 0, n_days)
+    sums = cs[:, end] - cs[:, start]
+    return _means(types, {"Cohort": np.datetime_as_string(months)}, sums)[COHORT_COLS]
+
+
+# ---------- Incremental refresh ----------
+def changed_days(old, new):
+    """
+    Local dates (datetime64[D]) whose sums or counts differ between two daily
+    states. Sums read back from CSV may be off in the last bit, hence isclose.
+    """
+    index = new.index.union(old.index)
+    a = new[SUMS].reindex(index, fill_value=0).to_numpy(dtype=float)
+    b = old[SUMS].reindex(index, fill_value=0).to_numpy(dtype=float)
+    changed = ~np.isclose(a, b, rtol=1e-9, atol=1e-9).all(axis=1)
+    days = index[changed].get_level_values(1).unique()
+    return days.to_numpy(dtype=str).astype("datetime64[D]")
+
+
+def affected_ends(layout, days, windows=WINDOWS):
+    """Per window, a mask over the layout's days of the windows covering any of `days`."""
+    _, first, cs = layout
+    n_days = cs.shape[1] - 1
+    offsets = (days - first).astype(np.int64)
+
+    ends = {}
+    for w in windows:
+        # +1 where a changed day's windows start, -1 once they've moved past it
+        marks = np.zeros(n_days + 1, dtype=np.int64)
+        np.add.at(marks, np.clip(offsets, 0, n_days), 1)
+        np.add.at(marks, np.clip(offsets + w, 0, n_days), -1)
+        ends[w] = np.cumsum(marks[:-1]) > 0
+    return ends
+
+
+def _sort(frame, by):
+    return frame.sort_values(by, kind="stable").reset_index(drop=True)
+
+
+def read_previous(out_dir):
+    """(daily state, rolling, cohorts) from the last run in out_dir, or None."""
+    try:
+        state = read_table(out_dir, "trend_daily")
+        rolling = read_table(out_dir, "trend_rolling")
+        cohorts = read_table(out_dir, "trend_cohorts")
+    except FileNotFoundError:
+        return None
+    state = state.astype({"Post type": str, "Local date": str}).set_index(KEY)
+    return state, rolling.astype({"Date": str}), cohorts.astype({"Cohort": str})
+
+
+def trends(state, windows=WINDOWS, previous=None):
+    """
+    (rolling, cohorts, recomputed rows) for a daily_state. With `previous`
+    (read_previous()), windows untouched by changed days are carried over.
+    """
+    if state.empty:
+        return pd.DataFrame(columns=ROLLING_COLS), pd.DataFrame(columns=COHORT_COLS), 0
+    layout = cumulative(state)
+
+    if previous is None or set(previous[1]["Window"]) != set(windows):
+        rolling = rolling_windows(layout, windows)
+        cohorts = monthly_cohorts(layout)
+        recomputed = len(rolling) + len(cohorts)
+    else:
+        old_state, old_rolling, old_cohorts = previous
+        days = changed_days(old_state, state)
+        first, n_days = layout[1], layout[2].shape[1] - 1
+        dates = np.datetime_as_string(first + np.arange(n_days))
+        span = (dates[0], dates[-1])
+
+        # ---------- Rolling: recompute the windows covering a changed day ----------
+        ends = affected_ends(layout, days, windows)
+        # Days outside the previous run's range have no rows to carry over
+        old_days = old_state.index.get_level_values(1)
+        new_days = (dates < old_days.min()) | (dates > old_days.max())
+        ends = {w: mask | new_days for w, mask in ends.items()}
+        stale = np.zeros(len(old_rolling), dtype=bool)
+        for w in windows:
+            in_window = old_rolling["Window"].to_numpy() == w
+            stale |= in_window & old_rolling["Date"].isin(dates[ends[w]]).to_numpy()
+        keep = ~stale & old_rolling["Date"].between(*span).to_numpy()
+        fresh = rolling_windows(layout, windows, ends)
+        rolling = pd.concat([old_rolling[keep], fresh])
+
+        # ---------- Cohorts: recompute the months holding a changed day ----------
+        months = np.unique(days.astype("datetime64[M]"))
+        months = months[(months >= np.datetime64(span[0], "M")) & (months <= np.datetime64(span[1], "M"))]
+        labels = old_cohorts["Cohort"]
+        keep = ~labels.isin(np.datetime_as_string(months)) & labels.between(span[0][:7], span[1][:7])
+        fresh_cohorts = monthly_cohorts(layout, months)
+        cohorts = pd.concat([old_cohorts[keep.to_numpy()], fresh_cohorts])
+        recomputed = len(fresh) + len(fresh_cohorts)
+
+    rolling = _sort(rolling[ROLLING_COLS], ["Window", "Post type", "Date"])
+    cohorts = _sort(cohorts[COHORT_COLS], ["Post type", "Cohort"])
+    return rolling, cohorts, recomputed
+
+
+def run(df, out_dir=OUT_DIR, windows=WINDOWS, full=False):
+    """
+    Rolling and monthly-cohort trends per post type. Expects a
+    clean_engagement() frame. Unless `full`, the previous run's tables in
+    out_dir are updated in place of a full recompute.
+    """
+    state = daily_state(df)
+    previous = None if full else read_previous(out_dir)
+    rolling, cohorts, recomputed = trends(state, windows, previous)
+
+    # ---------- Save ----------
+    paths = write_table(state.reset_index(), out_dir, "trend_daily")
+    paths += write_table(rolling, out_dir, "trend_rolling")
+    paths += write_table(cohorts, out_dir, "trend_cohorts")
+    print(f"[ok] Wrote trends → {', '.join(paths)}")
+    print(f"Recomputed {recomputed:,} of {len(rolling) + len(cohorts):,} window rows"
+          + (" (full run)" if previous is None else ""))
+
+    # ---------- Print Preview ----------
+    if not cohorts.empty:
+        print("\n📈 LAST 6 MONTHLY COHORTS (ALL POSTS):\n")
+        print(cohorts[cohorts["Post type"] == TOTAL].tail(6).to_string(index=False))
+    return rolling, cohorts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="rolling-window and monthly-cohort trends by post type")
+    parser.add_argument("--windows", nargs="+", type=int, default=list(WINDOWS), metavar="DAYS")
+    parser.add_argument("--full", action="store_true", help="recompute every window")
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    args = parser.parse_args(argv)
+    run(clean_engagement(load_merged()), args.out_dir, tuple(args.windows), args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,88 +3,78 @@
 # Outputs VIDEO / REELS posts from the last 12 months only,
 # ranked by engagement rate.
 # engagement rate = total engagements / reach
-# Input is a fixed absolute CSV path.
+# Input is the merged export (dataset.CSV_IN) when run standalone.
 # Output file renamed to boost_candidates.csv
 # All original fields are preserved.
 
 import pandas as pd
 import os
 from datetime import timedelta
-
-# ---------- Fixed Paths ----------
-CSV_IN = "/Users/reidwatson/HID/ig-export-merge-ts/merged.csv"
-
+from dataset import CSV_IN, load_merged
+from ranking import top_k
+from publish_time import DERIVED_COLS
+from outliers import OUTLIER_COLS
+from outputs import write_table
+from metrics import with_metrics, in_range
+
+# ---------- Paths ----------
 BASE = os.path.dirname(os.path.abspath(__file__))
 OUT_DIR = os.path.join(BASE, "output")
-CSV_OUT = os.path.join(OUT_DIR, "boost_candidates.csv")
-
-os.makedirs(OUT_DIR, exist_ok=True)
-
-# ---------- Load Data ----------
-df = pd.read_csv(CSV_IN)
-
-# ---------- Parse Publish Time ----------
-df["Publish time"] = pd.to_datetime(df.get("Publish time"), errors="coerce", utc=True)
-
-now = pd.Timestamp.utcnow()
-one_year_ago = now - timedelta(days=365)
-
-df = df[df["Publish time"].notna()]
-df = df[df["Publish time"] >= one_year_ago]
-
-# ---------- Filter Videos ----------
-df["Post type"] = df.get("Post type", "").astype(str).str.upper()
-df = df[df["Post type"].isin(["VIDEO", "REELS", "REEL"])]
-
-# ---------- Numeric Conversion ----------
-numeric_cols = [
-    "Reach",
-    "Total Interactions",
-    "Likes",
-    "Comments",
-    "Shares",
-    "Saved",
-    "Replies",
-    "Follows",
-]
-
-for col in numeric_cols:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-    else:
-        df[col] = 0
-
-# ---------- Total Engagements ----------
-df["__total_engagements"] = df["Total Interactions"]
-
-fallback_mask = df["__total_engagements"] <= 0
-df.loc[fallback_mask, "__total_engagements"] = (
-    df.loc[fallback_mask, ["Likes", "Comments", "Shares", "Saved", "Replies", "Follows"]]
-      .sum(axis=1)
-)
-
-# ---------- Engagement Rate ----------
-df["__engagement_rate"] = df["__total_engagements"] / df["Reach"].replace(0, pd.NA)
-
-# ---------- Clean ----------
-df = df[df["__engagement_rate"].notna()]
-df = df[df["__engagement_rate"] >= 0]
-df = df[df["__engagement_rate"] <= 1.0]
-
-# ---------- Sort & Rank ----------
-df = df.sort_values(
-    by=["__engagement_rate", "__total_engagements", "Reach"],
-    ascending=[False, False, False],
-)
-
-df["__rank"] = range(1, len(df) + 1)
-
-# ---------- Save ----------
-df.to_csv(CSV_OUT, index=False)
-
-# ---------- Summary ----------
-print(f"[ok] Wrote boost candidates → {CSV_OUT}")
-print(f"Videos (last 12 months): {len(df)}")
-print(f"Average engagement rate: {(df['__engagement_rate'].mean() * 100):.2f}%")
-print("\nTop 5 Preview:")
-print(df[["Publish time", "__engagement_rate"]].head(5))
+
+# Trailing window of "recent" videos, ending at run(as_of=...) (default: now)
+RECENT_DAYS = 365
+
+# Ranking keys: engagement rate, then total engagements and reach for ties
+RANK_KEYS = ["__engagement_rate", "__total_engagements", "Reach"]
+
+
+def run(df, out_dir=OUT_DIR, top=None, as_of=None, days=RECENT_DAYS):
+    """
+    Rank videos from the `days` before `as_of` (default: now; naive times are
+    UTC) by engagement rate (all of them, or only the top `top`). Expects the
+    raw typed frame.
+    """
+    # ---------- Boost Score (metrics.py) ----------
+    # Total Interactions, falling back to the six-count sum, over Reach
+    df = with_metrics(df, {"__total_engagements": "BoostEngagements", "__engagement_rate": "BoostScore"})
+
+    # ---------- Recent Window (last 12 months by default) ----------
+    # Publish time comes back parsed as UTC
+    now = pd.Timestamp.now("UTC") if as_of is None else pd.Timestamp(as_of)
+    if now.tz is None:
+        now = now.tz_localize("UTC")
+    since = now - timedelta(days=days)
+
+    df = df[df["Publish time"].notna()]
+    df = df[df["Publish time"] >= since]
+    if as_of is not None:
+        df = df[df["Publish time"] <= now]
+
+    # ---------- Filter Videos ----------
+    df = df.assign(**{"Post type": df.get("Post type", "").astype(str).str.upper()})
+    df = df[df["Post type"].isin(["VIDEO", "REELS", "REEL"])].copy()
+
+    # ---------- Clean ----------
+    df = df[in_range(df, "BoostScore", "__engagement_rate")]
+
+    # ---------- Sort & Rank ----------
+    df = top_k(df, len(df) if top is None else top, RANK_KEYS)
+
+    df["__rank"] = range(1, len(df) + 1)
+
+    # ---------- Save ----------
+    # Loader-derived time / outlier columns aren't export fields
+    paths = write_table(df.drop(columns=DERIVED_COLS + OUTLIER_COLS, errors="ignore"), out_dir, "boost_candidates")
+
+    # ---------- Summary ----------
+    print(f"[ok] Wrote boost candidates → {', '.join(paths)}")
+    print(f"Videos (last {days} days): {len(df)}")
+    print(f"Average engagement rate: {(df['__engagement_rate'].mean() * 100):.2f}%")
+    print("\nTop 5 Preview:")
+    print(df[["Publish time", "__engagement_rate"]].head(5))
+    return df
+
+
+if __name__ == "__main__":
+    # ---------- Load Data ----------
+    run(load_merged(CSV_IN))
@@ -0,0 +1,99 @@
+"""
+Weekday x hour accumulator.
+
+Posts are mapped to one of 168 cells (weekday * 24 + local hour) and each
+metric's sums and non-null counts are accumulated with np.bincount in a
+single pass — no pivot_table / groupby. A WeekGrid is mergeable (grids from
+chunks or deltas simply add), and the heatmap, the collapsed 24h curve and
+the per-weekday curve are all read off the same grid.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from publish_time import LOCAL_TZ, epoch_seconds, local_seconds
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+CELLS = 7 * 24
+
+# metrics: tuple of column names; sums / counts: (len(metrics), 168) arrays
+WeekGrid = namedtuple("WeekGrid", ["metrics", "sums", "counts"])
+
+
+def cell_index(times, tz=LOCAL_TZ):
+    """Cell number (Mon 00h = 0 ... Sun 23h = 167) per timestamp, -1 where missing."""
+    # Wall-clock seconds in tz (one offset lookup per distinct UTC hour); weekday /
+    # hour by integer arithmetic instead of the .dt.dayofweek / .dt.hour accessors
+    epoch, valid = epoch_seconds(times)
+    hours = local_seconds(epoch[valid], tz) // 3600
+    cells = np.full(len(epoch), -1, dtype=np.int64)
+    cells[valid] = (hours // 24 + 3) % 7 * 24 + hours % 24  # 1970-01-01 was a Thursday (3)
+    return cells
+
+
+def _cached_cells(df):
+    """Cell numbers from the loader's precomputed New York weekday / hour columns."""
+    weekday = df["Local weekday"].to_numpy(dtype=np.float64, na_value=np.nan)
+    hour = df["Local hour"].to_numpy(dtype=np.float64, na_value=np.nan)
+    cells = weekday * 24 + hour
+    return np.where(np.isnan(cells), -1, cells).astype(np.int64)
+
+
+def accumulate(df, metrics, tz=LOCAL_TZ, time_col="Publish time"):
+    """WeekGrid of `metrics` over df, bucketed by time_col in timezone tz."""
+    metrics = tuple([metrics] if isinstance(metrics, str) else metrics)
+    if tz == LOCAL_TZ and time_col == "Publish time" and {"Local weekday", "Local hour"} <= set(df.columns):
+        cells = _cached_cells(df)
+    else:
+        cells = cell_index(df[time_col], tz)
+    has_time = cells >= 0
+
+    sums = np.zeros((len(metrics), CELLS))
+    counts = np.zeros((len(metrics), CELLS), dtype=np.int64)
+    for i, col in enumerate(metrics):
+        values = df[col].to_numpy(dtype=np.float64)
+        ok = has_time & ~np.isnan(values)
+        sums[i] = np.bincount(cells[ok], weights=values[ok], minlength=CELLS)
+        counts[i] = np.bincount(cells[ok], minlength=CELLS)
+    return WeekGrid(metrics, sums, counts)
+
+
+def merge_grids(*grids):
+    """Add grids of the same metrics (None entries are skipped)."""
+    grids = [g for g in grids if g is not None]
+    if not grids:
+        return None
+    metrics = grids[0].metrics
+    if any(g.metrics != metrics for g in grids[1:]):
+        raise ValueError("Can't merge week grids over different metrics")
+    return WeekGrid(
+        metrics,
+        sum(g.sums for g in grids[1:]) + grids[0].sums,
+        sum(g.counts for g in grids[1:]) + grids[0].counts,
+    )
+
+
+def _mean(sums, counts):
+    return np.divide(sums, counts, out=np.zeros(np.shape(sums)), where=counts > 0)
+
+
+def _metric(grid, metric):
+    i = grid.metrics.index(metric)
+    return grid.sums[i].reshape(7, 24), grid.counts[i].reshape(7, 24)
+
+
+def heatmap(grid, metric):
+    """7 x 24 mean of metric per weekday x hour (0 where a cell has no posts)."""
+    return _mean(*_metric(grid, metric))
+
+
+def hour_curve(grid, metric):
+    """24 means of metric per local hour, collapsed across the week."""
+    sums, counts = _metric(grid, metric)
+    return _mean(sums.sum(axis=0), counts.sum(axis=0))
+
+
+def weekday_curve(grid, metric):
+    """7 means of metric per weekday (Mon..Sun), collapsed across hours."""
+    sums, counts = _metric(grid, metric)
+    return _mean(sums.sum(axis=1), counts.sum(axis=1))
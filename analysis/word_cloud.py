@@ -1,140 +1,174 @@
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-from matplotlib import cm
 import numpy as np
-import re
-from collections import defaultdict
-import nltk
-from nltk.corpus import stopwords
+from dataset import load_merged, clean_engagement, drop_outlier
+from plotting import ChartSpec, submit
+from outputs import write_table
+from tokens import caption_tokens, load_stopwords
 
 # ---------- Paths ----------
 BASE = os.path.dirname(os.path.abspath(__file__))
-CSV_IN  = os.path.join(BASE, "../merged.csv")
 OUT_DIR = os.path.join(BASE, "output")
-IMG_WORDCLOUD = os.path.join(OUT_DIR, "wordcloud_heatmap.png")
-CSV_WORDCLOUD = os.path.join(OUT_DIR, "wordcloud_data.csv")
-
-# ---------- Load Data ----------
-df = pd.read_csv(CSV_IN)
-df.columns = df.columns.str.strip()
-
-# ---------- Ensure numeric fields ----------
-numeric_cols = ["Reach", "Likes", "Comments", "Shares", "Saved", "Follows", "EngagementRate"]
-for col in numeric_cols:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-# ---------- Remove outlier ----------
-OUTLIER_POST_ID = "18073628026714616"
-if "Post ID" in df.columns:
-    df = df[df["Post ID"].astype(str) != OUTLIER_POST_ID]
-
-# ---------- Compute Engagement ----------
-df["TotalEngagements"] = df["Likes"] + df["Comments"] + df["Shares"] + df["Saved"]
-df["EngagementRate"] = (df["TotalEngagements"] / df["Reach"].replace(0, pd.NA)) * 100
-df["FollowConversionRate"] = (df["Follows"] / df["Reach"].replace(0, pd.NA)) * 100
-
-# ---------- Clean Engagement Data ----------
-df = df[df["EngagementRate"].notna()]
-df = df[df["EngagementRate"] >= 0]
-df = df[df["EngagementRate"] <= 99.99]
-
-# ---------- Setup ----------
-os.makedirs(OUT_DIR, exist_ok=True)
-
-# ---------- Stopwords ----------
-try:
-    stop_words = set(stopwords.words("english"))
-except LookupError:
-    nltk.download("stopwords")
-    stop_words = set(stopwords.words("english"))
-
-# ---------- Tokenize Words (ignore hashtags and stopwords) ----------
-# Matches only plain words (3+ letters), ignores hashtags and mentions
-word_pattern = re.compile(r"\b[a-z]{3,}[a-z0-9_]*\b", re.IGNORECASE)
-
-def extract_words(text):
-    if not isinstance(text, str):
-        return []
-    words = word_pattern.findall(text.lower())
-    return [w for w in words if w not in stop_words]
-
-df["words"] = df["Description"].fillna("").apply(extract_words)
-
-# ---------- Build Word-Level Stats ----------
-word_counts = defaultdict(int)
-word_engagements = defaultdict(list)
-
-for _, row in df.iterrows():
-    eng = row["EngagementRate"]
-    for w in set(row["words"]):  # count each word once per post
-        word_counts[w] += 1
-        word_engagements[w].append(eng)
-
-# ---------- Keep only words used in >= 2 posts ----------
-filtered_words = {w: c for w, c in word_counts.items() if c >= 2}
-
-# ---------- Limit to Top 50 Most Frequent Words ----------
-top_words = sorted(filtered_words.items(), key=lambda x: x[1], reverse=True)[:50]
-top_word_set = {w for w, _ in top_words}
-
-word_counts = {w: word_counts[w] for w in top_word_set}
-word_engagements = {w: word_engagements[w] for w in top_word_set}
-
-# ---------- Compute Mean Engagement per Word ----------
-word_mean_engagement = {
-    w: float(np.mean(word_engagements[w])) for w in word_counts
-}
-
-# ---------- Normalize Engagement to 0–1 Scale ----------
-eng_min, eng_max = min(word_mean_engagement.values()), max(word_mean_engagement.values())
-normalized_eng = {
-    w: (word_mean_engagement[w] - eng_min) / (eng_max - eng_min + 1e-6)
-    for w in word_mean_engagement
-}
-
-# ---------- Save Word Data to CSV ----------
-word_df = pd.DataFrame({
-    "Word": list(word_counts.keys()),
-    "UsageCount": [word_counts[w] for w in word_counts],
-    "MeanEngagementRate": [word_mean_engagement[w] for w in word_counts],
-    "NormalizedEngagement": [normalized_eng[w] for w in word_counts]
-}).sort_values("UsageCount", ascending=False)
-
-word_df.to_csv(CSV_WORDCLOUD, index=False)
-print(f"📄 Saved word data to: {CSV_WORDCLOUD}")
-
-# ---------- Color Function Based on Engagement ----------
-cmap = cm.get_cmap("Blues")
-
-def color_func(word, *args, **kwargs):
-    val = normalized_eng.get(word, 0)
-    r, g, b, _ = cmap(val)
-    return f"rgb({int(r*255)}, {int(g*255)}, {int(b*255)})"
-
-# ---------- Generate Word Cloud ----------
-wc = WordCloud(
-    width=1600,
-    height=900,
-    background_color="white",
-    max_words=50,
-    prefer_horizontal=0.9,
-    relative_scaling=0.6,
-    collocations=False
-).generate_from_frequencies(word_counts)
-
-# ---------- Recolor Based on Engagement ----------
-wc_recolored = wc.recolor(color_func=color_func)
-
-# ---------- Plot ----------
-plt.figure(figsize=(12, 8))
-plt.imshow(wc_recolored, interpolation="bilinear")
-plt.axis("off")
-plt.title("Word Cloud Heatmap — Top 50 Words (Size = Frequency, Color = Mean Engagement)", fontsize=14)
-plt.tight_layout()
-plt.savefig(IMG_WORDCLOUD, dpi=300)
-plt.show()
-
-print(f"☁️  Saved word cloud heatmap to: {IMG_WORDCLOUD}")
+
+
+def incidence_matrix(words):
+    """
+    Build a post x vocabulary CSR matrix from per-post token lists.
+
+    Each word is counted once per post (matches set(words) semantics), so
+    entries are 0/1 and memory is proportional to the distinct (post, word)
+    pairs. Vocabulary order is first appearance.
+    """
+    from scipy.sparse import csr_matrix
+
+    exploded = words.reset_index(drop=True).explode().dropna()
+    pairs = pd.DataFrame({"post": exploded.index.to_numpy(), "word": exploded.to_numpy()})
+    pairs = pairs.drop_duplicates()
+
+    codes, vocab = pd.factorize(pairs["word"])
+    matrix = csr_matrix(
+        (np.ones(len(pairs), dtype=np.float64), (pairs["post"].to_numpy(), codes)),
+        shape=(len(words), len(vocab)),
+    )
+    return matrix, np.asarray(vocab, dtype=object)
+
+
+def word_stats(matrix, vocab, engagement, min_posts=2, top_n=50):
+    """
+    Document frequency and mean engagement per word from two sparse
+    matrix-vector products, keeping the top_n words used in >= min_posts posts.
+    """
+    doc_freq = matrix.T @ np.ones(matrix.shape[0])
+    eng_sum = matrix.T @ np.asarray(engagement, dtype=np.float64)
+    return top_words(vocab, doc_freq, eng_sum, min_posts, top_n)
+
+
+def word_state(words, engagement):
+    """
+    Mergeable per-word EngagementRate sums + post counts (see aggregates.py),
+    each word counted once per post, groups in first-appearance order. The
+    streaming counterpart of incidence_matrix() + word_stats().
+    """
+    exploded = words.explode().dropna()
+    pairs = pd.DataFrame({
+        "post": exploded.index.to_numpy(),
+        "word": exploded.to_numpy(),
+    }).drop_duplicates()
+    pairs["EngagementRate"] = engagement.reindex(pairs["post"]).to_numpy(dtype=np.float64)
+
+    groups = pairs.groupby("word", sort=False)
+    state = groups[["EngagementRate"]].sum()
+    state["count"] = groups.size()
+    return state
+
+
+def state_word_stats(state, min_posts=2, top_n=50):
+    """word_stats() from a (merged) word_state."""
+    return top_words(
+        state.index.to_numpy(dtype=object),
+        state["count"].to_numpy(dtype=np.float64),
+        state["EngagementRate"].to_numpy(dtype=np.float64),
+        min_posts, top_n,
+    )
+
+
+def top_words(vocab, doc_freq, eng_sum, min_posts=2, top_n=50):
+    """Top_n words used in >= min_posts posts; vocab order breaks frequency ties."""
+    # ---------- Keep only words used in >= min_posts posts ----------
+    candidates = np.flatnonzero(doc_freq >= min_posts)
+
+    # ---------- Limit to Top N Most Frequent Words (ties: first appearance) ----------
+    if len(candidates) > top_n:
+        cut = np.partition(doc_freq[candidates], -top_n)[-top_n]
+        candidates = candidates[doc_freq[candidates] >= cut]
+    order = np.lexsort((candidates, -doc_freq[candidates]))[:top_n]
+    top = candidates[order]
+
+    return pd.DataFrame({
+        "Word": vocab[top],
+        "UsageCount": doc_freq[top].astype("int64"),
+        "MeanEngagementRate": eng_sum[top] / doc_freq[top],
+    })
+
+
+def normalize_engagement(word_df):
+    mean_eng = word_df["MeanEngagementRate"]
+    eng_min, eng_max = mean_eng.min(), mean_eng.max()
+    return word_df.assign(NormalizedEngagement=(mean_eng - eng_min) / (eng_max - eng_min + 1e-6))
+
+
+def draw_wordcloud(fig, word_df):
+    """Word cloud sized by UsageCount, colored by NormalizedEngagement (a normalize_engagement() frame)."""
+    import matplotlib
+    from wordcloud import WordCloud
+
+    word_counts = dict(zip(word_df["Word"], word_df["UsageCount"]))
+    normalized_eng = dict(zip(word_df["Word"], word_df["NormalizedEngagement"]))
+
+    # ---------- Color Function Based on Engagement ----------
+    cmap = matplotlib.colormaps["Blues"]
+
+    def color_func(word, *args, **kwargs):
+        val = normalized_eng.get(word, 0)
+        r, g, b, _ = cmap(val)
+        return f"rgb({int(r*255)}, {int(g*255)}, {int(b*255)})"
+
+    # ---------- Generate Word Cloud ----------
+    wc = WordCloud(
+        width=1600,
+        height=900,
+        background_color="white",
+        max_words=50,
+        prefer_horizontal=0.9,
+        relative_scaling=0.6,
+        collocations=False
+    ).generate_from_frequencies(word_counts)
+
+    # ---------- Recolor Based on Engagement ----------
+    wc_recolored = wc.recolor(color_func=color_func)
+
+    # ---------- Plot ----------
+    ax = fig.add_subplot()
+    ax.imshow(wc_recolored, interpolation="bilinear")
+    ax.axis("off")
+    ax.set_title("Word Cloud Heatmap — Top 50 Words (Size = Frequency, Color = Mean Engagement)", fontsize=14)
+    fig.tight_layout()
+
+
+def run(df, out_dir=OUT_DIR, charts=None):
+    """
+    Word usage / mean engagement table and the word-cloud heatmap. Expects a
+    clean_engagement() frame. The chart goes through plotting.submit.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    img_wordcloud = os.path.join(out_dir, "wordcloud_heatmap.png")
+
+    # ---------- Remove outlier ----------
+    df = drop_outlier(df)
+
+    # ---------- Stopwords ----------
+    stop_words = load_stopwords()
+
+    words = caption_tokens(df["Description"], "words", stop_words)
+
+    # ---------- Build Word-Level Stats ----------
+    matrix, vocab = incidence_matrix(words)
+    word_df = word_stats(matrix, vocab, df["EngagementRate"])
+
+    # ---------- Normalize Engagement to 0–1 Scale ----------
+    word_df = normalize_engagement(word_df)
+
+    # ---------- Save Word Data ----------
+    paths = write_table(word_df, out_dir, "wordcloud_data")
+    print(f"📄 Saved word data to: {', '.join(paths)}")
+
+    submit([ChartSpec(
+        "wordcloud_heatmap", img_wordcloud, draw_wordcloud, word_df,
+        figsize=(12, 8), dpi=300,
+    )], charts)
+    return word_df
+
+
+if __name__ == "__main__":
+    # ---------- Load & Clean Data ----------
+    run(clean_engagement(load_merged()))
@@ -1,19 +1,15 @@
-import pandas as pd
 from collections import Counter
-import re
+from dataset import load_merged
+from tokens import caption_tokens
 
 # Load file
-df = pd.read_csv("../merged.csv")
+df = load_merged()
 
-# Combine all descriptions
-text = " ".join(df["Description"].dropna().astype(str))
-
-# Basic cleanup
-text = re.sub(r"http\S+", "", text)          # remove links
-text = re.sub(r"[^a-zA-Z ]", " ", text)     # keep letters and hashtags
-words = [w.lower() for w in text.split() if len(w) > 3]
+# Per-caption words: links removed, letters only, longer than 3 characters
+# (tokens.counter_words)
+words = caption_tokens(df["Description"], "counter_words")
 
 # Get top 50 most common words
-common = Counter(words).most_common(100)
+common = Counter(w for caption in words for w in caption).most_common(100)
 for word, count in common:
     print(f"{word}: {count}")